@@ -1,7 +1,11 @@
 import logging
+from collections import defaultdict
 
-from django.db.models import F
+from django.db.models import Case, F, Value, When
+from django.db.models.expressions import CombinedExpression
+from django.db.models.signals import post_save
 
+from sentry.db.models.utils import resolve_combined_expression
 from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils.services import Service
@@ -28,7 +32,7 @@ class Buffer(Service, metaclass=BufferMount):
     keep up with the updates.
     """
 
-    __all__ = ("get", "incr", "process", "process_pending", "validate")
+    __all__ = ("get", "incr", "process", "process_batch", "process_pending", "validate")
 
     def get(self, model, columns, filters):
         """
@@ -57,27 +61,36 @@ class Buffer(Service, metaclass=BufferMount):
     def process_pending(self, partition=None):
         return []
 
-    def process(self, model, columns, filters, extra=None, signal_only=None):
+    def _get_update_kwargs(self, model, columns, extra=None):
         from sentry.event_manager import ScoreClause
         from sentry.models import Group
 
+        update_kwargs = {c: F(c) + v for c, v in columns.items()}
+
+        if extra:
+            update_kwargs.update(extra)
+
+        # HACK(dcramer): this is gross, but we don't have a good hook to compute this property today
+        # XXX(dcramer): remove once we can replace 'priority' with something reasonable via Snuba
+        if model is Group:
+            if "last_seen" in update_kwargs and "times_seen" in update_kwargs:
+                update_kwargs["score"] = ScoreClause(
+                    group=None,
+                    times_seen=update_kwargs["times_seen"],
+                    last_seen=update_kwargs["last_seen"],
+                )
+
+        return update_kwargs
+
+    def process(self, model, columns, filters, extra=None, signal_only=None):
+        from sentry.models import Group
+
         created = False
 
         if not signal_only:
-            update_kwargs = {c: F(c) + v for c, v in columns.items()}
+            update_kwargs = self._get_update_kwargs(model, columns, extra)
 
-            if extra:
-                update_kwargs.update(extra)
-
-            # HACK(dcramer): this is gross, but we don't have a good hook to compute this property today
-            # XXX(dcramer): remove once we can replace 'priority' with something reasonable via Snuba
             if model is Group:
-                if "last_seen" in update_kwargs and "times_seen" in update_kwargs:
-                    update_kwargs["score"] = ScoreClause(
-                        group=None,
-                        times_seen=update_kwargs["times_seen"],
-                        last_seen=update_kwargs["last_seen"],
-                    )
                 # XXX: create_or_update doesn't fire `post_save` signals, and so this update never
                 # ends up in the cache. This causes issues when handling issue alerts, and likely
                 # elsewhere. Use `update` here since we're already special casing, and we know that
@@ -102,3 +115,75 @@ class Buffer(Service, metaclass=BufferMount):
             created=created,
             sender=model,
         )
+
+    def process_batch(self, updates):
+        """
+        Processes a batch of buffered updates, each given as a
+        ``(model, columns, filters, extra, signal_only)`` tuple.
+
+        Group updates keyed by primary key are coalesced into a single UPDATE
+        statement, everything else falls back to ``process``. The
+        ``buffer_incr_complete`` signal is sent for every update either way.
+        """
+        from sentry.models import Group
+
+        group_updates = {}
+        for model, columns, filters, extra, signal_only in updates:
+            pk = None
+            if model is Group and not signal_only and len(filters) == 1:
+                pk = filters.get("id", filters.get("pk"))
+
+            if pk is not None and pk not in group_updates:
+                group_updates[pk] = (columns, filters, extra)
+            else:
+                self.process(model, columns, filters, extra, signal_only)
+
+        if not group_updates:
+            return
+
+        groups = Group.objects.in_bulk(list(group_updates.keys()))
+        update_kwargs_by_pk = {
+            pk: self._get_update_kwargs(Group, columns, extra)
+            for pk, (columns, _, extra) in group_updates.items()
+            if pk in groups
+        }
+
+        if update_kwargs_by_pk:
+            whens = defaultdict(list)
+            for pk, update_kwargs in update_kwargs_by_pk.items():
+                for column, value in update_kwargs.items():
+                    if not hasattr(value, "resolve_expression"):
+                        # Plain values have to go through the field so that e.g. the
+                        # dict of a GzippedDictField is encoded before it hits the db.
+                        value = Value(value, output_field=Group._meta.get_field(column))
+                    whens[column].append(When(pk=pk, then=value))
+
+            Group.objects.filter(pk__in=list(update_kwargs_by_pk.keys())).update(
+                **{
+                    column: Case(
+                        *column_whens,
+                        default=F(column),
+                        output_field=Group._meta.get_field(column),
+                    )
+                    for column, column_whens in whens.items()
+                }
+            )
+
+            # Mirror ``update()`` so that the group cache picks up the new values.
+            for pk, update_kwargs in update_kwargs_by_pk.items():
+                group = groups[pk]
+                for column, value in update_kwargs.items():
+                    if isinstance(value, CombinedExpression):
+                        value = resolve_combined_expression(group, value)
+                    setattr(group, column, value)
+                post_save.send(sender=Group, instance=group, created=False)
+
+        for columns, filters, extra in group_updates.values():
+            buffer_incr_complete.send_robust(
+                model=Group,
+                columns=columns,
+                filters=filters,
+                extra=extra,
+                created=False,
+                sender=Group,
+            )
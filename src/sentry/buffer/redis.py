@@ -1,5 +1,6 @@
 import pickle
 import threading
+from collections import defaultdict
 from datetime import datetime
 from time import time
 
@@ -51,12 +52,28 @@ class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
 
-    def __init__(self, pending_partitions=1, incr_batch_size=2, **options):
+    def __init__(
+        self,
+        pending_partitions=1,
+        incr_batch_size=2,
+        batch_flush=False,
+        incr_codec="pickle",
+        **options,
+    ):
         self.cluster, options = get_cluster_from_options("SENTRY_BUFFER_OPTIONS", options)
         self.pending_partitions = pending_partitions
         self.incr_batch_size = incr_batch_size
+        # Serialization used by ``incr`` for filters and extra values. Reads
+        # always accept both formats, so switching this is zero downtime in
+        # either direction.
+        self.incr_codec = incr_codec
+        # When enabled, ``process`` drains every key of a batch per Redis host
+        # in one pipeline and hands the decoded updates to ``process_batch``
+        # instead of flushing each key individually.
+        self.batch_flush = batch_flush
         assert self.pending_partitions > 0
         assert self.incr_batch_size > 0
+        assert self.incr_codec in ("pickle", "json")
 
     def validate(self):
         try:
@@ -113,15 +130,26 @@ class RedisBuffer(Buffer):
         return result
 
     def _dump_value(self, value):
+        if isinstance(value, models.Model):
+            # Model references are stored by primary key, which Django accepts
+            # in place of the instance both in filters and in updates.
+            value = value.pk
+
         if isinstance(value, str):
             type_ = "s"
         elif isinstance(value, datetime):
             type_ = "d"
-            value = value.strftime("%s.%f")
+            value = f"{value.timestamp():.6f}"
+        elif isinstance(value, bool) or value is None:
+            return ("j", value)
         elif isinstance(value, int):
             type_ = "i"
         elif isinstance(value, float):
             type_ = "f"
+        elif isinstance(value, (dict, list, tuple)):
+            # Structured values (e.g. ``Group.data``) are embedded as-is
+            # instead of being encoded into a string a second time.
+            return ("j", value)
         else:
             raise TypeError(type(value))
         return (type_, str(value))
@@ -137,14 +165,28 @@ class RedisBuffer(Buffer):
         if type_ == "s":
             return force_text(value)
         elif type_ == "d":
-            return datetime.fromtimestamp(float(value)).replace(tzinfo=timezone.utc)
+            return datetime.fromtimestamp(float(value), timezone.utc)
         elif type_ == "i":
             return int(value)
         elif type_ == "f":
             return float(value)
+        elif type_ == "j":
+            return value
         else:
             raise TypeError(f"invalid type: {type_}")
 
+    def _encode_filters(self, filters):
+        # TODO(dcramer): once the JSON codec is live everywhere, we can kill the pickle path
+        # (this is to ensure a zero downtime deploy where we can transition event processing)
+        if self.incr_codec == "json":
+            return json.dumps(self._dump_values(filters))
+        return pickle.dumps(filters)
+
+    def _encode_extra_value(self, value):
+        if self.incr_codec == "json":
+            return json.dumps(self._dump_value(value))
+        return pickle.dumps(value)
+
     def get(self, model, columns, filters):
         """
         Fetches buffered values for a model/filter. Passed columns must be integer columns.
@@ -172,8 +214,6 @@ class RedisBuffer(Buffer):
         - Add hashmap key to pending flushes
         """
 
-        # TODO(dcramer): longer term we'd rather not have to serialize values
-        # here (unless it's to JSON)
         key = self._make_key(model, filters)
         pending_key = self._make_pending_key_from_key(key)
         # We can't use conn.map() due to wanting to support multiple pending
@@ -182,10 +222,7 @@ class RedisBuffer(Buffer):
 
         pipe = conn.pipeline()
         pipe.hsetnx(key, "m", f"{model.__module__}.{model.__name__}")
-        # TODO(dcramer): once this goes live in production, we can kill the pickle path
-        # (this is to ensure a zero downtime deploy where we can transition event processing)
-        pipe.hsetnx(key, "f", pickle.dumps(filters))
-        # pipe.hsetnx(key, 'f', json.dumps(self._dump_values(filters)))
+        pipe.hsetnx(key, "f", self._encode_filters(filters))
         for column, amount in columns.items():
             pipe.hincrby(key, "i+" + column, amount)
 
@@ -194,10 +231,7 @@ class RedisBuffer(Buffer):
             # hook here
             # e.g. "update score if last_seen or times_seen is changed"
             for column, value in extra.items():
-                # TODO(dcramer): once this goes live in production, we can kill the pickle path
-                # (this is to ensure a zero downtime deploy where we can transition event processing)
-                pipe.hset(key, "e+" + column, pickle.dumps(value))
-                # pipe.hset(key, 'e+' + column, json.dumps(self._dump_value(value)))
+                pipe.hset(key, "e+" + column, self._encode_extra_value(value))
 
         if signal_only is True:
             pipe.hset(key, "s", "1")
@@ -262,12 +296,59 @@ class RedisBuffer(Buffer):
         if key is not None:
             batch_keys = [key]
 
+        if self.batch_flush and len(batch_keys) > 1:
+            self._process_batch_incr(batch_keys)
+            return
+
         for key in batch_keys:
             self._process_single_incr(key)
 
     def _process(self, model, columns, filters, extra=None, signal_only=None):
         return super().process(model, columns, filters, extra, signal_only)
 
+    def _decode_incr_values(self, key, values):
+        """
+        Decodes the contents of a buffer hash into the arguments expected by
+        ``Buffer.process``. Returns ``None`` if the hash was already flushed.
+        """
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_text(k): v for k, v in values.items()}
+
+        if not values:
+            metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+            self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            return None
+
+        # XXX(py3): Note that ``import_string`` explicitly wants a str in
+        # python2, so we'll decode (for python3) and then translate back to
+        # a byte string (in python2) for import_string.
+        model = import_string(str(values.pop("m").decode("utf-8")))
+
+        if values["f"].startswith(b"{"):
+            filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(values.pop("f"))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"["):
+                    extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(v)
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return model, incr_values, filters, extra_values, signal_only
+
     def _process_single_incr(self, key):
         client = self.cluster.get_routing_client()
         lock_key = self._make_lock_key(key)
@@ -288,42 +369,62 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_text(k): v for k, v in values.items()}
-
-            if not values:
-                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
-                self.logger.debug("buffer.revoked.empty", extra={"redis_key": key})
-                return
-
-            # XXX(py3): Note that ``import_string`` explicitly wants a str in
-            # python2, so we'll decode (for python3) and then translate back to
-            # a byte string (in python2) for import_string.
-            model = import_string(str(values.pop("m").decode("utf-8")))
-
-            if values["f"].startswith(b"{"):
-                filters = self._load_values(json.loads(values.pop("f").decode("utf-8")))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(values.pop("f"))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"["):
-                        extra_values[k[2:]] = self._load_value(json.loads(v.decode("utf-8")))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(v)
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._process(model, incr_values, filters, extra_values, signal_only)
+            update = self._decode_incr_values(key, values)
+            if update is not None:
+                self._process(*update)
         finally:
             client.delete(lock_key)
+
+    def _process_batch_incr(self, batch_keys):
+        """
+        Flushes a batch of buffer keys at once: locks are taken and released
+        with one round-trip per host, every locked hash living on the same
+        host is drained in a single transaction, and the decoded updates are
+        applied together through ``process_batch``.
+        """
+        start = time()
+        lock_keys = {key: self._make_lock_key(key) for key in batch_keys}
+
+        # prevent a stampede due to the way we use celery etas + duplicate
+        # tasks
+        with self.cluster.map() as client:
+            acquired = {
+                key: client.set(lock_key, "1", nx=True, ex=10)
+                for key, lock_key in lock_keys.items()
+            }
+        locked_keys = [key for key, promise in acquired.items() if promise.value]
+
+        for key in batch_keys:
+            if not acquired[key].value:
+                metrics.incr("buffer.revoked", tags={"reason": "locked"}, skip_internal=False)
+                self.logger.debug("buffer.revoked.locked", extra={"redis_key": key})
+
+        try:
+            router = self.cluster.get_router()
+            keys_by_host = defaultdict(list)
+            for key in locked_keys:
+                keys_by_host[router.get_host_for_key(key)].append(key)
+
+            updates = []
+            for host, keys in keys_by_host.items():
+                with self.cluster.get_local_client(host).pipeline() as pipe:
+                    for key in keys:
+                        pipe.hgetall(key)
+                        pipe.zrem(self._make_pending_key_from_key(key), key)
+                        pipe.delete(key)
+                    results = pipe.execute()
+
+                for key, values in zip(keys, results[::3]):
+                    update = self._decode_incr_values(key, values)
+                    if update is not None:
+                        updates.append(update)
+
+            metrics.timing("buffer.batch-size", len(updates))
+            if updates:
+                self.process_batch(updates)
+        finally:
+            if locked_keys:
+                with self.cluster.map() as client:
+                    for key in locked_keys:
+                        client.delete(lock_keys[key])
+            metrics.timing("buffer.batch-flush-latency", time() - start)
@@ -38,6 +38,13 @@ class BaseCache(local):
     def get(self, key, version=None, raw=False):
         raise NotImplementedError
 
+    def set_many(self, items, timeout, version=None):
+        for key, value in items:
+            self.set(key, value, timeout, version=version)
+
+    def get_many(self, keys, version=None):
+        return [self.get(key, version=version) for key in keys]
+
     def _mark_transaction(self, op):
         """
         Mark transaction with a tag so we can identify system components that rely
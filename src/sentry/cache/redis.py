@@ -60,3 +60,32 @@ class RedisClusterCache(CommonRedisCache):
     def __init__(self, cluster_id, **options):
         client = redis_clusters.get(cluster_id)
         CommonRedisCache.__init__(self, client=client, **options)
+
+    def set_many(self, items, timeout, version=None):
+        values = []
+        for key, value in items:
+            key = self.make_key(key, version=version)
+            v = json.dumps(value)
+            if len(v) > self.max_size:
+                raise ValueTooLarge(f"Cache key too large: {key!r} {len(v)!r}")
+            values.append((key, v))
+
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key, v in values:
+                if timeout:
+                    pipeline.setex(key, int(timeout), v)
+                else:
+                    pipeline.set(key, v)
+            pipeline.execute()
+
+        self._mark_transaction("set")
+
+    def get_many(self, keys, version=None):
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.get(self.make_key(key, version=version))
+            results = pipeline.execute()
+
+        self._mark_transaction("get")
+
+        return [json.loads(result) if result is not None else None for result in results]
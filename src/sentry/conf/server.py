@@ -1719,6 +1719,27 @@ SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 # Node storage backend
 SENTRY_NODESTORE = "sentry.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS = {}
+# Size in bytes of the per-process cache of raw node payloads that sits in
+# front of the nodestore backend (0 disables it), and how long entries live.
+SENTRY_NODESTORE_LOCAL_CACHE_SIZE = 0
+SENTRY_NODESTORE_LOCAL_CACHE_TTL = 60
+
+# Size in bytes of the per-process cache of grouping hashes of events with
+# identical grouping-relevant content (0 disables it), and how long entries
+# live. See ``sentry.grouping.cache``.
+SENTRY_GROUPING_HASH_CACHE_SIZE = 0
+SENTRY_GROUPING_HASH_CACHE_TTL = 600
+
+# Size in bytes of the per-process cache of parsed sourcemaps used by the
+# JavaScript processor (0 disables it), measured by the size of the minified
+# sources and sourcemaps they were parsed from.
+SENTRY_JAVASCRIPT_SOURCEMAP_CACHE_SIZE = 0
+
+# Number of threads per process used to download the remote sources and
+# sourcemaps of JavaScript events concurrently before they are processed (0
+# disables it), and how many of those downloads may target the same host.
+SENTRY_JAVASCRIPT_PREFETCH_WORKERS = 0
+SENTRY_JAVASCRIPT_PREFETCH_PER_HOST = 4
 
 # Tag storage backend
 SENTRY_TAGSTORE = os.environ.get("SENTRY_TAGSTORE", "sentry.tagstore.snuba.SnubaTagStorage")
@@ -1764,6 +1785,11 @@ SENTRY_METRICS_DISALLOW_BAD_TAGS = IS_DEV
 SENTRY_METRICS_INDEXER = "sentry.sentry_metrics.indexer.postgres.postgres_v2.PostgresIndexer"
 SENTRY_METRICS_INDEXER_OPTIONS = {}
 SENTRY_METRICS_INDEXER_CACHE_TTL = 3600 * 2
+# How many bytes of indexed strings each process keeps in memory in front of
+# the indexer cache (0 disables this tier), and how many of them a single use
+# case and org may take. Entries expire like the ones in the indexer cache.
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE = 0
+SENTRY_METRICS_INDEXER_LOCAL_CACHE_ORG_SIZE = 1024 * 1024
 SENTRY_METRICS_INDEXER_TRANSACTIONS_SAMPLE_RATE = 0.1
 
 SENTRY_METRICS_INDEXER_SPANNER_OPTIONS = {}
@@ -3160,11 +3186,19 @@ SENTRY_DEFAULT_LOCKS_BACKEND_OPTIONS = {
     "options": {"cluster": "default"},
 }
 
+# How many seconds the project-level data loaded by the post_process_group
+# pipeline steps is shared by the events of the same project processed by a
+# worker (0 loads it once per event). See ``PostProcessContext``.
+SENTRY_POST_PROCESS_CONTEXT_TTL = 0
+
 SENTRY_POST_PROCESS_LOCKS_BACKEND_OPTIONS = {
     "path": "sentry.utils.locking.backends.redis.RedisLockBackend",
     "options": {"cluster": "default"},
 }
 
+# Redis cluster which keeps track of the order of post process batches.
+SENTRY_POST_PROCESS_BATCH_ORDERING_CLUSTER = "default"
+
 # maximum number of projects allowed to query snuba with for the organization_vitals_overview endpoint
 ORGANIZATION_VITALS_OVERVIEW_PROJECT_LIMIT = 300
 
@@ -1,5 +1,5 @@
 import logging
-from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Sequence
 
 from sentry.utils.imports import import_string
 from sentry.utils.services import Service
@@ -58,7 +58,16 @@ class Backend(Service):
     be transitioned to "waiting" instead.)
     """
 
-    __all__ = ("add", "delete", "digest", "enabled", "maintenance", "schedule", "validate")
+    __all__ = (
+        "add",
+        "delete",
+        "digest",
+        "digest_many",
+        "enabled",
+        "maintenance",
+        "schedule",
+        "validate",
+    )
 
     def __init__(self, **options: Any) -> None:
         # The ``minimum_delay`` option defines the default minimum amount of
@@ -168,6 +177,29 @@ class Backend(Service):
         """
         raise NotImplementedError
 
+    def digest_many(
+        self,
+        keys: Sequence[str],
+        minimum_delays: Optional[Mapping[str, Optional[int]]] = None,
+        timestamp: Optional[float] = None,
+    ) -> Any:
+        """
+        Extract records from many timelines at once.
+
+        This method acts as a context manager like ``digest``, but the target
+        of the ``as`` clause is a mapping of timeline key to the records of
+        that timeline. ``minimum_delays`` maps timeline keys to their minimum
+        delay, timelines that are missing from it or map to ``None`` use the
+        default.
+
+        Timelines that are not in the "ready" state or that are being digested
+        elsewhere are left out of the mapping. Timelines that are removed from
+        the mapping inside the block are not closed, as if the block had
+        raised for them alone: they remain in the "ready" state until the
+        maintenance process moves them back to "waiting".
+        """
+        raise NotImplementedError
+
     def schedule(
         self, deadline: float, timestamp: Optional[float] = None
     ) -> Optional[Iterable["ScheduleEntry"]]:
@@ -1,14 +1,16 @@
 import logging
 import time
+from collections import defaultdict
 from contextlib import contextmanager
-from typing import Any, Iterable, Optional, Tuple
+from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 from rb.clients import LocalClient
 from redis.exceptions import ResponseError
 
 from sentry.digests import Record, ScheduleEntry
 from sentry.digests.backends.base import Backend, InvalidState
-from sentry.utils.locking.backends.redis import RedisLockBackend
+from sentry.utils import metrics
+from sentry.utils.locking.backends.redis import RedisLockBackend, delete_lock
 from sentry.utils.locking.lock import Lock
 from sentry.utils.locking.manager import LockManager
 from sentry.utils.redis import check_cluster_versions, get_cluster_from_options, load_script
@@ -186,6 +188,28 @@ class RedisBackend(Backend):
                     exc_info=True,
                 )
 
+    def __decode_records(self, key: str, response: Any) -> List[Record]:
+        records = [
+            Record(
+                record_key.decode(),
+                self.codec.decode(value) if value is not None else None,
+                float(timestamp),
+            )
+            for record_key, value, timestamp in response
+        ]
+
+        missing = sum(1 for record in records if record.value is None)
+        if missing:
+            logger.warning(
+                "Filtered out missing records when fetching digest",
+                extra={
+                    "key": key,
+                    "record_count": len(records),
+                    "filtered_record_count": len(records) - missing,
+                },
+            )
+        return records
+
     @contextmanager
     def digest(
         self, key: str, minimum_delay: Optional[int] = None, timestamp: Optional[float] = None
@@ -217,29 +241,12 @@ class RedisBackend(Backend):
                 else:
                     raise
 
-            records = [
-                Record(
-                    key.decode(),
-                    self.codec.decode(value) if value is not None else None,
-                    float(timestamp),
-                )
-                for key, value, timestamp in response
-            ]
+            records = self.__decode_records(key, response)
 
             # If the record value is `None`, this means the record data was
             # missing (it was presumably evicted by Redis) so we don't need to
             # return it here.
-            filtered_records = [record for record in records if record.value is not None]
-            if len(records) != len(filtered_records):
-                logger.warning(
-                    "Filtered out missing records when fetching digest",
-                    extra={
-                        "key": key,
-                        "record_count": len(records),
-                        "filtered_record_count": len(filtered_records),
-                    },
-                )
-            yield filtered_records
+            yield [record for record in records if record.value is not None]
 
             script(
                 connection,
@@ -255,3 +262,112 @@ class RedisBackend(Backend):
         connection = self._get_connection(key)
         with self._get_timeline_lock(key, duration=30).acquire():
             script(connection, [key], ["DELETE", self.namespace, self.ttl, timestamp, key])
+
+    @contextmanager
+    def digest_many(
+        self,
+        keys: Sequence[str],
+        minimum_delays: Optional[Mapping[str, Optional[int]]] = None,
+        timestamp: Optional[float] = None,
+    ) -> Any:
+        if minimum_delays is None:
+            minimum_delays = {}
+
+        if timestamp is None:
+            timestamp = time.time()
+
+        router = self.cluster.get_router()
+        keys_by_host = defaultdict(list)
+        for key in dict.fromkeys(keys):
+            keys_by_host[router.get_host_for_key(f"{self.namespace}:t:{key}")].append(key)
+
+        # The lock of a timeline is routed by the timeline key (see
+        # ``_get_timeline_lock``), so it lives on the same host as the timeline.
+        lock_backend = self.locks.backend
+        lock_keys = {
+            key: lock_backend.prefix_key(f"{self.namespace}:t:{key}")
+            for keys in keys_by_host.values()
+            for key in keys
+        }
+
+        locked: MutableMapping[int, List[str]] = {}
+        opened: MutableMapping[int, MutableMapping[str, List[Record]]] = {}
+        try:
+            for host, host_keys in keys_by_host.items():
+                with self.cluster.get_local_client(host).pipeline(transaction=False) as pipe:
+                    for key in host_keys:
+                        pipe.set(lock_keys[key], lock_backend.uuid, ex=30, nx=True)
+                    acquired = pipe.execute()
+                locked[host] = [key for key, result in zip(host_keys, acquired) if result]
+                if len(locked[host]) != len(host_keys):
+                    metrics.incr(
+                        "digests.digest_many.locked",
+                        amount=len(host_keys) - len(locked[host]),
+                        skip_internal=False,
+                    )
+
+            for host, host_keys in locked.items():
+                with self.cluster.get_local_client(host).pipeline(transaction=False) as pipe:
+                    for key in host_keys:
+                        script(
+                            pipe,
+                            [key],
+                            [
+                                "DIGEST_OPEN",
+                                self.namespace,
+                                self.ttl,
+                                timestamp,
+                                key,
+                                self.capacity if self.capacity else -1,
+                            ],
+                        )
+                    responses = pipe.execute(raise_on_error=False)
+
+                opened[host] = {}
+                for key, response in zip(host_keys, responses):
+                    if isinstance(response, ResponseError):
+                        if "err(invalid_state):" not in str(response):
+                            raise response
+                        metrics.incr("digests.digest_many.invalid_state", skip_internal=False)
+                        continue
+                    opened[host][key] = self.__decode_records(key, response)
+
+            results = {
+                key: [record for record in records if record.value is not None]
+                for host_records in opened.values()
+                for key, records in host_records.items()
+            }
+            metrics.timing("digests.digest_many.size", len(results))
+
+            yield results
+
+            for host, host_records in opened.items():
+                with self.cluster.get_local_client(host).pipeline(transaction=False) as pipe:
+                    for key, records in host_records.items():
+                        if key not in results:
+                            continue
+                        minimum_delay = minimum_delays.get(key)
+                        if minimum_delay is None:
+                            minimum_delay = self.minimum_delay
+                        script(
+                            pipe,
+                            [key],
+                            [
+                                "DIGEST_CLOSE",
+                                self.namespace,
+                                self.ttl,
+                                timestamp,
+                                key,
+                                minimum_delay,
+                            ]
+                            + [record.key for record in records],
+                        )
+                    pipe.execute()
+        finally:
+            for host, host_keys in locked.items():
+                if not host_keys:
+                    continue
+                with self.cluster.get_local_client(host).pipeline(transaction=False) as pipe:
+                    for key in host_keys:
+                        delete_lock(pipe, (lock_keys[key],), (lock_backend.uuid,))
+                    pipe.execute()
@@ -7,7 +7,7 @@ import random
 import re
 import time
 import uuid
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from hashlib import md5
 from io import BytesIO
@@ -76,6 +76,7 @@ from sentry.grouping.api import (
     get_grouping_config_dict_for_project,
     load_grouping_config,
 )
+from sentry.grouping.cache import get_cached_hashes, get_hash_cache_key
 from sentry.grouping.result import CalculatedHashes
 from sentry.ingest.inbound_filters import FilterStatKeys
 from sentry.issues.grouptype import GroupCategory, reduce_noise
@@ -172,6 +173,32 @@ class GroupInfo:
     is_new_group_environment: bool = False
 
 
+@dataclass
+class AggregateBatch:
+    """
+    State shared between the events aggregated together by
+    `_save_aggregate_many`.
+    """
+
+    # GroupHashes by hash, `None` for hierarchical hashes known to not exist
+    grouphashes: dict[str, Optional[GroupHash]] = field(default_factory=dict)
+    groups: dict[int, Group] = field(default_factory=dict)
+    # Pending `times_seen` increments and group updates by group id
+    increments: dict[int, tuple[int, dict[str, Any]]] = field(default_factory=dict)
+
+    def add_increment(self, group: Group, extra: dict[str, Any]) -> None:
+        times_seen, pending = self.increments.get(group.id, (0, {}))
+        extra = {**pending, **extra}
+        if "first_seen" in pending:
+            extra["first_seen"] = min(pending["first_seen"], extra["first_seen"])
+        self.increments[group.id] = (times_seen + 1, extra)
+
+    def flush_increments(self) -> None:
+        for group_id, (times_seen, extra) in self.increments.items():
+            buffer_incr(Group, {"times_seen": times_seen}, {"id": group_id}, extra)
+        self.increments.clear()
+
+
 def pop_tag(data: dict[str, Any], key: str) -> None:
     if "tags" not in data:
         return
@@ -552,9 +579,8 @@ class EventManager:
 
         _materialize_metadata_many(jobs)
 
-        kwargs = _create_kwargs(job)
-
-        kwargs["culprit"] = job["culprit"]
+        job["hashes"] = hashes
+        job["migrate_off_hierarchical"] = migrate_off_hierarchical
 
         # Load attachments first, but persist them at the very last after
         # posting to eventstream to make sure all counters and eventstream are
@@ -564,19 +590,11 @@ class EventManager:
             with sentry_sdk.start_span(op="event_manager.save.get_attachments"):
                 attachments = get_attachments(cache_key, job)
 
-        try:
-            with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
-                group_info = _save_aggregate(
-                    event=job["event"],
-                    hashes=hashes,
-                    release=job["release"],
-                    metadata=dict(job["event_metadata"]),
-                    received_timestamp=job["received_timestamp"],
-                    migrate_off_hierarchical=migrate_off_hierarchical,
-                    **kwargs,
-                )
-                job["groups"] = [group_info]
-        except HashDiscarded as err:
+        with sentry_sdk.start_span(op="event_manager.save.save_aggregate_fn"):
+            _save_aggregate_many(jobs, projects)
+
+        if "hash_discarded" in job:
+            err = job["hash_discarded"]
             logger.info(
                 "event_manager.save.discard",
                 extra={
@@ -585,11 +603,13 @@ class EventManager:
                 },
             )
             discard_event(job, attachments)
-            raise
+            raise err
 
-        if not group_info:
+        if not job["groups"]:
             return job["event"]
 
+        group_info = job["groups"][0]
+
         job["event"].group = group_info.group
 
         # store a reference to the group id to guarantee validation of isolation
@@ -1463,13 +1483,18 @@ def _save_aggregate(
     metadata: dict[str, Any],
     received_timestamp: Union[int, float],
     migrate_off_hierarchical: Optional[bool] = False,
+    batch: Optional[AggregateBatch] = None,
     **kwargs: dict[str, Any],
 ) -> Optional[GroupInfo]:
     project = event.project
 
-    flat_grouphashes = [
-        GroupHash.objects.get_or_create(project=project, hash=hash)[0] for hash in hashes.hashes
-    ]
+    # Buffer increments are only deferred for events aggregated in a batch
+    is_batched = batch is not None
+    if batch is None:
+        batch = AggregateBatch()
+
+    _fetch_grouphashes(project, batch.grouphashes, hashes)
+    flat_grouphashes = [batch.grouphashes[hash] for hash in hashes.hashes]
 
     # The root_hierarchical_hash is the least specific hash within the tree, so
     # typically hierarchical_hashes[0], unless a hash `n` has been split in
@@ -1478,13 +1503,16 @@ def _save_aggregate(
     # when groups are created and also relieves contention by locking a more
     # specific hash than `hierarchical_hashes[0]`.
     existing_grouphash, root_hierarchical_hash = _find_existing_grouphash(
-        project, flat_grouphashes, hashes.hierarchical_hashes
+        project, flat_grouphashes, hashes.hierarchical_hashes, batch.grouphashes
     )
 
     if root_hierarchical_hash is not None:
-        root_hierarchical_grouphash = GroupHash.objects.get_or_create(
-            project=project, hash=root_hierarchical_hash
-        )[0]
+        root_hierarchical_grouphash = batch.grouphashes.get(root_hierarchical_hash)
+        if root_hierarchical_grouphash is None:
+            root_hierarchical_grouphash = GroupHash.objects.get_or_create(
+                project=project, hash=root_hierarchical_hash
+            )[0]
+            batch.grouphashes[root_hierarchical_hash] = root_hierarchical_grouphash
 
         metadata.update(
             hashes.group_metadata_from_hash(
@@ -1533,6 +1561,7 @@ def _save_aggregate(
                 all_hash_ids.append(root_hierarchical_grouphash.id)
 
             all_hashes = list(GroupHash.objects.filter(id__in=all_hash_ids).select_for_update())
+            batch.grouphashes.update((gh.hash, gh) for gh in all_hashes)
 
             flat_grouphashes = [gh for gh in all_hashes if gh.hash in hashes.hashes]
 
@@ -1544,21 +1573,21 @@ def _save_aggregate(
                 root_hierarchical_grouphash = GroupHash.objects.get_or_create(
                     project=project, hash=root_hierarchical_hash
                 )[0]
+                batch.grouphashes[root_hierarchical_hash] = root_hierarchical_grouphash
             else:
                 root_hierarchical_grouphash = None
 
             if existing_grouphash is None:
 
                 group = _create_group(project, event, **kwargs)
+                batch.groups[group.id] = group
 
                 if root_hierarchical_grouphash is not None:
                     new_hashes = [root_hierarchical_grouphash]
                 else:
                     new_hashes = list(flat_grouphashes)
 
-                GroupHash.objects.filter(id__in=[h.id for h in new_hashes]).exclude(
-                    state=GroupHash.State.LOCKED_IN_MIGRATION
-                ).update(group=group)
+                _associate_grouphashes(new_hashes, group)
 
                 is_new = True
                 is_regression = False
@@ -1574,7 +1603,11 @@ def _save_aggregate(
 
                 return GroupInfo(group, is_new, is_regression)
 
-    group = Group.objects.get(id=existing_grouphash.group_id)
+    group = batch.groups.get(existing_grouphash.group_id)
+    if group is None:
+        group = batch.groups[existing_grouphash.group_id] = Group.objects.get(
+            id=existing_grouphash.group_id
+        )
     if group.issue_category != GroupCategory.ERROR:
         logger.info(
             "event_manager.category_mismatch",
@@ -1629,21 +1662,118 @@ def _save_aggregate(
         # _save_aggregate had races around group creation which made this race
         # more user visible. For more context, see 84c6f75a and d0e22787, as
         # well as GH-5085.
-        GroupHash.objects.filter(id__in=[h.id for h in new_hashes]).exclude(
-            state=GroupHash.State.LOCKED_IN_MIGRATION
-        ).update(group=group)
+        _associate_grouphashes(new_hashes, group)
 
     is_regression = _process_existing_aggregate(
-        group=group, event=event, data=kwargs, release=release
+        group=group,
+        event=event,
+        data=kwargs,
+        release=release,
+        batch=batch if is_batched else None,
     )
 
     return GroupInfo(group, is_new, is_regression)
 
 
+@metrics.wraps("save_event.save_aggregate_many")
+def _save_aggregate_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
+    """
+    Aggregates a batch of error events into groups.
+
+    Each job needs `hashes` (and optionally `migrate_off_hierarchical`) set
+    on top of the data pulled out by `_pull_out_data` and
+    `_materialize_metadata_many`. GroupHashes of all events of a project are
+    resolved together, groups created for one event of the batch are reused
+    for the others, and the `times_seen` increments of all events of a group
+    are written to the buffer together.
+
+    Sets `groups` on every job, or `hash_discarded` if the event has to be
+    discarded. `EventManager.save` aggregates its event through here as a
+    batch of one.
+    """
+    hashes_by_project: dict[int, list[CalculatedHashes]] = {}
+    for job in jobs:
+        hashes_by_project.setdefault(job["project_id"], []).append(job["hashes"])
+
+    batches: dict[int, AggregateBatch] = {}
+    for project_id, all_hashes in hashes_by_project.items():
+        batch = batches[project_id] = AggregateBatch()
+        _fetch_grouphashes(projects[project_id], batch.grouphashes, *all_hashes)
+
+    try:
+        for job in jobs:
+            kwargs = _create_kwargs(job)
+            kwargs["culprit"] = job["culprit"]
+            try:
+                group_info = _save_aggregate(
+                    event=job["event"],
+                    hashes=job["hashes"],
+                    release=job["release"],
+                    metadata=dict(job["event_metadata"]),
+                    received_timestamp=job["received_timestamp"],
+                    migrate_off_hierarchical=job.get("migrate_off_hierarchical", False),
+                    batch=batches[job["project_id"]],
+                    **kwargs,
+                )
+            except HashDiscarded as err:
+                job["groups"] = []
+                job["hash_discarded"] = err
+            else:
+                job["groups"] = [group_info] if group_info else []
+    finally:
+        for batch in batches.values():
+            batch.flush_increments()
+
+
+def _fetch_grouphashes(
+    project: Project,
+    grouphashes: MutableMapping[str, Optional[GroupHash]],
+    *all_hashes: CalculatedHashes,
+) -> None:
+    """
+    Loads the GroupHashes of all hashes not in `grouphashes` yet with a single
+    query, and creates the missing GroupHashes of flat hashes.
+    """
+    missing = {
+        hash
+        for hashes in all_hashes
+        for hash in (*hashes.hashes, *hashes.hierarchical_hashes)
+        if hash not in grouphashes
+    }
+    if not missing:
+        return
+
+    found = {gh.hash: gh for gh in GroupHash.objects.filter(project=project, hash__in=missing)}
+    grouphashes.update((hash, found.get(hash)) for hash in missing)
+
+    to_create = sorted(
+        {hash for hashes in all_hashes for hash in hashes.hashes if grouphashes[hash] is None}
+    )
+    if to_create:
+        GroupHash.objects.bulk_create(
+            [GroupHash(project=project, hash=hash) for hash in to_create], ignore_conflicts=True
+        )
+        grouphashes.update(
+            (gh.hash, gh) for gh in GroupHash.objects.filter(project=project, hash__in=to_create)
+        )
+
+
+def _associate_grouphashes(grouphashes: Sequence[GroupHash], group: Group) -> None:
+    GroupHash.objects.filter(id__in=[h.id for h in grouphashes]).exclude(
+        state=GroupHash.State.LOCKED_IN_MIGRATION
+    ).update(group=group)
+
+    # Keep the instances in sync, they are shared between the events of a batch
+    for h in grouphashes:
+        if h.state != GroupHash.State.LOCKED_IN_MIGRATION:
+            h.group_id = group.id
+
+
 def _find_existing_grouphash(
     project: Project,
     flat_grouphashes: Sequence[GroupHash],
     hierarchical_hashes: Optional[Sequence[str]],
+    hierarchical_grouphashes: Optional[Mapping[str, Optional[GroupHash]]] = None,
 ) -> tuple[Optional[GroupHash], Optional[str]]:
     all_grouphashes = []
     root_hierarchical_hash = None
@@ -1651,10 +1781,11 @@ def _find_existing_grouphash(
     found_split = False
 
     if hierarchical_hashes:
-        hierarchical_grouphashes = {
-            h.hash: h
-            for h in GroupHash.objects.filter(project=project, hash__in=hierarchical_hashes)
-        }
+        if hierarchical_grouphashes is None:
+            hierarchical_grouphashes = {
+                h.hash: h
+                for h in GroupHash.objects.filter(project=project, hash__in=hierarchical_hashes)
+            }
 
         # Look for splits:
         # 1. If we find a hash with SPLIT state at `n`, we want to use
@@ -1859,7 +1990,11 @@ def _handle_regression(group: Group, event: Event, release: Optional[Release]) -
 
 
 def _process_existing_aggregate(
-    group: Group, event: Event, data: Mapping[str, Any], release: Optional[Release]
+    group: Group,
+    event: Event,
+    data: Mapping[str, Any],
+    release: Optional[Release],
+    batch: Optional[AggregateBatch] = None,
 ) -> bool:
     date = max(event.datetime, group.last_seen)
     extra = {"last_seen": date, "data": data["data"]}
@@ -1880,9 +2015,12 @@ def _process_existing_aggregate(
 
     group.last_seen = extra["last_seen"]
 
-    update_kwargs = {"times_seen": 1}
+    if batch is not None:
+        batch.add_increment(group, extra)
+    else:
+        update_kwargs = {"times_seen": 1}
 
-    buffer_incr(Group, update_kwargs, {"id": group.id}, extra)
+        buffer_incr(Group, update_kwargs, {"id": group.id}, extra)
 
     return bool(is_regression)
 
@@ -2239,7 +2377,10 @@ def _calculate_event_grouping(
         # event.  If that config has since been deleted (because it was an
         # experimental grouping config) we fall back to the default.
         try:
-            hashes = event.get_hashes(grouping_config)
+            hashes = get_cached_hashes(
+                lambda: get_hash_cache_key(project.id, grouping_config, event.data),
+                lambda: event.get_hashes(grouping_config),
+            )
         except GroupingConfigNotFound:
             event.data["grouping_config"] = get_grouping_config_dict_for_project(project)
             hashes = event.get_hashes()
@@ -1,8 +1,9 @@
 from datetime import timedelta
-from typing import Any, Optional
+from typing import Any, List, Mapping, Optional, Sequence
 
 import sentry_sdk
 
+from sentry.utils import metrics
 from sentry.utils.cache import cache_key_for_event
 from sentry.utils.kvstore.abstract import KVStorage
 
@@ -40,12 +41,45 @@ class EventProcessingStore:
             self.inner.set(key, event, self.timeout)
             return key
 
+    def store_many(self, events: Sequence[Event], unprocessed: bool = False) -> List[str]:
+        """
+        Stores multiple events in as few round-trips as the backend allows and
+        returns their keys, in the order of ``events``.
+        """
+        with sentry_sdk.start_span(op="eventstore.processing.store_many"), metrics.timer(
+            "eventstore.processing.store_many"
+        ):
+            metrics.timing("eventstore.processing.store_many.size", len(events))
+            keys = [cache_key_for_event(event) for event in events]
+            if unprocessed:
+                keys = [self.__get_unprocessed_key(key) for key in keys]
+            self.inner.set_many(list(zip(keys, events)), self.timeout)
+            return keys
+
     def get(self, key: str, unprocessed: bool = False) -> Optional[Event]:
         with sentry_sdk.start_span(op="eventstore.processing.get"):
             if unprocessed:
                 key = self.__get_unprocessed_key(key)
             return self.inner.get(key)
 
+    def get_many(self, keys: Sequence[str], unprocessed: bool = False) -> Mapping[str, Event]:
+        """
+        Fetches multiple events by their keys. Events that are not in the store
+        are missing from the returned mapping.
+        """
+        with sentry_sdk.start_span(op="eventstore.processing.get_many"), metrics.timer(
+            "eventstore.processing.get_many"
+        ):
+            metrics.timing("eventstore.processing.get_many.size", len(keys))
+            if not unprocessed:
+                return dict(self.inner.get_many(keys))
+
+            unprocessed_keys = {self.__get_unprocessed_key(key): key for key in keys}
+            return {
+                unprocessed_keys[key]: event
+                for key, event in self.inner.get_many(list(unprocessed_keys))
+            }
+
     def delete_by_key(self, key: str) -> None:
         with sentry_sdk.start_span(op="eventstore.processing.delete_by_key"):
             self.inner.delete(key)
@@ -1,14 +1,51 @@
+import zstandard
+
+from sentry.cache.base import BaseCache
 from sentry.cache.redis import RedisClusterCache
-from sentry.utils.kvstore.cache import CacheKVStorage
+from sentry.utils.codecs import BytesCodec, JSONCodec, ZstdCodec
+from sentry.utils.kvstore.cache import CacheKeyWrapper, CacheKVStorage
+from sentry.utils.kvstore.encoding import KVStorageCodecWrapper
+from sentry.utils.kvstore.redis import RedisKVStorage
+from sentry.utils.redis import redis_clusters
 
 from .base import EventProcessingStore
 
 
-def RedisClusterEventProcessingStore(**options) -> EventProcessingStore:
+class CompatibleZstdCodec(ZstdCodec):
+    """
+    Zstandard codec which passes through values that are not compressed, such
+    as payloads written before compression was enabled.
+    """
+
+    def decode(self, value: bytes) -> bytes:
+        try:
+            return super().decode(value)
+        except zstandard.ZstdError:
+            return value
+
+
+def RedisClusterEventProcessingStore(compress: bool = False, **options) -> EventProcessingStore:
     """
     Creates an instance of the processing store which uses the Redis Cluster
     cache as its backend.
 
     Keyword argument are forwarded to the ``RedisClusterCache`` constructor.
+
+    With ``compress``, payloads are written compressed with zstandard under the
+    same keys as the cache would use. Uncompressed payloads can still be read,
+    so this can be turned on while events are being processed. Workers that
+    read from the store must support compressed payloads before it is turned on.
     """
-    return EventProcessingStore(CacheKVStorage(RedisClusterCache(**options)))
+    if not compress:
+        return EventProcessingStore(CacheKVStorage(RedisClusterCache(**options)))
+
+    return EventProcessingStore(
+        KVStorageCodecWrapper(
+            CacheKeyWrapper(
+                RedisKVStorage(redis_clusters.get_binary(options["cluster_id"])),
+                prefix=options.get("prefix") or BaseCache.prefix,
+                version=options.get("version"),
+            ),
+            JSONCodec() | BytesCodec() | CompatibleZstdCodec(),
+        )
+    )
@@ -214,6 +214,8 @@ class EventStream(Service):
         concurrency: int,
         initial_offset_reset: Union[Literal["latest"], Literal["earliest"]],
         strict_offset_reset: bool,
+        max_batch_size: int = 0,
+        max_batch_time: float = 1.0,
     ) -> None:
         assert not self.requires_post_process_forwarder()
         raise ForwarderNotRequired
@@ -21,7 +21,10 @@ from django.conf import settings
 
 from sentry import options
 from sentry.eventstream.base import EventStreamEventType, GroupStates
-from sentry.eventstream.kafka.dispatch import _get_task_kwargs_and_dispatch
+from sentry.eventstream.kafka.dispatch import (
+    _get_task_kwargs_and_dispatch,
+    _get_task_kwargs_and_dispatch_batch,
+)
 from sentry.eventstream.snuba import KW_SKIP_SEMANTIC_PARTITIONING, SnubaProtocolEventStream
 from sentry.killswitches import killswitch_matches_context
 from sentry.post_process_forwarder import PostProcessForwarder, PostProcessForwarderType
@@ -223,10 +226,12 @@ class KafkaEventStream(SnubaProtocolEventStream):
         concurrency: int,
         initial_offset_reset: Union[Literal["latest"], Literal["earliest"]],
         strict_offset_reset: bool,
+        max_batch_size: int = 0,
+        max_batch_time: float = 1.0,
     ) -> None:
         dispatch_function = _get_task_kwargs_and_dispatch
 
-        PostProcessForwarder(dispatch_function).run(
+        PostProcessForwarder(dispatch_function, _get_task_kwargs_and_dispatch_batch).run(
             entity,
             consumer_group,
             topic,
@@ -235,4 +240,6 @@ class KafkaEventStream(SnubaProtocolEventStream):
             concurrency,
             initial_offset_reset,
             strict_offset_reset,
+            max_batch_size,
+            max_batch_time,
         )
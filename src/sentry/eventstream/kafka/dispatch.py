@@ -1,7 +1,7 @@
 import logging
 import random
 from contextlib import contextmanager
-from typing import Any, Generator, Mapping, Optional
+from typing import Any, Generator, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.processing.strategies import (
@@ -18,7 +18,11 @@ from sentry.eventstream.kafka.protocol import (
     get_task_kwargs_for_message,
     get_task_kwargs_for_message_from_headers,
 )
-from sentry.tasks.post_process import post_process_group
+from sentry.tasks.post_process import (
+    get_post_process_batch_sequences,
+    post_process_group,
+    post_process_group_batch,
+)
 from sentry.utils import metrics
 from sentry.utils.cache import cache_key_for_event
 
@@ -53,38 +57,98 @@ def dispatch_post_process_group_task(
     if skip_consume:
         logger.info("post_process.skip.raw_event", extra={"event_id": event_id})
     else:
-        cache_key = cache_key_for_event({"project": project_id, "event_id": event_id})
-
         post_process_group.apply_async(
-            kwargs={
-                "is_new": is_new,
-                "is_regression": is_regression,
-                "is_new_group_environment": is_new_group_environment,
-                "primary_hash": primary_hash,
-                "cache_key": cache_key,
-                "group_id": group_id,
-                "group_states": group_states,
-                "occurrence_id": occurrence_id,
-                "project_id": project_id,
-            },
+            kwargs=_get_post_process_group_kwargs(
+                event_id,
+                project_id,
+                group_id,
+                is_new,
+                is_regression,
+                is_new_group_environment,
+                primary_hash,
+                group_states,
+                occurrence_id,
+            ),
             queue=queue,
         )
 
 
+def _get_post_process_group_kwargs(
+    event_id: str,
+    project_id: int,
+    group_id: Optional[int],
+    is_new: bool,
+    is_regression: Optional[bool],
+    is_new_group_environment: bool,
+    primary_hash: Optional[str],
+    group_states: Optional[GroupStates] = None,
+    occurrence_id: Optional[str] = None,
+) -> Mapping[str, Any]:
+    cache_key = cache_key_for_event({"project": project_id, "event_id": event_id})
+
+    return {
+        "is_new": is_new,
+        "is_regression": is_regression,
+        "is_new_group_environment": is_new_group_environment,
+        "primary_hash": primary_hash,
+        "cache_key": cache_key,
+        "group_id": group_id,
+        "group_states": group_states,
+        "occurrence_id": occurrence_id,
+        "project_id": project_id,
+    }
+
+
+def dispatch_post_process_group_batches(tasks: Sequence[Mapping[str, Any]]) -> None:
+    """
+    Dispatches one ``post_process_group_batch`` task per project and queue
+    for the given ``dispatch_post_process_group_task`` arguments.
+
+    The events of a project keep their relative order within its batch, and
+    batches are numbered so that those of a project are processed in the order
+    in which they are dispatched. Calls must therefore not run concurrently.
+    """
+    batches: MutableMapping[Tuple[int, str], List[Mapping[str, Any]]] = {}
+
+    for task_kwargs in tasks:
+        task_kwargs = dict(task_kwargs)
+        queue = task_kwargs.pop("queue")
+        if task_kwargs.pop("skip_consume", False):
+            logger.info("post_process.skip.raw_event", extra={"event_id": task_kwargs["event_id"]})
+            continue
+
+        batches.setdefault((task_kwargs["project_id"], queue), []).append(
+            _get_post_process_group_kwargs(**task_kwargs)
+        )
+
+    if not batches:
+        return
+
+    sequences = get_post_process_batch_sequences([project_id for project_id, _ in batches])
+    for ((_project_id, queue), batch), sequence in zip(batches.items(), sequences):
+        post_process_group_batch.apply_async(
+            kwargs={"tasks": batch, "queue": queue, "sequence": sequence}, queue=queue
+        )
+
+
 def _get_task_kwargs(message: Message[KafkaPayload]) -> Optional[Mapping[str, Any]]:
+    return _get_task_kwargs_for_payload(message.payload)
+
+
+def _get_task_kwargs_for_payload(payload: KafkaPayload) -> Optional[Mapping[str, Any]]:
     use_kafka_headers = options.get("post-process-forwarder:kafka-headers")
 
     if use_kafka_headers:
         try:
             with _sampled_eventstream_timer(instance="get_task_kwargs_for_message_from_headers"):
-                return get_task_kwargs_for_message_from_headers(message.payload.headers)
+                return get_task_kwargs_for_message_from_headers(payload.headers)
         except Exception as error:
             logger.warning("Could not forward message: %s", error, exc_info=True)
             with metrics.timer(_DURATION_METRIC, instance="get_task_kwargs_for_message"):
-                return get_task_kwargs_for_message(message.payload.value)
+                return get_task_kwargs_for_message(payload.value)
     else:
         with metrics.timer(_DURATION_METRIC, instance="get_task_kwargs_for_message"):
-            return get_task_kwargs_for_message(message.payload.value)
+            return get_task_kwargs_for_message(payload.value)
 
 
 def _get_task_kwargs_and_dispatch(message: Message[KafkaPayload]) -> None:
@@ -95,6 +159,17 @@ def _get_task_kwargs_and_dispatch(message: Message[KafkaPayload]) -> None:
     dispatch_post_process_group_task(**task_kwargs)
 
 
+def _get_task_kwargs_and_dispatch_batch(message: Message[Sequence[KafkaPayload]]) -> None:
+    tasks = []
+    for payload in message.payload:
+        task_kwargs = _get_task_kwargs_for_payload(payload)
+        if task_kwargs:
+            tasks.append(task_kwargs)
+
+    if tasks:
+        dispatch_post_process_group_batches(tasks)
+
+
 class PostProcessForwarderStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
     def __init__(self, concurrency: int):
         self.__concurrency = concurrency
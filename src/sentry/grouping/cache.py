@@ -0,0 +1,136 @@
+"""
+Per-process cache of calculated grouping hashes.
+
+A high-volume issue sends the same stack trace over and over, and for every
+one of those events the full strategy tree is evaluated just to arrive at the
+same hashes again. This cache maps the grouping-relevant content of an event
+(the interfaces the strategies look at, plus project, grouping config and
+enhancements) to the hashes that were calculated for it.
+
+Only events that are grouped by their default fingerprint and have no
+checksum are cached, since custom fingerprints can reference arbitrary event
+data.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+from threading import Lock
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from django.conf import settings
+
+from sentry import options
+from sentry.grouping.result import CalculatedHashes
+from sentry.grouping.strategies.base import STRATEGIES
+from sentry.utils import json, metrics
+from sentry.utils.lru import LRUCache
+
+logger = logging.getLogger(__name__)
+
+_hash_cache: Optional[LRUCache[str, bytes]] = None
+_hash_cache_lock = Lock()
+
+
+def get_hash_cache() -> Optional[LRUCache[str, bytes]]:
+    """
+    Returns the per-process cache of grouping hashes, or ``None`` if
+    ``SENTRY_GROUPING_HASH_CACHE_SIZE`` is not set.
+    """
+    global _hash_cache
+
+    if _hash_cache is None and settings.SENTRY_GROUPING_HASH_CACHE_SIZE > 0:
+        with _hash_cache_lock:
+            if _hash_cache is None:
+                _hash_cache = LRUCache(
+                    max_size=settings.SENTRY_GROUPING_HASH_CACHE_SIZE,
+                    ttl=settings.SENTRY_GROUPING_HASH_CACHE_TTL,
+                    get_size=len,
+                    metrics_key="grouping.hash_cache",
+                )
+
+    return _hash_cache
+
+
+def _get_grouping_interfaces() -> Sequence[str]:
+    return sorted({strategy.interface for strategy in STRATEGIES.values()})
+
+
+def get_hash_cache_key(
+    project_id: int, grouping_config: Mapping[str, Any], data: Mapping[str, Any]
+) -> Optional[str]:
+    """
+    Returns the cache key for the grouping hashes of the (normalized) event
+    data, or ``None`` if the hashes of this event cannot be cached.
+    """
+    if data.get("checksum"):
+        return None
+
+    fingerprint = data.get("fingerprint")
+    if fingerprint and list(fingerprint) != ["{{ default }}"]:
+        return None
+
+    content = [
+        project_id,
+        grouping_config["id"],
+        grouping_config.get("enhancements"),
+        data.get("platform"),
+        [data.get(interface) for interface in _get_grouping_interfaces()],
+    ]
+    return hashlib.sha1(json.dumps(content).encode("utf-8")).hexdigest()
+
+
+def _dump_hashes(hashes: CalculatedHashes) -> bytes:
+    return json.dumps([hashes.hashes, hashes.hierarchical_hashes, hashes.tree_labels]).encode(
+        "utf-8"
+    )
+
+
+def _load_hashes(value: bytes) -> CalculatedHashes:
+    flat_hashes, hierarchical_hashes, tree_labels = json.loads(value)
+    return CalculatedHashes(
+        hashes=flat_hashes, hierarchical_hashes=hierarchical_hashes, tree_labels=tree_labels
+    )
+
+
+def get_cached_hashes(
+    get_cache_key: Callable[[], Optional[str]], calculate_hashes: Callable[[], CalculatedHashes]
+) -> CalculatedHashes:
+    """
+    Returns the hashes stored under the key returned by ``get_cache_key``, or
+    calculates and stores them with ``calculate_hashes``. The key is only
+    built if the cache is enabled.
+
+    A fraction of cache hits (``store.grouping-hash-cache-verify-sample-rate``) is
+    calculated anyway and compared against the cached hashes, so a cache key
+    that misses grouping-relevant data shows up in the
+    ``grouping.hash_cache.verified`` metric.
+    """
+    cache = get_hash_cache()
+    if cache is None:
+        return calculate_hashes()
+
+    cache_key = get_cache_key()
+    if cache_key is None:
+        return calculate_hashes()
+
+    value = cache.get(cache_key)
+    if value is None:
+        hashes = calculate_hashes()
+        cache.set(cache_key, _dump_hashes(hashes))
+        return hashes
+
+    cached_hashes = _load_hashes(value)
+
+    sample_rate = options.get("store.grouping-hash-cache-verify-sample-rate")
+    if sample_rate and random.random() < sample_rate:
+        hashes = calculate_hashes()
+        matches = _load_hashes(_dump_hashes(hashes)) == cached_hashes
+        metrics.incr("grouping.hash_cache.verified", tags={"matches": str(matches).lower()})
+        if not matches:
+            logger.error("grouping.hash_cache.mismatch", extra={"cache_key": cache_key})
+            cache.set(cache_key, _dump_hashes(hashes))
+        return hashes
+
+    return cached_hashes
@@ -16,7 +16,9 @@ from .matchers import (
     CalleeMatch,
     CallerMatch,
     ExceptionFieldMatch,
+    FamilyMatch,
     FrameMatch,
+    InAppMatch,
     Match,
     create_match_frame,
 )
@@ -122,27 +124,43 @@ class Enhancements:
         """
 
         cache = {}
+        mask_cache = {}
 
         match_frames = [create_match_frame(frame, platform) for frame in frames]
+        families = {frame["family"] for frame in match_frames}
 
         for rule in self._modifier_rules:
-            for idx, action in rule.get_matching_frame_actions(
-                match_frames, platform, exception_data, cache
-            ):
+            if not rule.may_match_families(families):
+                continue
+
+            actions = rule.get_matching_frame_actions(
+                match_frames, platform, exception_data, cache, mask_cache
+            )
+            for idx, action in actions:
                 action.apply_modifications_to_frame(frames, match_frames, idx, rule=rule)
 
+            if actions:
+                # The actions may have changed ``in_app`` or ``category`` of
+                # the frames, so matchers on those have to be evaluated again.
+                for matcher in [m for m in mask_cache if m.is_mutable]:
+                    del mask_cache[matcher]
+
     def update_frame_components_contributions(self, components, frames, platform, exception_data):
 
         cache = {}
+        mask_cache = {}
 
         match_frames = [create_match_frame(frame, platform) for frame in frames]
+        families = {frame["family"] for frame in match_frames}
 
         stacktrace_state = StacktraceState()
         # Apply direct frame actions and update the stack state alongside
         for rule in self._updater_rules:
+            if not rule.may_match_families(families):
+                continue
 
             for idx, action in rule.get_matching_frame_actions(
-                match_frames, platform, exception_data, cache
+                match_frames, platform, exception_data, cache, mask_cache
             ):
                 action.update_frame_components_contributions(components, frames, idx, rule=rule)
                 action.modify_stacktrace_state(stacktrace_state, rule)
@@ -277,13 +295,23 @@ class Rule:
     def __init__(self, matchers, actions):
         self.matchers = matchers
 
-        self._exception_matchers = []
-        self._other_matchers = []
+        # Matchers ordered so that the cheapest ones (which do not depend on
+        # the frame, or only compare a flag) are evaluated first and can cut
+        # evaluation of the rule short.
+        self._sorted_matchers = sorted(matchers, key=_matcher_cost)
+        self._exception_matchers = [m for m in matchers if isinstance(m, ExceptionFieldMatch)]
+
+        # Families this rule can possibly match, used to skip the rule for
+        # stack traces without any frames of those families. ``None`` means
+        # the rule is not restricted to any family.
+        self._families = None
         for matcher in matchers:
-            if isinstance(matcher, ExceptionFieldMatch):
-                self._exception_matchers.append(matcher)
-            else:
-                self._other_matchers.append(matcher)
+            if isinstance(matcher, FamilyMatch) and not matcher.negated:
+                if b"all" not in matcher._flags:
+                    if self._families is None:
+                        self._families = set(matcher._flags)
+                    else:
+                        self._families &= matcher._flags
 
         self.actions = actions
         self._is_updater = any(action.is_updater for action in actions)
@@ -312,26 +340,40 @@ class Rule:
             matchers[matcher.key] = matcher.pattern
         return {"match": matchers, "actions": [str(x) for x in self.actions]}
 
-    def get_matching_frame_actions(self, frames, platform, exception_data=None, cache=None):
-        """Given a frame returns all the matching actions based on this rule.
-        If the rule does not match `None` is returned.
+    def may_match_families(self, families):
+        """Returns `False` if this rule cannot match any frame of the given
+        families.
+        """
+        return self._families is None or not self._families.isdisjoint(families)
+
+    def get_matching_frame_actions(
+        self, frames, platform, exception_data=None, cache=None, mask_cache=None
+    ):
+        """Given frames returns all the matching actions based on this rule
+        as `(idx, action)` tuples.
+
+        Every matcher is evaluated over all frames at once into a bitmask
+        (see `Match.get_frame_mask`), and the rule matches the frames whose
+        bit is set in all masks. Masks are shared between rules through
+        `mask_cache`.
         """
         if not self.matchers:
             return []
 
-        # 1 - Check if exception matchers match
-        for m in self._exception_matchers:
-            if not m.matches_frame(frames, None, platform, exception_data, cache):
+        if cache is None:
+            cache = {}
+        if mask_cache is None:
+            mask_cache = {}
+
+        mask = (1 << len(frames)) - 1
+        for m in self._sorted_matchers:
+            mask &= m.get_frame_mask(frames, platform, exception_data, cache, mask_cache)
+            if not mask:
                 return []
 
         rv = []
-
-        # 2 - Check if frame matchers match
-        for idx, frame in enumerate(frames):
-            if all(
-                m.matches_frame(frames, idx, platform, exception_data, cache)
-                for m in self._other_matchers
-            ):
+        for idx in range(len(frames)):
+            if mask >> idx & 1:
                 for action in self.actions:
                     rv.append((idx, action))
 
@@ -351,6 +393,16 @@ class Rule:
         )
 
 
+def _matcher_cost(matcher):
+    if isinstance(matcher, ExceptionFieldMatch):
+        return 0
+    if isinstance(matcher, (FamilyMatch, InAppMatch)):
+        return 1
+    if isinstance(matcher, (CallerMatch, CalleeMatch)):
+        return 3
+    return 2
+
+
 class EnhancmentsVisitor(NodeVisitor):
     visit_comment = visit_empty = lambda *a: None
     unwrapped_exceptions = (InvalidEnhancerConfig,)
@@ -82,12 +82,26 @@ def create_match_frame(frame_data: dict, platform: Optional[str]) -> dict:
     return match_frame
 
 
+def _all_frames_mask(frames):
+    return (1 << len(frames)) - 1
+
+
 class Match:
     description = None
 
+    # Whether applying stack trace rules can change the frame field this
+    # matcher looks at, see ``FrameMatch.get_frame_mask``.
+    is_mutable = False
+
     def matches_frame(self, frames, idx, platform, exception_data, cache):
         raise NotImplementedError()
 
+    def get_frame_mask(self, frames, platform, exception_data, cache, mask_cache):
+        """Returns a bitmask of all frames matched by this matcher, where bit
+        ``idx`` is set if ``frames[idx]`` matches.
+        """
+        raise NotImplementedError()
+
     def _to_config_structure(self, version):
         raise NotImplementedError()
 
@@ -172,6 +186,22 @@ class FrameMatch(Match):
             rv = not rv
         return rv
 
+    def get_frame_mask(self, frames, platform, exception_data, cache, mask_cache):
+        # Matchers are shared between rules (see ``from_key``), so the mask of
+        # every matcher only needs to be computed once per stack trace.
+        try:
+            return mask_cache[self]
+        except KeyError:
+            pass
+
+        rv = 0
+        for idx in range(len(frames)):
+            if self.matches_frame(frames, idx, platform, exception_data, cache):
+                rv |= 1 << idx
+
+        mask_cache[self] = rv
+        return rv
+
     def _positive_frame_match(self, match_frame, platform, exception_data, cache):
         # Implement is subclasses
         raise NotImplementedError
@@ -233,6 +263,9 @@ class FamilyMatch(FrameMatch):
 
 
 class InAppMatch(FrameMatch):
+
+    is_mutable = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._ref_val = get_rule_bool(self.pattern)
@@ -265,6 +298,7 @@ class ModuleMatch(FrameFieldMatch):
 class CategoryMatch(FrameFieldMatch):
 
     field = "category"
+    is_mutable = True
 
 
 class ExceptionFieldMatch(FrameMatch):
@@ -275,6 +309,11 @@ class ExceptionFieldMatch(FrameMatch):
             rv = not rv
         return rv
 
+    def get_frame_mask(self, frames, platform, exception_data, cache, mask_cache):
+        if self.matches_frame(frames, None, platform, exception_data, cache):
+            return _all_frames_mask(frames)
+        return 0
+
     def _positive_frame_match(self, frame_data, platform, exception_data, cache):
         field = get_path(exception_data, *self.field_path) or "<unknown>"
         return cached(cache, glob_match, field, self._encoded_pattern)
@@ -306,11 +345,20 @@ class CallerMatch(Match):
     def _to_config_structure(self, version):
         return f"[{self.caller._to_config_structure(version)}]|"
 
+    @property
+    def is_mutable(self):
+        return self.caller.is_mutable
+
     def matches_frame(self, frames, idx, platform, exception_data, cache):
         return idx > 0 and self.caller.matches_frame(
             frames, idx - 1, platform, exception_data, cache
         )
 
+    def get_frame_mask(self, frames, platform, exception_data, cache, mask_cache):
+        # frame ``idx`` matches if its caller at ``idx - 1`` does
+        mask = self.caller.get_frame_mask(frames, platform, exception_data, cache, mask_cache)
+        return (mask << 1) & _all_frames_mask(frames)
+
 
 class CalleeMatch(Match):
     def __init__(self, caller: FrameMatch):
@@ -323,7 +371,16 @@ class CalleeMatch(Match):
     def _to_config_structure(self, version):
         return f"|[{self.caller._to_config_structure(version)}]"
 
+    @property
+    def is_mutable(self):
+        return self.caller.is_mutable
+
     def matches_frame(self, frames, idx, platform, exception_data, cache):
         return idx < len(frames) - 1 and self.caller.matches_frame(
             frames, idx + 1, platform, exception_data, cache
         )
+
+    def get_frame_mask(self, frames, platform, exception_data, cache, mask_cache):
+        # frame ``idx`` matches if its callee at ``idx + 1`` does
+        mask = self.caller.get_frame_mask(frames, platform, exception_data, cache, mask_cache)
+        return mask >> 1
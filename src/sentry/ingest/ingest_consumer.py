@@ -60,9 +60,10 @@ Message = Any
 class IngestConsumerWorker(AbstractBatchWorker):
     def __init__(self, process_event_executor: Optional[ThreadPoolExecutor] = None) -> None:
         self.__process_event_executor = process_event_executor
-        if self.__process_event_executor is None:
-            self.__process_event = process_event
-        else:
+        # Without an executor, the events of a batch are written to the
+        # processing store at once by ``process_event_batch``.
+        self.__process_event: Optional[Callable[[Message, Mapping[int, Project]], Any]] = None
+        if self.__process_event_executor is not None:
             self.__process_event = functools.partial(
                 process_event_async, self.__process_event_executor
             )
@@ -78,6 +79,7 @@ class IngestConsumerWorker(AbstractBatchWorker):
 
     def _flush_batch(self, batch: Sequence[Message]):
         attachment_chunks = []
+        events = []
 
         # Processing functions may be either synchronous or asynchronous.
         # Functions that return an ``AsyncResult`` may perform a combination of
@@ -103,7 +105,10 @@ class IngestConsumerWorker(AbstractBatchWorker):
                 projects_to_fetch.add(message["project_id"])
 
                 if message_type == "event":
-                    other_messages.append((self.__process_event, message))
+                    if self.__process_event is None:
+                        events.append(message)
+                    else:
+                        other_messages.append((self.__process_event, message))
                 elif message_type == "attachment_chunk":
                     attachment_chunks.append(message)
                 elif message_type == "attachment":
@@ -125,6 +130,10 @@ class IngestConsumerWorker(AbstractBatchWorker):
                 for attachment_chunk in attachment_chunks:
                     process_attachment_chunk(attachment_chunk, projects=projects)
 
+        if events:
+            with metrics.timer("ingest_consumer.process_event_batch"):
+                process_event_batch(events, projects)
+
         if other_messages:
             with metrics.timer("ingest_consumer.process_other_messages_batch"):
                 other_messages_flush_start = time.monotonic()
@@ -190,10 +199,8 @@ def _load_event(
     other processing components.
     """
     payload = message["payload"]
-    start_time = float(message["start_time"])
     event_id = message["event_id"]
     project_id = int(message["project_id"])
-    remote_addr = message.get("remote_addr")
     attachments = message.get("attachments") or ()
 
     sentry_sdk.set_extra("event_id", event_id)
@@ -268,49 +275,61 @@ def _load_event(
     ):
         return
 
-    def dispatch_task(cache_key: str) -> None:
-        if attachments:
-            with sentry_sdk.start_span(op="ingest_consumer.set_attachment_cache"):
-                attachment_objects = [
-                    CachedAttachment(type=attachment.pop("attachment_type"), **attachment)
-                    for attachment in attachments
-                ]
+    return data, functools.partial(_dispatch_event, message, project, data)
 
-                attachment_cache.set(
-                    cache_key, attachments=attachment_objects, timeout=CACHE_TIMEOUT
-                )
 
-        if data.get("type") == "transaction":
-            # No need for preprocess/process for transactions thus submit
-            # directly transaction specific save_event task.
-            save_event_transaction.delay(
+def _dispatch_event(
+    message: Message, project: Project, data: Mapping[str, Any], cache_key: str
+) -> None:
+    """
+    Resume processing of an event loaded by ``_load_event`` once its payload
+    has been persisted under ``cache_key``.
+    """
+    start_time = float(message["start_time"])
+    event_id = message["event_id"]
+    project_id = int(message["project_id"])
+    remote_addr = message.get("remote_addr")
+    attachments = message.get("attachments") or ()
+    deduplication_key = f"ev:{project_id}:{event_id}"
+
+    if attachments:
+        with sentry_sdk.start_span(op="ingest_consumer.set_attachment_cache"):
+            attachment_objects = [
+                CachedAttachment(type=attachment.pop("attachment_type"), **attachment)
+                for attachment in attachments
+            ]
+
+            attachment_cache.set(cache_key, attachments=attachment_objects, timeout=CACHE_TIMEOUT)
+
+    if data.get("type") == "transaction":
+        # No need for preprocess/process for transactions thus submit
+        # directly transaction specific save_event task.
+        save_event_transaction.delay(
+            cache_key=cache_key,
+            data=None,
+            start_time=start_time,
+            event_id=event_id,
+            project_id=project_id,
+        )
+    else:
+        # Preprocess this event, which spawns either process_event or
+        # save_event. Pass data explicitly to avoid fetching it again from the
+        # cache.
+        with sentry_sdk.start_span(op="ingest_consumer.process_event.preprocess_event"):
+            preprocess_event(
                 cache_key=cache_key,
-                data=None,
+                data=data,
                 start_time=start_time,
                 event_id=event_id,
-                project_id=project_id,
+                project=project,
+                has_attachments=bool(attachments),
             )
-        else:
-            # Preprocess this event, which spawns either process_event or
-            # save_event. Pass data explicitly to avoid fetching it again from the
-            # cache.
-            with sentry_sdk.start_span(op="ingest_consumer.process_event.preprocess_event"):
-                preprocess_event(
-                    cache_key=cache_key,
-                    data=data,
-                    start_time=start_time,
-                    event_id=event_id,
-                    project=project,
-                    has_attachments=bool(attachments),
-                )
-
-        # remember for an 1 hour that we saved this event (deduplication protection)
-        cache.set(deduplication_key, "", CACHE_TIMEOUT)
 
-        # emit event_accepted once everything is done
-        event_accepted.send_robust(ip=remote_addr, data=data, project=project, sender=process_event)
+    # remember for an 1 hour that we saved this event (deduplication protection)
+    cache.set(deduplication_key, "", CACHE_TIMEOUT)
 
-    return data, dispatch_task
+    # emit event_accepted once everything is done
+    event_accepted.send_robust(ip=remote_addr, data=data, project=project, sender=process_event)
 
 
 def _store_event(data) -> str:
@@ -323,6 +342,37 @@ def process_event(message: Message, projects: Mapping[int, Project]) -> None:
     return _do_process_event(message, projects)
 
 
+@trace_func(name="ingest_consumer.process_event_batch")
+def process_event_batch(messages: Sequence[Message], projects: Mapping[int, Project]) -> None:
+    """
+    Processes a batch of events like ``process_event``, but writes all of
+    them to the processing store in one round-trip. Events are dispatched in
+    the order of ``messages``.
+    """
+    loaded = []
+    seen = set()
+    for message in messages:
+        # The deduplication key is only written once an event has been
+        # dispatched, so duplicates within the batch are skipped here.
+        event_key = (int(message["project_id"]), message["event_id"])
+        if event_key in seen:
+            continue
+        seen.add(event_key)
+
+        result = _load_event(message, projects)
+        if result is not None:
+            loaded.append(result)
+
+    if not loaded:
+        return
+
+    with metrics.timer("ingest_consumer._store_events"):
+        cache_keys = event_processing_store.store_many([data for data, _ in loaded])
+
+    for (_, callback), cache_key in zip(loaded, cache_keys):
+        callback(cache_key)
+
+
 def process_event_async(
     executor: ThreadPoolExecutor, message: Message, projects: Mapping[int, Project]
 ) -> Optional["AsyncResult[str]"]:
@@ -0,0 +1,193 @@
+import logging
+from functools import partial
+from typing import Any, Mapping, NamedTuple, Optional
+
+import msgpack
+from arroyo import Topic
+from arroyo.backends.kafka import KafkaConsumer, KafkaPayload, build_kafka_consumer_configuration
+from arroyo.commit import ONCE_PER_SECOND
+from arroyo.processing import StreamProcessor
+from arroyo.processing.strategies import (
+    CommitOffsets,
+    ProcessingStrategy,
+    ProcessingStrategyFactory,
+    RunTask,
+    RunTaskWithMultiprocessing,
+)
+from arroyo.types import Commit, Message, Partition
+
+from sentry.snuba.utils import initialize_consumer_state
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessedMessage(NamedTuple):
+    """
+    The result of the parallel part of processing an ingest message.
+
+    ``message`` is the decoded message. For events, ``data`` is the parsed
+    payload and ``cache_key`` the key it was stored under in the processing
+    store.
+    """
+
+    message: Mapping[str, Any]
+    data: Optional[Any] = None
+    cache_key: Optional[str] = None
+
+
+def get_parallel_ingest_consumer(
+    consumer_type: str,
+    group_id: str,
+    auto_offset_reset: str,
+    max_batch_size: int,
+    max_batch_time: float,
+    processes: int,
+    input_block_size: int,
+    output_block_size: int,
+    force_topic: Optional[str] = None,
+    force_cluster: Optional[str] = None,
+) -> StreamProcessor[KafkaPayload]:
+    """
+    Builds an ingest consumer which decodes messages, parses event payloads
+    and writes them to the processing store in ``processes`` subprocesses.
+
+    Everything that depends on the order of messages (dispatching tasks,
+    saving attachments and user reports) runs in the main process in
+    the order of the topic, and offsets are only committed after that.
+    """
+    from django.conf import settings
+
+    from sentry.ingest.types import ConsumerType
+    from sentry.utils.batching_kafka_consumer import create_topics
+    from sentry.utils.kafka_config import get_kafka_consumer_cluster_options
+
+    if force_topic and force_cluster:
+        topic_name = force_topic
+        cluster_name = force_cluster
+    elif force_topic or force_cluster:
+        raise ValueError(
+            "Both 'force_topic' and 'force_cluster' have to be provided to override the configuration"
+        )
+    else:
+        topic_name = ConsumerType.get_topic_name(consumer_type)
+        cluster_name = settings.KAFKA_TOPICS[topic_name]["cluster"]
+
+    create_topics(cluster_name, [topic_name])
+
+    consumer = KafkaConsumer(
+        build_kafka_consumer_configuration(
+            get_kafka_consumer_cluster_options(cluster_name),
+            auto_offset_reset=auto_offset_reset,
+            group_id=group_id,
+        )
+    )
+
+    strategy_factory = IngestStrategyFactory(
+        max_batch_size,
+        max_batch_time,
+        processes,
+        input_block_size,
+        output_block_size,
+    )
+
+    return StreamProcessor(consumer, Topic(topic_name), strategy_factory, ONCE_PER_SECOND)
+
+
+class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
+    def __init__(
+        self,
+        max_batch_size: int,
+        max_batch_time: float,
+        processes: int,
+        input_block_size: int,
+        output_block_size: int,
+    ):
+        super().__init__()
+        self.max_batch_size = max_batch_size
+        self.max_batch_time = max_batch_time
+        self.num_processes = processes
+        self.input_block_size = input_block_size
+        self.output_block_size = output_block_size
+
+    def create_with_partitions(
+        self,
+        commit: Commit,
+        partitions: Mapping[Partition, int],
+    ) -> ProcessingStrategy[KafkaPayload]:
+        return RunTaskWithMultiprocessing(
+            process_message,
+            RunTask(finish_message, CommitOffsets(commit)),
+            self.num_processes,
+            self.max_batch_size,
+            self.max_batch_time,
+            self.input_block_size,
+            self.output_block_size,
+            initializer=partial(initialize_consumer_state),
+        )
+
+
+def process_message(message: Message[KafkaPayload]) -> Optional[ProcessedMessage]:
+    """
+    Runs in a subprocess. Attachment chunks are written to the attachment cache
+    right away, events are parsed and stored in the processing store.
+    """
+    from sentry.ingest.ingest_consumer import _load_event, _store_event, process_attachment_chunk
+    from sentry.models import Project
+    from sentry.utils import metrics
+
+    decoded = msgpack.unpackb(message.payload.value, use_list=False)
+    message_type = decoded["type"]
+    metrics.incr("ingest_consumer.messages_seen", tags={"message_type": message_type})
+
+    if message_type == "attachment_chunk":
+        process_attachment_chunk(decoded, projects={})
+        return None
+    elif message_type == "event":
+        project_id = int(decoded["project_id"])
+        projects = {p.id: p for p in Project.objects.get_many_from_cache([project_id])}
+        result = _load_event(decoded, projects)
+        if result is None:
+            return None
+
+        data, _ = result
+        return ProcessedMessage(decoded, data, _store_event(data))
+    elif message_type in ("attachment", "user_report"):
+        return ProcessedMessage(decoded)
+    else:
+        raise ValueError(f"Unknown message type: {message_type}")
+
+
+def finish_message(message: Message[Optional[ProcessedMessage]]) -> None:
+    """
+    Runs in the main process, in the order the messages were consumed.
+    """
+    from sentry.ingest.ingest_consumer import (
+        _dispatch_event,
+        process_individual_attachment,
+        process_userreport,
+    )
+    from sentry.models import Project
+    from sentry.utils.sdk import mark_scope_as_unsafe
+
+    processed = message.payload
+    if processed is None:
+        return
+
+    mark_scope_as_unsafe()
+
+    decoded = processed.message
+    project_id = int(decoded["project_id"])
+    try:
+        project = Project.objects.get_from_cache(id=project_id)
+    except Project.DoesNotExist:
+        logger.error("Project for ingested event does not exist: %s", project_id)
+        return
+
+    message_type = decoded["type"]
+    if message_type == "event":
+        assert processed.cache_key is not None
+        _dispatch_event(decoded, project, processed.data, processed.cache_key)
+    elif message_type == "attachment":
+        process_individual_attachment(decoded, {project_id: project})
+    elif message_type == "user_report":
+        process_userreport(decoded, {project_id: project})
@@ -6,11 +6,14 @@ import re
 import sys
 import time
 import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
 from io import BytesIO
 from itertools import groupby
 from os.path import splitext
+from threading import Lock
 from typing import IO, Callable, Optional, Tuple
 from urllib.parse import urlsplit
 
@@ -45,6 +48,7 @@ from sentry.utils.files import compress_file
 from sentry.utils.hashlib import md5_text
 from sentry.utils.http import is_valid_origin
 from sentry.utils.javascript import find_sourcemap
+from sentry.utils.lru import LRUCache
 from sentry.utils.retries import ConditionalRetryPolicy, exponential_delay
 from sentry.utils.safe import get_path
 from sentry.utils.urls import non_standard_url_join
@@ -89,6 +93,130 @@ CACHE_MAX_VALUE_SIZE = settings.SENTRY_CACHE_MAX_VALUE_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Parsed sourcemaps are shared by all events processed in the same process.
+_sourcemap_cache_lru = None
+_sourcemap_cache_lru_lock = Lock()
+
+
+def get_sourcemap_cache_lru():
+    """
+    Returns the per-process cache of parsed sourcemaps, or ``None`` if
+    ``SENTRY_JAVASCRIPT_SOURCEMAP_CACHE_SIZE`` is not set.
+    """
+    global _sourcemap_cache_lru
+
+    if _sourcemap_cache_lru is None and settings.SENTRY_JAVASCRIPT_SOURCEMAP_CACHE_SIZE > 0:
+        with _sourcemap_cache_lru_lock:
+            if _sourcemap_cache_lru is None:
+                _sourcemap_cache_lru = LRUCache(
+                    max_size=settings.SENTRY_JAVASCRIPT_SOURCEMAP_CACHE_SIZE,
+                    get_size=lambda entry: entry[0],
+                    metrics_key="sourcemaps.parsed_cache",
+                )
+
+    return _sourcemap_cache_lru
+
+
+# Remote files are downloaded through a thread pool shared by all events
+# processed in the same process.
+_prefetch_executor = None
+_prefetch_executor_lock = Lock()
+
+# The number of downloads of every host that are running in the pool, and the
+# downloads waiting for one of those to finish. Hosts are only kept while they
+# have downloads, so this does not grow with the number of hosts seen.
+_prefetch_hosts = {}
+_prefetch_hosts_lock = Lock()
+
+
+def get_prefetch_executor():
+    """
+    Returns the per-process pool used to download remote files concurrently,
+    or ``None`` if ``SENTRY_JAVASCRIPT_PREFETCH_WORKERS`` is not set.
+    """
+    global _prefetch_executor
+
+    if _prefetch_executor is None and settings.SENTRY_JAVASCRIPT_PREFETCH_WORKERS > 0:
+        with _prefetch_executor_lock:
+            if _prefetch_executor is None:
+                _prefetch_executor = ThreadPoolExecutor(
+                    max_workers=settings.SENTRY_JAVASCRIPT_PREFETCH_WORKERS,
+                    thread_name_prefix="sourcemaps-prefetch",
+                )
+
+    return _prefetch_executor
+
+
+class _PrefetchHost:
+    __slots__ = ("running", "pending")
+
+    def __init__(self):
+        self.running = 0
+        self.pending = deque()
+
+
+def _submit_prefetch(executor, url, headers, verify_ssl):
+    """
+    Downloads the file at url in executor and returns a future of the result, or of the `BadSource` error.
+
+    At most `SENTRY_JAVASCRIPT_PREFETCH_PER_HOST` files of a host are downloaded at the same time by the whole
+    process. Further downloads of the host are queued rather than submitted, so they do not take up workers
+    that could download files of other hosts in the meantime.
+    """
+    host = urlsplit(url).netloc
+    job = (executor, url, headers, verify_ssl, Future())
+
+    with _prefetch_hosts_lock:
+        state = _prefetch_hosts.get(host)
+        if state is None:
+            state = _prefetch_hosts[host] = _PrefetchHost()
+        if state.running >= settings.SENTRY_JAVASCRIPT_PREFETCH_PER_HOST:
+            state.pending.append(job)
+            return job[-1]
+        state.running += 1
+
+    _start_prefetch(host, job)
+    return job[-1]
+
+
+def _start_prefetch(host, job):
+    executor, url, headers, verify_ssl, future = job
+    try:
+        executor.submit(_prefetch_file, host, url, headers, verify_ssl, future)
+    except Exception as exc:
+        # e.g. the executor was shut down
+        future.set_exception(exc)
+        _finish_prefetch(host)
+
+
+def _prefetch_file(host, url, headers, verify_ssl, future):
+    try:
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(http.fetch_file(url, headers=headers, verify_ssl=verify_ssl))
+            except http.BadSource as exc:
+                future.set_result(exc)
+            except Exception as exc:
+                future.set_exception(exc)
+    finally:
+        _finish_prefetch(host)
+
+
+def _finish_prefetch(host):
+    """
+    Starts the next queued download of host in place of one that finished.
+    """
+    with _prefetch_hosts_lock:
+        state = _prefetch_hosts[host]
+        if not state.pending:
+            state.running -= 1
+            if not state.running:
+                del _prefetch_hosts[host]
+            return
+        job = state.pending.popleft()
+
+    _start_prefetch(host, job)
+
 
 class UnparseableSourcemap(http.BadSource):
     error_type = EventError.JS_INVALID_SOURCEMAP
@@ -690,6 +818,9 @@ class Fetcher:
         # Set that contains all the tuples (release, dist) of a bundle for which the query returned an empty result.
         # Here we also don't put the project for the same reasoning as above.
         self.empty_result_for_releases = set()
+        # Mapping between urls and the results of downloading them concurrently in `prefetch_by_url`, which are
+        # consumed by `fetch_by_url`.
+        self.prefetched_files = {}
 
     def bind_release(self, release=None, dist=None):
         """
@@ -705,6 +836,7 @@ class Fetcher:
         for _, open_archive in self.open_archives.items():
             if open_archive is not INVALID_ARCHIVE:
                 open_archive.close()
+        self.prefetched_files.clear()
 
     def _lookup_in_open_archives(self, block):
         """
@@ -1197,6 +1329,74 @@ class Fetcher:
 
         return result
 
+    def _get_fetch_file_options(self, url):
+        headers = {}
+        verify_ssl = False
+        if self.project and is_valid_origin(url, project=self.project):
+            verify_ssl = bool(self.project.get_option("sentry:verify_ssl", False))
+            token = self.project.get_option("sentry:token")
+            if token:
+                token_header = self.project.get_option("sentry:token_header") or "X-Sentry-Token"
+                headers[token_header] = token
+
+        return headers, verify_ssl
+
+    def _fetch_file(self, url):
+        """
+        Downloads the file at url, unless it has been downloaded by `prefetch_by_url` already.
+        """
+        result = self.prefetched_files.pop(url, None)
+        if result is None:
+            headers, verify_ssl = self._get_fetch_file_options(url)
+            return http.fetch_file(url, headers=headers, verify_ssl=verify_ssl)
+
+        metrics.incr("sourcemaps.prefetch.used", skip_internal=True)
+        if isinstance(result, http.BadSource):
+            raise result
+        return result
+
+    def _should_prefetch(self, url):
+        """
+        Returns whether `fetch_by_url` would have to download the file at url from the web. The lookups of
+        `fetch_by_url_new` and `_fetch_release_artifact` are cached, so repeating them later is cheap.
+        """
+        if url in self.failed_urls or url in self.prefetched_files or url[-3:] == "...":
+            return False
+
+        if not url.startswith(("http:", "https:")) or not self.allow_scraping:
+            return False
+
+        if self.release and (
+            self.fetch_by_url_new(url) is not None or self._fetch_release_artifact(url) is not None
+        ):
+            return False
+
+        return cache.get(f"source:cache:v4:{md5_text(url).hexdigest()}") is None
+
+    def prefetch_by_url(self, urls):
+        """
+        Concurrently downloads all files at urls that `fetch_by_url` would otherwise download one by one. Does
+        nothing unless `SENTRY_JAVASCRIPT_PREFETCH_WORKERS` is set.
+
+        Results are kept until they are consumed by `fetch_by_url`, which handles them exactly like the results of
+        its own downloads.
+        """
+        executor = get_prefetch_executor()
+        if executor is None:
+            return
+
+        urls = [url for url in urls if self._should_prefetch(url)]
+        if len(urls) < 2:
+            return
+
+        futures = {
+            url: _submit_prefetch(executor, url, *self._get_fetch_file_options(url)) for url in urls
+        }
+        for url, future in futures.items():
+            self.prefetched_files[url] = future.result()
+
+        metrics.incr("sourcemaps.prefetch.fetched", amount=len(futures), skip_internal=True)
+
     def fetch_by_url(self, url):
         """
         Pull down a URL, returning a UrlResult object.
@@ -1257,20 +1457,9 @@ class Fetcher:
                 )
 
         if result is None:
-            headers = {}
-            verify_ssl = False
-            if self.project and is_valid_origin(url, project=self.project):
-                verify_ssl = bool(self.project.get_option("sentry:verify_ssl", False))
-                token = self.project.get_option("sentry:token")
-                if token:
-                    token_header = (
-                        self.project.get_option("sentry:token_header") or "X-Sentry-Token"
-                    )
-                    headers[token_header] = token
-
             with metrics.timer("sourcemaps.fetch"):
                 with sentry_sdk.start_span(op="JavaScriptStacktraceProcessor.fetch_file.http"):
-                    result = http.fetch_file(url, headers=headers, verify_ssl=verify_ssl)
+                    result = self._fetch_file(url)
                 with sentry_sdk.start_span(op="Fetcher.fetch_by_url.compress_for_cache"):
                     z_body = zlib.compress(result.body)
                 cache.set(
@@ -1990,8 +2179,10 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                     # We want to keep track of the sourcemap url of the sourcemap resolved with this specific debug id.
                     self.sourcemap_debug_id_to_sourcemap_url[debug_id] = result.url
                     # This is an expensive operation that should be executed as few times as possible.
-                    return SmCache.from_bytes(
-                        minified_sourceview.get_source().encode("utf-8"), result.body
+                    return self._build_sourcemap_cache(
+                        ("debug_id", debug_id),
+                        minified_sourceview.get_source().encode("utf-8"),
+                        result.body,
                     )
             except Exception as exc:
                 # This is in debug because the product shows an error already.
@@ -2093,12 +2284,40 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 op="JavaScriptStacktraceProcessor.fetch_sourcemap_view_by_url.SmCache.from_bytes"
             ):
                 # This is an expensive operation that should be executed as few times as possible.
-                return SmCache.from_bytes(source, body)
+                return self._build_sourcemap_cache(("url", url), source, body)
         except Exception as exc:
             # This is in debug because the product shows an error already.
             logger.debug(str(exc), exc_info=True)
             raise UnparseableSourcemap({"url": http.expose_url(url)})
 
+    def _build_sourcemap_cache(self, ident, source, sourcemap):
+        """
+        Parses the ``sourcemap`` of the minified ``source`` into an SmCache, or
+        returns the one parsed for the same files in this process before.
+
+        Entries are keyed by the release and dist they are resolved in, the
+        sourcemap's ``ident`` and the digest of both files, so an artifact
+        that is uploaded again under the same name is never served stale.
+        """
+        lru = get_sourcemap_cache_lru()
+        if lru is None:
+            return SmCache.from_bytes(source, sourcemap)
+
+        key = (
+            self.organization.id,
+            getattr(self.fetcher.release, "id", None),
+            getattr(self.fetcher.dist, "id", None),
+            ident,
+            md5_text(source, sourcemap).hexdigest(),
+        )
+        entry = lru.get(key)
+        if entry is not None:
+            return entry[1]
+
+        sourcemap_cache = SmCache.from_bytes(source, sourcemap)
+        lru.set(key, (len(source) + len(sourcemap), sourcemap_cache))
+        return sourcemap_cache
+
     def populate_source_cache(self, frames):
         """
         Fetch all sources that we know are required (being referenced directly
@@ -2120,6 +2339,14 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                 continue
             pending_file_list.add(f["abs_path"])
 
+        with sentry_sdk.start_span(
+            op="JavaScriptStacktraceProcessor.populate_source_cache.prefetch_sources"
+        ):
+            # Files with a debug id are looked up by it first.
+            self.fetcher.prefetch_by_url(
+                url for url in pending_file_list if url not in self.abs_path_debug_id
+            )
+
         for idx, url in enumerate(pending_file_list):
             with sentry_sdk.start_span(
                 op="JavaScriptStacktraceProcessor.populate_source_cache.cache_source"
@@ -2131,6 +2358,19 @@ class JavaScriptStacktraceProcessor(StacktraceProcessor):
                     url=url, debug_id=debug_id, source_file_type=SourceFileType.MINIFIED_SOURCE
                 )
 
+        with sentry_sdk.start_span(
+            op="JavaScriptStacktraceProcessor.populate_source_cache.prefetch_sourcemaps"
+        ):
+            # Sourcemaps are only known once the minified sources are fetched, they are
+            # resolved when processing the frames.
+            self.fetcher.prefetch_by_url(
+                {
+                    sourcemap_url
+                    for url, sourcemap_url in self.minified_source_url_to_sourcemap_url.items()
+                    if url in pending_file_list and not is_data_uri(sourcemap_url)
+                }
+            )
+
     def close(self):
         StacktraceProcessor.close(self)
         # We want to close all the open archives inside the local Fetcher cache.
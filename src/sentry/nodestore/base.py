@@ -1,10 +1,12 @@
-from threading import local
+from threading import Lock, local
 
 import sentry_sdk
+from django.conf import settings
 from django.core.cache import InvalidCacheBackendError, caches
 
 from sentry.utils import json
 from sentry.utils.cache import memoize
+from sentry.utils.lru import LRUCache
 from sentry.utils.services import Service
 
 # Cache an instance of the encoder we want to use
@@ -22,6 +24,41 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json._default_decoder.decode
 
+# The local cache is shared by all threads of the process, while
+# ``NodeStorage`` instances are thread-local.
+_local_cache = None
+_local_cache_lock = Lock()
+
+
+def get_local_cache():
+    """
+    Returns the per-process cache of raw node payloads, or ``None`` if
+    ``SENTRY_NODESTORE_LOCAL_CACHE_SIZE`` is not set.
+    """
+    global _local_cache
+
+    if _local_cache is None and settings.SENTRY_NODESTORE_LOCAL_CACHE_SIZE > 0:
+        with _local_cache_lock:
+            if _local_cache is None:
+                _local_cache = LRUCache(
+                    max_size=settings.SENTRY_NODESTORE_LOCAL_CACHE_SIZE,
+                    ttl=settings.SENTRY_NODESTORE_LOCAL_CACHE_TTL,
+                    get_size=len,
+                    metrics_key="nodestore.local_cache",
+                )
+
+    return _local_cache
+
+
+def _segment_end(value, start):
+    end = value.find(b"\n", start)
+    return len(value) if end == -1 else end
+
+
+def _next_segment(value, start):
+    end = value.find(b"\n", start)
+    return None if end == -1 else end + 1
+
 
 class NodeStorage(local, Service):
     """
@@ -89,28 +126,36 @@ class NodeStorage(local, Service):
             self.delete(id)
 
     def _decode(self, value, subkey):
-        if value is None:
+        if not value:
             return None
 
-        lines_iter = iter(value.splitlines())
-        try:
-            if subkey is not None:
-                # Those keys should be statically known identifiers in the app, such as
-                # "unprocessed_event". There is really no reason to allow anything but
-                # ASCII here.
-                subkey = subkey.encode("ascii")
-
-                next(lines_iter)
-
-                for line in lines_iter:
-                    if line.strip() == subkey:
-                        break
-
-                    next(lines_iter)
-
-            return json_loads(next(lines_iter))
-        except StopIteration:
-            return None
+        # Segments are separated by newlines, which never occur inside of the
+        # JSON produced by ``_encode``. Instead of splitting the whole payload
+        # we seek from separator to separator and only slice out (and parse)
+        # the segment that was asked for.
+        start = 0
+        if subkey is not None:
+            # Those keys should be statically known identifiers in the app, such as
+            # "unprocessed_event". There is really no reason to allow anything but
+            # ASCII here.
+            subkey = subkey.encode("ascii")
+
+            # skip the default payload
+            start = _next_segment(value, start)
+            while start is not None:
+                key_end = _segment_end(value, start)
+                key = value[start:key_end]
+                start = _next_segment(value, start)
+                if start is None:
+                    return None
+                if key.strip() == subkey:
+                    break
+                start = _next_segment(value, start)
+
+            if start is None:
+                return None
+
+        return json_loads(value[start : _segment_end(value, start)])
 
     def _get_bytes(self, id):
         """
@@ -126,6 +171,13 @@ class NodeStorage(local, Service):
         """
         with sentry_sdk.start_span(op="nodestore.get") as span:
             span.set_tag("node_id", id)
+            local_bytes = self._get_local_cache_bytes([id]).get(id)
+            if local_bytes is not None:
+                span.set_tag("origin", "from_local_cache")
+                rv = self._decode(local_bytes, subkey=subkey)
+                span.set_tag("found", bool(rv))
+                return rv
+
             if subkey is None:
                 item_from_cache = self._get_cache_item(id)
                 if item_from_cache:
@@ -136,6 +188,7 @@ class NodeStorage(local, Service):
             span.set_tag("subkey", str(subkey))
             bytes_data = self._get_bytes(id)
             rv = self._decode(bytes_data, subkey=subkey)
+            self._set_local_cache_bytes({id: bytes_data})
             if subkey is None:
                 # set cache item only after we know decoding did not fail
                 self._set_cache_item(id, rv)
@@ -169,23 +222,34 @@ class NodeStorage(local, Service):
             span.set_tag("subkey", str(subkey))
             span.set_tag("num_ids", len(id_list))
 
+            local_items = {
+                id: self._decode(value, subkey=subkey)
+                for id, value in self._get_local_cache_bytes(id_list).items()
+            }
+            if len(local_items) == len(id_list):
+                span.set_tag("result", "from_local_cache")
+                return local_items
+
+            id_list = [id for id in id_list if id not in local_items]
+
             if subkey is None:
                 cache_items = self._get_cache_items(id_list)
                 if len(cache_items) == len(id_list):
                     span.set_tag("result", "from_cache")
+                    cache_items.update(local_items)
                     return cache_items
 
                 uncached_ids = [id for id in id_list if id not in cache_items]
             else:
                 uncached_ids = id_list
 
-            items = {
-                id: self._decode(value, subkey=subkey)
-                for id, value in self._get_bytes_multi(uncached_ids).items()
-            }
+            bytes_items = self._get_bytes_multi(uncached_ids)
+            self._set_local_cache_bytes(bytes_items)
+            items = {id: self._decode(value, subkey=subkey) for id, value in bytes_items.items()}
             if subkey is None:
                 self._set_cache_items(items)
                 items.update(cache_items)
+            items.update(local_items)
 
             span.set_tag("result", "from_service")
             span.set_tag("found", len(items))
@@ -208,8 +272,11 @@ class NodeStorage(local, Service):
 
         return b"\n".join(lines)
 
-    def _set_bytes(self, id, data, ttl=None):
+    def _set_bytes(self, id, data, ttl=None, platform=None):
         """
+        ``platform`` is the platform of the main payload if known, backends
+        may use it to pick a compression dictionary.
+
         >>> nodestore.set('key1', b"{'foo': 'bar'}")
         """
         raise NotImplementedError
@@ -241,10 +308,12 @@ class NodeStorage(local, Service):
             span.set_tag("node_id", id)
             span.set_data("subkeys_count", len(data))
             cache_item = data.get(None)
+            platform = cache_item.get("platform") if isinstance(cache_item, dict) else None
             bytes_data = self._encode(data)
-            self._set_bytes(id, bytes_data, ttl=ttl)
+            self._set_bytes(id, bytes_data, ttl=ttl, platform=platform)
             # set cache only after encoding and write to nodestore has succeeded
             self._set_cache_item(id, cache_item)
+            self._set_local_cache_bytes({id: bytes_data})
 
     def cleanup(self, cutoff_timestamp):
         raise NotImplementedError
@@ -252,6 +321,22 @@ class NodeStorage(local, Service):
     def bootstrap(self):
         raise NotImplementedError
 
+    def _get_local_cache_bytes(self, id_list):
+        local_cache = get_local_cache()
+        if local_cache is not None:
+            return local_cache.get_many(id_list)
+        return {}
+
+    def _set_local_cache_bytes(self, items):
+        # The raw payload is cached rather than the decoded value so that
+        # every subkey can be served from it, and callers never share (and
+        # mutate) the same dictionary.
+        local_cache = get_local_cache()
+        if local_cache is not None:
+            for id, bytes_data in items.items():
+                if bytes_data is not None:
+                    local_cache.set(id, bytes_data)
+
     def _get_cache_item(self, id):
         if self.cache:
             return self.cache.get(id)
@@ -270,10 +355,16 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, id):
+        local_cache = get_local_cache()
+        if local_cache is not None:
+            local_cache.delete(id)
         if self.cache:
             self.cache.delete(id)
 
     def _delete_cache_items(self, id_list):
+        local_cache = get_local_cache()
+        if local_cache is not None:
+            local_cache.delete_many(id_list)
         if self.cache:
             self.cache.delete_many([id for id in id_list])
 
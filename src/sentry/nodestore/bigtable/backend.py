@@ -3,6 +3,7 @@ import os
 import sentry_sdk
 
 from sentry.nodestore.base import NodeStorage
+from sentry.nodestore.compression import NodeCompressor, load_dictionaries
 from sentry.utils.kvstore.bigtable import BigtableKVStorage
 
 
@@ -18,6 +19,16 @@ class BigtableNodeStorage(NodeStorage):
         valid for reading + returning)
     :param compression: A boolean whether to enable zlib-compression, or the
         string "zstd" to use zstd.
+    :param dictionary_path: Directory of trained zstd dictionaries, see
+        ``sentry nodestore train-dictionary``. Only used together with zstd
+        compression, in which case payloads are compressed by the nodestore
+        rather than by the underlying key-value store.
+    :param get_many_concurrency: Number of threads used to read (and
+        decompress) the rows requested by ``get_multi`` in parallel.
+    :param get_many_shard_size: Number of rows read by each of those threads
+        at a time.
+    :param get_many_timeout: Seconds after which reading the rows requested
+        by ``get_multi`` in parallel fails.
 
     >>> BigtableNodeStorage(
     ...     project='some-project',
@@ -38,6 +49,10 @@ class BigtableNodeStorage(NodeStorage):
         automatic_expiry=False,
         default_ttl=None,
         compression=False,
+        dictionary_path=None,
+        get_many_concurrency=1,
+        get_many_shard_size=10,
+        get_many_timeout=30.0,
         **client_options,
     ):
         if compression is True:
@@ -45,6 +60,15 @@ class BigtableNodeStorage(NodeStorage):
         elif compression is False:
             compression = None
 
+        self.compressor = None
+        dictionaries = load_dictionaries(dictionary_path)
+        if compression == "zstd" and dictionaries:
+            # Dictionary-compressed payloads carry the zstd frame header
+            # (including the dictionary id) themselves, so they are stored
+            # without a compression flag and decoded in ``_get_bytes``.
+            self.compressor = NodeCompressor(compression="zstd", dictionaries=dictionaries)
+            compression = None
+
         self.store = self.store_class(
             project=project,
             instance=instance,
@@ -52,19 +76,33 @@ class BigtableNodeStorage(NodeStorage):
             default_ttl=default_ttl,
             compression=compression,
             client_options=client_options,
+            get_many_concurrency=get_many_concurrency,
+            get_many_shard_size=get_many_shard_size,
+            get_many_timeout=get_many_timeout,
         )
         self.automatic_expiry = automatic_expiry
         self.skip_deletes = automatic_expiry and "_SENTRY_CLEANUP" in os.environ
 
+    def _decompress(self, data):
+        if data is None or self.compressor is None:
+            return data
+        return self.compressor.decompress(data)
+
     def _get_bytes(self, id):
-        return self.store.get(id)
+        return self._decompress(self.store.get(id))
 
     def _get_bytes_multi(self, id_list):
         rv = {id: None for id in id_list}
-        rv.update(self.store.get_many(id_list))
+        rv.update(
+            self.store.get_many(
+                id_list, decode=self._decompress if self.compressor is not None else None
+            )
+        )
         return rv
 
-    def _set_bytes(self, id, data, ttl=None):
+    def _set_bytes(self, id, data, ttl=None, platform=None):
+        if self.compressor is not None:
+            data = self.compressor.compress(data, platform=platform)
         self.store.set(id, data, ttl)
 
     def delete(self, id):
@@ -0,0 +1,125 @@
+"""
+Compression of nodestore payloads.
+
+Compressed payloads are self-describing: zstd frames start with the zstd
+magic number and record the id of the dictionary they were compressed with,
+zlib streams start with their own header byte, and anything else is assumed
+to be an uncompressed payload. This lets blobs written by any codec (and any
+dictionary generation) be decoded side by side.
+"""
+import logging
+import os
+import threading
+import zlib
+from typing import Dict, Iterable, Mapping, Optional
+
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZLIB_HEADER = 0x78
+
+# Suffix of dictionary files, which are named after the platform they were
+# trained for (e.g. ``javascript.zdict``). ``default.zdict`` is used for
+# platforms without a dedicated dictionary.
+DICTIONARY_SUFFIX = ".zdict"
+DEFAULT_DICTIONARY = "default"
+
+
+def load_dictionaries(path: Optional[str]) -> Mapping[str, zstandard.ZstdCompressionDict]:
+    """
+    Loads all trained dictionaries from ``path``, keyed by platform.
+    """
+    dictionaries = {}
+    if not path or not os.path.isdir(path):
+        return dictionaries
+
+    for filename in sorted(os.listdir(path)):
+        if not filename.endswith(DICTIONARY_SUFFIX):
+            continue
+        with open(os.path.join(path, filename), "rb") as f:
+            dictionaries[filename[: -len(DICTIONARY_SUFFIX)]] = zstandard.ZstdCompressionDict(
+                f.read()
+            )
+
+    return dictionaries
+
+
+def train_dictionary(samples: Iterable[bytes], size: int) -> zstandard.ZstdCompressionDict:
+    """
+    Trains a zstd dictionary of (at most) ``size`` bytes from sample payloads.
+    """
+    return zstandard.train_dictionary(size, list(samples))
+
+
+class NodeCompressor:
+    """
+    Compresses node payloads with either zlib or zstd.
+
+    When using zstd, payloads are compressed with the dictionary trained for
+    the platform of the event if there is one. Decompression picks the codec
+    (and dictionary) from the payload itself, see the module docstring.
+    """
+
+    def __init__(
+        self,
+        compression: str = "zlib",
+        dictionaries: Optional[Mapping[str, zstandard.ZstdCompressionDict]] = None,
+        level: int = 3,
+    ) -> None:
+        if compression not in ("zlib", "zstd"):
+            raise ValueError('"compression" must be one of "zlib", "zstd"')
+
+        self.compression = compression
+        self.level = level
+        self.dictionaries = dict(dictionaries or {})
+        self.dictionaries_by_id = {d.dict_id(): d for d in self.dictionaries.values()}
+
+        # zstd (de)compressors must not be used by several threads at once,
+        # so every thread gets its own.
+        self.__local = threading.local()
+
+    @property
+    def __compressors(self) -> Dict[str, zstandard.ZstdCompressor]:
+        if not hasattr(self.__local, "compressors"):
+            self.__local.compressors = {}
+        return self.__local.compressors  # type: ignore[no-any-return]
+
+    @property
+    def __decompressors(self) -> Dict[int, zstandard.ZstdDecompressor]:
+        if not hasattr(self.__local, "decompressors"):
+            self.__local.decompressors = {}
+        return self.__local.decompressors  # type: ignore[no-any-return]
+
+    def _get_compressor(self, platform: Optional[str]) -> zstandard.ZstdCompressor:
+        name = platform if platform in self.dictionaries else DEFAULT_DICTIONARY
+        if name not in self.__compressors:
+            self.__compressors[name] = zstandard.ZstdCompressor(
+                level=self.level, dict_data=self.dictionaries.get(name)
+            )
+        return self.__compressors[name]
+
+    def _get_decompressor(self, dict_id: int) -> zstandard.ZstdDecompressor:
+        if dict_id not in self.__decompressors:
+            dictionary = None
+            if dict_id:
+                try:
+                    dictionary = self.dictionaries_by_id[dict_id]
+                except KeyError:
+                    raise ValueError(f"unknown zstd dictionary: {dict_id}")
+            self.__decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=dictionary)
+        return self.__decompressors[dict_id]
+
+    def compress(self, data: bytes, platform: Optional[str] = None) -> bytes:
+        if self.compression == "zlib":
+            return zlib.compress(data)
+        return self._get_compressor(platform).compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        if data.startswith(ZSTD_MAGIC):
+            dict_id = zstandard.get_frame_parameters(data).dict_id
+            return self._get_decompressor(dict_id).decompress(data)
+        if data and data[0] == ZLIB_HEADER:
+            return zlib.decompress(data)
+        return data
@@ -1,3 +1,4 @@
+import base64
 import logging
 import math
 import pickle
@@ -5,8 +6,8 @@ import pickle
 from django.utils import timezone
 
 from sentry.db.models import create_or_update
-from sentry.nodestore.base import NodeStorage
-from sentry.utils.strings import compress, decompress
+from sentry.nodestore.base import NodeStorage, get_local_cache
+from sentry.nodestore.compression import NodeCompressor, load_dictionaries
 
 from .models import Node
 
@@ -14,6 +15,26 @@ logger = logging.getLogger("sentry")
 
 
 class DjangoNodeStorage(NodeStorage):
+    """
+    A Django-based backend for storing node data.
+
+    :param compression: The codec used for new payloads, ``"zlib"`` or
+        ``"zstd"``. Existing payloads are readable regardless.
+    :param dictionary_path: Directory of trained zstd dictionaries, see
+        ``sentry nodestore train-dictionary``.
+    """
+
+    def __init__(self, compression="zlib", dictionary_path=None):
+        self.compressor = NodeCompressor(
+            compression=compression, dictionaries=load_dictionaries(dictionary_path)
+        )
+
+    def _compress(self, data, platform=None):
+        return base64.b64encode(self.compressor.compress(data, platform=platform)).decode("utf-8")
+
+    def _decompress(self, data):
+        return self.compressor.decompress(base64.b64decode(data))
+
     def delete(self, id):
         Node.objects.filter(id=id).delete()
         self._delete_cache_item(id)
@@ -37,19 +58,23 @@ class DjangoNodeStorage(NodeStorage):
     def _get_bytes(self, id):
         try:
             data = Node.objects.get(id=id).data
-            return decompress(data)
+            return self._decompress(data)
         except Node.DoesNotExist:
             return None
 
     def _get_bytes_multi(self, id_list):
-        return {n.id: decompress(n.data) for n in Node.objects.filter(id__in=id_list)}
+        return {n.id: self._decompress(n.data) for n in Node.objects.filter(id__in=id_list)}
 
     def delete_multi(self, id_list):
         Node.objects.filter(id__in=id_list).delete()
         self._delete_cache_items(id_list)
 
-    def _set_bytes(self, id, data, ttl=None):
-        create_or_update(Node, id=id, values={"data": compress(data), "timestamp": timezone.now()})
+    def _set_bytes(self, id, data, ttl=None, platform=None):
+        create_or_update(
+            Node,
+            id=id,
+            values={"data": self._compress(data, platform=platform), "timestamp": timezone.now()},
+        )
 
     def cleanup(self, cutoff_timestamp):
         from sentry.db.deletion import BulkDeleteQuery
@@ -60,6 +85,9 @@ class DjangoNodeStorage(NodeStorage):
         BulkDeleteQuery(model=Node, dtfield="timestamp", days=days).execute()
         if self.cache:
             self.cache.clear()
+        local_cache = get_local_cache()
+        if local_cache is not None:
+            local_cache.clear()
 
     def bootstrap(self):
         # Nothing for Django backend to do during bootstrap
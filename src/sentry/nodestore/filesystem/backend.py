@@ -27,7 +27,7 @@ class FileSystemNodeStorage(NodeStorage):
         with open(self.node_path(id), "rb") as file:
             return file.read()
 
-    def _set_bytes(self, id: str, data: bytes, ttl=0):
+    def _set_bytes(self, id: str, data: bytes, ttl=0, platform=None):
         with open(self.node_path(id), "wb") as file:
             file.write(data)
 
@@ -461,6 +461,14 @@ register("store.background-grouping-sample-rate", default=0.0)
 # True if background grouping should run before secondary and primary grouping
 register("store.background-grouping-before", default=False)
 
+# Fraction of grouping hash cache hits that are calculated anyway to verify
+# the cached hashes (see sentry.grouping.cache)
+register("store.grouping-hash-cache-verify-sample-rate", default=0.0)
+
+# Number of ready digest timelines delivered by a single task. 0 delivers
+# every timeline in its own task.
+register("digests.delivery-batch-size", default=0)
+
 # Store release files bundled as zip files
 register("processing.save-release-archives", default=False)  # unused
 
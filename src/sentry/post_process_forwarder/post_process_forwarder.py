@@ -2,7 +2,7 @@ import logging
 import signal
 import uuid
 from enum import Enum
-from typing import Any, Callable, Literal, Mapping, MutableMapping, Optional, Union
+from typing import Any, Callable, List, Literal, Mapping, MutableMapping, Optional, Sequence, Union
 
 from arroyo import configure_metrics
 from arroyo.backends.kafka import KafkaConsumer, KafkaPayload
@@ -15,7 +15,8 @@ from arroyo.processing.strategies import (
     ProcessingStrategyFactory,
     RunTaskInThreads,
 )
-from arroyo.types import Commit, Message, Partition, Topic
+from arroyo.processing.strategies.reduce import Reduce
+from arroyo.types import BaseValue, Commit, Message, Partition, Topic
 from confluent_kafka import Producer
 from django.conf import settings
 
@@ -36,11 +37,20 @@ class PostProcessForwarderType(str, Enum):
 class PostProcessForwarder:
     """
     The `dispatch_function` should take a message and dispatch the post_process_group
-    celery task
+    celery task.
+
+    When running with a `max_batch_size`, messages are instead collected into batches
+    which are passed to `batch_dispatch_function`, which should dispatch a single
+    celery task per project for all of them.
     """
 
-    def __init__(self, dispatch_function: Callable[[Message[KafkaPayload]], None]) -> None:
+    def __init__(
+        self,
+        dispatch_function: Callable[[Message[KafkaPayload]], None],
+        batch_dispatch_function: Optional[Callable[[Message[Sequence[KafkaPayload]]], None]] = None,
+    ) -> None:
         self.dispatch_function = dispatch_function
+        self.batch_dispatch_function = batch_dispatch_function
         self.topic = settings.KAFKA_EVENTS
         self.transactions_topic = settings.KAFKA_TRANSACTIONS
         self.issue_platform_topic = settings.KAFKA_EVENTSTREAM_GENERIC
@@ -57,6 +67,8 @@ class PostProcessForwarder:
         concurrency: int,
         initial_offset_reset: Union[Literal["latest"], Literal["earliest"]],
         strict_offset_reset: bool,
+        max_batch_size: int = 0,
+        max_batch_time: float = 1.0,
     ) -> None:
 
         logger.debug(f"Starting post process forwarder to consume {entity} messages")
@@ -77,6 +89,8 @@ class PostProcessForwarder:
             concurrency,
             initial_offset_reset,
             strict_offset_reset,
+            max_batch_size,
+            max_batch_time,
         )
 
         def handler(signum: int, frame: Any) -> None:
@@ -98,6 +112,8 @@ class PostProcessForwarder:
         concurrency: int,
         initial_offset_reset: Union[Literal["latest"], Literal["earliest"]],
         strict_offset_reset: Optional[bool],
+        max_batch_size: int = 0,
+        max_batch_time: float = 1.0,
     ) -> StreamProcessor[KafkaPayload]:
         configure_metrics(MetricsWrapper(metrics.backend, name="eventstream"))
 
@@ -127,7 +143,16 @@ class PostProcessForwarder:
             commit_log_groups={synchronize_commit_group},
         )
 
-        strategy_factory = PostProcessForwarderStrategyFactory(self.dispatch_function, concurrency)
+        strategy_factory: ProcessingStrategyFactory[KafkaPayload]
+        if max_batch_size > 0:
+            assert self.batch_dispatch_function is not None
+            strategy_factory = BatchingPostProcessForwarderStrategyFactory(
+                self.batch_dispatch_function, max_batch_size, max_batch_time
+            )
+        else:
+            strategy_factory = PostProcessForwarderStrategyFactory(
+                self.dispatch_function, concurrency
+            )
 
         return StreamProcessor(
             synchronized_consumer, Topic(topic), strategy_factory, ONCE_PER_SECOND
@@ -153,3 +178,50 @@ class PostProcessForwarderStrategyFactory(ProcessingStrategyFactory[KafkaPayload
             self.__max_pending_futures,
             CommitOffsets(commit),
         )
+
+
+class BatchingPostProcessForwarderStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
+    """
+    Collects up to `max_batch_size` messages, or as many as arrive within
+    `max_batch_time` seconds, and passes them to the dispatch function at once.
+    Batches keep the order of the messages they were built from and are
+    dispatched one at a time, in that order, which the dispatch function relies
+    on to have the batches of a project processed in order.
+    """
+
+    def __init__(
+        self,
+        dispatch_function: Callable[[Message[Sequence[KafkaPayload]]], None],
+        max_batch_size: int,
+        max_batch_time: float,
+    ):
+        self.__dispatch_function = dispatch_function
+        self.__max_pending_futures = 10
+        self.__max_batch_size = max_batch_size
+        self.__max_batch_time = max_batch_time
+
+    def create_with_partitions(
+        self,
+        commit: Commit,
+        partitions: Mapping[Partition, int],
+    ) -> ProcessingStrategy[KafkaPayload]:
+        def accumulator(
+            result: List[KafkaPayload], value: BaseValue[KafkaPayload]
+        ) -> List[KafkaPayload]:
+            result.append(value.payload)
+            return result
+
+        initial_value: Callable[[], List[KafkaPayload]] = lambda: []
+
+        return Reduce(
+            self.__max_batch_size,
+            self.__max_batch_time,
+            accumulator,
+            initial_value,
+            RunTaskInThreads(
+                self.__dispatch_function,
+                1,
+                self.__max_pending_futures,
+                CommitOffsets(commit),
+            ),
+        )
@@ -1,9 +1,12 @@
+from threading import Lock
 from time import time
 
 import sentry_sdk
 
 from sentry.constants import DataCategory
 from sentry.quotas.base import NotRateLimited, Quota, QuotaConfig, QuotaScope, RateLimited
+from sentry.utils import metrics
+from sentry.utils.lru import LRUCache
 from sentry.utils.redis import (
     get_dynamic_cluster_from_options,
     load_script,
@@ -11,6 +14,20 @@ from sentry.utils.redis import (
 )
 
 is_rate_limited = load_script("quotas/is_rate_limited.lua")
+lease_quotas = load_script("quotas/lease.lua")
+
+
+class _Lease:
+    """
+    Items of a quota counter that were reserved in Redis and are handed out
+    locally until ``expires_at``.
+    """
+
+    __slots__ = ("remaining", "expires_at")
+
+    def __init__(self, remaining, expires_at):
+        self.remaining = remaining
+        self.expires_at = expires_at
 
 
 class RedisQuota(Quota):
@@ -24,6 +41,25 @@ class RedisQuota(Quota):
             "SENTRY_QUOTA_OPTIONS", options
         )
 
+        # With ``lease_size`` set, ``is_rate_limited`` reserves up to that many
+        # items of every quota (and at most ``lease_ratio`` of its limit) from
+        # Redis at once, and hands them out locally for up to ``lease_ttl``
+        # seconds. Items that are leased but not used by the time the quota
+        # window ends count as used, so every process may reject items early
+        # by at most the size of one lease per quota and window. Items are
+        # never accepted beyond the limit. Quotas are also cached locally for
+        # ``lease_ttl`` seconds, so changes to them apply with that delay.
+        self.lease_size = options.pop("lease_size", 0)
+        self.lease_ratio = options.pop("lease_ratio", 0.01)
+        self.lease_ttl = options.pop("lease_ttl", 10)
+        self.__leases = {}
+        self.__leases_lock = Lock()
+        self.__quota_cache = (
+            LRUCache(10000, ttl=self.lease_ttl, metrics_key="quotas.lease.quota_cache")
+            if self.lease_size
+            else None
+        )
+
         # Based on the `is_redis_cluster` flag, self.cluster is set two one of
         # the following two objects:
         #  - false: `cluster` is a `RBCluster`. Call `get_local_client_for_key`
@@ -163,6 +199,24 @@ class RedisQuota(Quota):
             if quota.should_track and category in quota.categories
         ]
 
+        if self.lease_size:
+            # Refunds of items that were handed out from a lease go back to
+            # the lease, without a round-trip to Redis.
+            quotas = [
+                quota
+                for quota in quotas
+                if not self.__refund_lease(
+                    self.__get_redis_key(
+                        quota,
+                        timestamp,
+                        project.organization_id % quota.window,
+                        project.organization_id,
+                    ),
+                    quantity,
+                    timestamp,
+                )
+            ]
+
         if not quotas:
             return
 
@@ -201,7 +255,7 @@ class RedisQuota(Quota):
         # affects all data, and (2) quotas that specify `error` events.
         quotas = [
             q
-            for q in self.get_quotas(project, key=key)
+            for q in self.__get_cached_quotas(project, key)
             if not q.categories or DataCategory.ERROR in q.categories
         ]
 
@@ -211,6 +265,7 @@ class RedisQuota(Quota):
 
         keys = []
         args = []
+        expiries = []
         for quota in quotas:
             if quota.limit == 0:
                 # A zero-sized quota is the absolute worst-case. Do not call
@@ -232,12 +287,18 @@ class RedisQuota(Quota):
             # limit=None is represented as limit=-1 in lua
             lua_quota = quota.limit if quota.limit is not None else -1
             args.extend((lua_quota, int(expiry)))
+            expiries.append(expiry)
 
         if not keys or not args:
             return NotRateLimited()
 
-        client = self.__get_redis_client(str(project.organization_id))
-        rejections = is_rate_limited(client, keys, args)
+        if self.lease_size:
+            rejections = self.__consume_leases(
+                project.organization_id, quotas, keys[::2], expiries, timestamp
+            )
+        else:
+            client = self.__get_redis_client(str(project.organization_id))
+            rejections = is_rate_limited(client, keys, args)
 
         if not any(rejections):
             return NotRateLimited()
@@ -253,3 +314,94 @@ class RedisQuota(Quota):
                 worst_case = (delay, quota.reason_code)
 
         return RateLimited(retry_after=worst_case[0], reason_code=worst_case[1])
+
+    def __get_cached_quotas(self, project, key):
+        if self.__quota_cache is None:
+            return self.get_quotas(project, key=key)
+
+        cache_key = (project.id, key.id if key else None)
+        quotas = self.__quota_cache.get(cache_key)
+        if quotas is None:
+            quotas = self.get_quotas(project, key=key)
+            self.__quota_cache.set(cache_key, quotas)
+        return quotas
+
+    def __get_lease_size(self, quota):
+        if quota.limit is None:
+            return self.lease_size
+        return max(1, min(self.lease_size, int(quota.limit * self.lease_ratio)))
+
+    def __refund_lease(self, counter_key, quantity, timestamp):
+        with self.__leases_lock:
+            lease = self.__leases.get(counter_key)
+            if lease is None or lease.expires_at <= timestamp:
+                return False
+            lease.remaining += quantity
+            return True
+
+    def __consume_leases(self, organization_id, quotas, counter_keys, expiries, timestamp):
+        """
+        Takes one item from the leases of all quotas, leasing more items from
+        Redis for the quotas whose lease is used up or expired. Returns
+        whether each quota rejected the item, like ``is_rate_limited.lua``.
+        """
+        with self.__leases_lock:
+            missing = []
+            for idx, counter_key in enumerate(counter_keys):
+                lease = self.__leases.get(counter_key)
+                if lease is None or lease.expires_at <= timestamp or lease.remaining <= 0:
+                    missing.append(idx)
+
+            if not missing:
+                for counter_key in counter_keys:
+                    self.__leases[counter_key].remaining -= 1
+                return [False] * len(counter_keys)
+
+            # Expired leases are dropped, and their unused items are returned
+            # to Redis if the window of the lease is still current.
+            returned = {}
+            for counter_key in [counter_keys[idx] for idx in missing]:
+                lease = self.__leases.pop(counter_key, None)
+                if lease is not None and lease.remaining > 0:
+                    returned[counter_key] = lease.remaining
+            for counter_key in [k for k, v in self.__leases.items() if v.expires_at <= timestamp]:
+                del self.__leases[counter_key]
+
+        keys = []
+        args = []
+        for idx in missing:
+            quota, counter_key, expiry = quotas[idx], counter_keys[idx], expiries[idx]
+            keys.extend((counter_key, self.get_refunded_quota_key(counter_key)))
+            args.extend(
+                (
+                    quota.limit if quota.limit is not None else -1,
+                    int(expiry),
+                    self.__get_lease_size(quota),
+                    returned.get(counter_key, 0),
+                )
+            )
+
+        client = self.__get_redis_client(str(organization_id))
+        granted = lease_quotas(client, keys, args)
+        metrics.incr("quotas.lease.acquired", amount=len(missing), skip_internal=True)
+
+        with self.__leases_lock:
+            for idx, amount in zip(missing, granted):
+                counter_key = counter_keys[idx]
+                # Leases expire early so that unused items get returned while
+                # the window is still current, and are not lost.
+                expires_at = min(expiries[idx] - self.grace, timestamp + self.lease_ttl)
+                lease = self.__leases.get(counter_key)
+                if lease is None:
+                    lease = self.__leases[counter_key] = _Lease(0, expires_at)
+                lease.remaining += int(amount)
+
+            rejections = [
+                counter_key not in self.__leases or self.__leases[counter_key].remaining <= 0
+                for counter_key in counter_keys
+            ]
+            if not any(rejections):
+                for counter_key in counter_keys:
+                    self.__leases[counter_key].remaining -= 1
+
+        return rejections
@@ -1,11 +1,14 @@
-from typing import Any, Optional, Sequence, Tuple
+from collections import defaultdict
+from time import time
+from typing import Any, Dict, List, Mapping, MutableMapping, Optional, Sequence, Tuple
 
 from sentry_redis_tools.clients import RedisCluster, StrictRedis
-from sentry_redis_tools.sliding_windows_rate_limiter import GrantedQuota, Quota
 from sentry_redis_tools.sliding_windows_rate_limiter import (
-    RedisSlidingWindowRateLimiter as RedisSlidingWindowRateLimiterImpl,
+    GrantedQuota,
+    Quota,
+    RequestedQuota,
+    Timestamp,
 )
-from sentry_redis_tools.sliding_windows_rate_limiter import RequestedQuota, Timestamp
 
 from sentry.exceptions import InvalidConfiguration
 from sentry.utils import redis
@@ -13,6 +16,10 @@ from sentry.utils.services import Service
 
 __all__ = ["Quota", "GrantedQuota", "RequestedQuota", "Timestamp"]
 
+# (prefix, window_seconds, granularity_seconds) of a quota, which identifies
+# the counters it is stored in.
+_WindowId = Tuple[str, int, int]
+
 
 class SlidingWindowRateLimiter(Service):
     def __init__(self, **options: Any) -> None:
@@ -122,7 +129,6 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
         client = redis.redis_clusters.get(cluster_key)
         assert isinstance(client, (StrictRedis, RedisCluster)), client
         self.client = client
-        self.impl = RedisSlidingWindowRateLimiterImpl(self.client)
         super().__init__(**options)
 
     def validate(self) -> None:
@@ -132,10 +138,88 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
         except Exception as e:
             raise InvalidConfiguration(str(e))
 
+    def _get_window_id(self, request: RequestedQuota, quota: Quota) -> _WindowId:
+        prefix = quota.prefix_override or request.prefix
+        if "{" in prefix or "}" in prefix:
+            raise ValueError("Explicit sharding not allowed in RequestedQuota.prefix")
+        return (prefix, quota.window_seconds, quota.granularity_seconds)
+
+    def _get_window_keys(
+        self, requests: Sequence[RequestedQuota], timestamp: Timestamp
+    ) -> Tuple[List[List[_WindowId]], Dict[_WindowId, List[str]]]:
+        """
+        Returns the window of every quota of every request, and the Redis keys
+        of the granules of every window, newest first. The keys are compatible
+        with those of ``sentry_redis_tools``, and are built only once for
+        windows shared by many requests (such as global quotas).
+        """
+        window_ids = []
+        window_keys: Dict[_WindowId, List[str]] = {}
+        for request in requests:
+            assert request.quotas
+
+            request_window_ids = []
+            for quota in request.quotas:
+                window_id = self._get_window_id(request, quota)
+                if window_id not in window_keys:
+                    base = "sliding-window-rate-limit:%s:%s:%s:" % window_id
+                    window_keys[window_id] = [
+                        f"{base}{granule}" for granule in quota.iter_window(timestamp)
+                    ]
+                request_window_ids.append(window_id)
+            window_ids.append(request_window_ids)
+
+        return window_ids, window_keys
+
+    def _grant(
+        self,
+        requests: Sequence[RequestedQuota],
+        window_ids: Sequence[Sequence[_WindowId]],
+        usage: Mapping[_WindowId, int],
+    ) -> List[GrantedQuota]:
+        """
+        Grants the requests in order. Every grant counts against the windows
+        of all later requests that share them, so the grants of a batch only
+        depend on the order of the batch and on the usage stored in Redis.
+        """
+        granted_usage: MutableMapping[_WindowId, int] = defaultdict(int)
+
+        grants = []
+        for request, request_window_ids in zip(requests, window_ids):
+            granted = request.requested
+            reached_quotas = []
+            for quota, window_id in zip(request.quotas, request_window_ids):
+                remaining = max(0, quota.limit - usage[window_id] - granted_usage[window_id])
+                if remaining < granted:
+                    granted = remaining
+                    reached_quotas.append(quota)
+
+            for window_id in set(request_window_ids):
+                granted_usage[window_id] += granted
+
+            grants.append(
+                GrantedQuota(prefix=request.prefix, granted=granted, reached_quotas=reached_quotas)
+            )
+
+        return grants
+
     def check_within_quotas(
         self, requests: Sequence[RequestedQuota], timestamp: Optional[Timestamp] = None
     ) -> Tuple[Timestamp, Sequence[GrantedQuota]]:
-        return self.impl.check_within_quotas(requests, timestamp)
+        timestamp = int(time()) if timestamp is None else int(timestamp)
+        window_ids, window_keys = self._get_window_keys(requests, timestamp)
+
+        keys = list({key: None for keys in window_keys.values() for key in keys})
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.get(key)
+            values = dict(zip(keys, pipeline.execute()))
+
+        usage = {
+            window_id: sum(int(values[key] or 0) for key in keys)
+            for window_id, keys in window_keys.items()
+        }
+        return timestamp, self._grant(requests, window_ids, usage)
 
     def use_quotas(
         self,
@@ -143,4 +227,43 @@ class RedisSlidingWindowRateLimiter(SlidingWindowRateLimiter):
         grants: Sequence[GrantedQuota],
         timestamp: Timestamp,
     ) -> None:
-        return self.impl.use_quotas(requests, grants, timestamp)
+        assert len(requests) == len(grants)
+        window_ids, window_keys = self._get_window_keys(requests, timestamp)
+
+        increments: MutableMapping[_WindowId, int] = defaultdict(int)
+        for request, grant, request_window_ids in zip(requests, grants, window_ids):
+            assert request.prefix == grant.prefix
+            for window_id in set(request_window_ids):
+                increments[window_id] += grant.granted
+
+        # Windows of which nothing was granted are left alone.
+        increments = {window_id: amount for window_id, amount in increments.items() if amount}
+        if not increments:
+            return
+
+        with self.client.pipeline(transaction=False) as pipeline:
+            for window_id, amount in increments.items():
+                # Only the most recent granule is incremented, and expires
+                # after the window has passed.
+                key = window_keys[window_id][0]
+                pipeline.incrby(key, amount)
+                pipeline.expire(key, window_id[1])
+            pipeline.execute()
+
+    def check_and_use_quotas(
+        self, requests: Sequence[RequestedQuota], timestamp: Optional[Timestamp] = None
+    ) -> Sequence[GrantedQuota]:
+        """
+        Checks and consumes the quotas of all requests with one pipeline that
+        reads the current usage and one that consumes the granted amounts, so
+        a whole batch of requests costs two round-trips per Redis node.
+
+        Only granted amounts are ever consumed, so concurrent callers are not
+        rejected because of requests that end up not being granted. Like with
+        ``check_within_quotas`` and ``use_quotas``, the check is not atomic:
+        quotas can be over-consumed by at most the amounts granted to
+        concurrent callers between the two pipelines.
+        """
+        timestamp, grants = self.check_within_quotas(requests, timestamp)
+        self.use_quotas(requests, grants, timestamp)
+        return grants
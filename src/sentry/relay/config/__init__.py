@@ -11,6 +11,7 @@ from typing import (
     MutableMapping,
     Optional,
     Sequence,
+    Tuple,
     TypedDict,
     Union,
 )
@@ -36,7 +37,7 @@ from sentry.ingest.transaction_clusterer.rules import (
     get_sorted_rules,
 )
 from sentry.interfaces.security import DEFAULT_DISALLOWED_SOURCES
-from sentry.models import Project, ProjectKey
+from sentry.models import Organization, Project, ProjectKey
 from sentry.relay.config.metric_extraction import get_metric_conditional_tagging_rules
 from sentry.relay.utils import to_camel_case_name
 from sentry.utils import metrics
@@ -163,8 +164,60 @@ def get_quotas(project: Project, keys: Optional[Sequence[ProjectKey]] = None) ->
         return computed_quotas
 
 
+class ProjectConfigSections:
+    """Memoizes the sections of project configs that are built together.
+
+    Every section is computed from one scope: the organization, the project,
+    or the project keys of the config. When the configs of many projects or
+    keys are built with the same instance (e.g. for an organization-wide
+    invalidation), each section is computed once per scope and reused for all
+    configs that share it.
+
+    Sections are not tracked against the options, features and rows they
+    read, so an instance must not outlive the computation it is created for.
+    """
+
+    def __init__(self) -> None:
+        self.__sections: MutableMapping[Tuple[str, Any, str], Any] = {}
+        self.computed = 0
+        self.reused = 0
+
+    def wrap(
+        self, scope: Tuple[str, Any], name: str, function: Callable[..., Any]
+    ) -> Callable[..., Any]:
+        """Returns ``function`` memoized under the section ``name`` of ``scope``.
+
+        Exceptions are not memoized, so the section is computed again for the
+        next config of the same scope.
+        """
+
+        def get_section(*args: Any, **kwargs: Any) -> Any:
+            key = (*scope, name)
+            try:
+                value = self.__sections[key]
+            except KeyError:
+                pass
+            else:
+                self.reused += 1
+                return value
+
+            value = self.__sections[key] = function(*args, **kwargs)
+            self.computed += 1
+            return value
+
+        return get_section
+
+    def get(
+        self, scope: Tuple[str, Any], name: str, function: Callable[..., Any], *args: Any
+    ) -> Any:
+        return self.wrap(scope, name, function)(*args)
+
+
 def get_project_config(
-    project: Project, full_config: bool = True, project_keys: Optional[Sequence[ProjectKey]] = None
+    project: Project,
+    full_config: bool = True,
+    project_keys: Optional[Sequence[ProjectKey]] = None,
+    sections: Optional[ProjectConfigSections] = None,
 ) -> "ProjectConfig":
     """Constructs the ProjectConfig information.
     :param project: The project to load configuration for. Ensure that
@@ -177,12 +230,20 @@ def get_project_config(
         no project keys are provided it is assumed that the config does not
         need to contain auth information (this is the case when used in
         python's StoreView)
+    :param sections: Sections shared with the configs of other projects or
+        project keys that are built at the same time. See
+        :class:`ProjectConfigSections`.
     :return: a ProjectConfig object for the given project
     """
     with sentry_sdk.push_scope() as scope:
         scope.set_tag("project", project.id)
         with metrics.timer("relay.config.get_project_config.duration"):
-            return _get_project_config(project, full_config=full_config, project_keys=project_keys)
+            return _get_project_config(
+                project,
+                full_config=full_config,
+                project_keys=project_keys,
+                sections=sections or ProjectConfigSections(),
+            )
 
 
 def get_dynamic_sampling_config(project: Project) -> Optional[Mapping[str, Any]]:
@@ -264,12 +325,37 @@ def _should_extract_abnormal_mechanism(project: Project) -> bool:
     )
 
 
+def get_trusted_relays(organization: Organization) -> List[str]:
+    return [r["public_key"] for r in organization.get_option("sentry:trusted-relays", []) if r]
+
+
+def get_session_metrics_config(project: Project) -> Optional[Mapping[str, Any]]:
+    if not features.has("organizations:metrics-extraction", project.organization):
+        return None
+
+    return {
+        "version": EXTRACT_ABNORMAL_MECHANISM_VERSION
+        if _should_extract_abnormal_mechanism(project)
+        else EXTRACT_METRICS_VERSION,
+        "drop": features.has("organizations:release-health-drop-sessions", project.organization),
+    }
+
+
 def _get_project_config(
-    project: Project, full_config: bool = True, project_keys: Optional[Sequence[ProjectKey]] = None
+    project: Project,
+    full_config: bool = True,
+    project_keys: Optional[Sequence[ProjectKey]] = None,
+    sections: Optional[ProjectConfigSections] = None,
 ) -> "ProjectConfig":
     if project.status != ObjectStatus.ACTIVE:
         return ProjectConfig(project, disabled=True)
 
+    if sections is None:
+        sections = ProjectConfigSections()
+    org_scope = ("organization", project.organization_id)
+    project_scope = ("project", project.id)
+    keys_scope = ("keys", project.id, tuple(key.id for key in project_keys or ()))
+
     public_keys = get_public_key_configs(project, full_config, project_keys=project_keys)
 
     with Hub.current.start_span(op="get_public_config"):
@@ -282,14 +368,16 @@ def _get_project_config(
             "rev": project.get_option("sentry:relay-rev", uuid.uuid4().hex),
             "publicKeys": public_keys,
             "config": {
-                "allowedDomains": list(get_origins(project)),
-                "trustedRelays": [
-                    r["public_key"]
-                    for r in project.organization.get_option("sentry:trusted-relays", [])
-                    if r
-                ],
-                "piiConfig": get_pii_config(project),
-                "datascrubbingSettings": get_datascrubbing_settings(project),
+                "allowedDomains": sections.get(
+                    project_scope, "allowedDomains", lambda: list(get_origins(project))
+                ),
+                "trustedRelays": sections.get(
+                    org_scope, "trustedRelays", get_trusted_relays, project.organization
+                ),
+                "piiConfig": sections.get(project_scope, "piiConfig", get_pii_config, project),
+                "datascrubbingSettings": sections.get(
+                    project_scope, "datascrubbingSettings", get_datascrubbing_settings, project
+                ),
             },
             "organizationId": project.organization_id,
             "projectId": project.id,  # XXX: Unused by Relay, required by Python store
@@ -297,19 +385,31 @@ def _get_project_config(
 
     config = cfg["config"]
 
-    if exposed_features := get_exposed_features(project):
+    if exposed_features := sections.get(project_scope, "features", get_exposed_features, project):
         config["features"] = exposed_features
 
     # NOTE: Omitting dynamicSampling because of a failure increases the number
     # of events forwarded by Relay, because dynamic sampling will stop filtering
     # anything.
-    add_experimental_config(config, "dynamicSampling", get_dynamic_sampling_config, project)
+    add_experimental_config(
+        config,
+        "dynamicSampling",
+        sections.wrap(project_scope, "dynamicSampling", get_dynamic_sampling_config),
+        project,
+    )
 
     # Limit the number of custom measurements
-    add_experimental_config(config, "measurements", get_measurements_config)
+    add_experimental_config(
+        config, "measurements", sections.wrap(org_scope, "measurements", get_measurements_config)
+    )
 
     # Rules to replace high cardinality transaction names
-    add_experimental_config(config, "txNameRules", get_transaction_names_config, project)
+    add_experimental_config(
+        config,
+        "txNameRules",
+        sections.wrap(project_scope, "txNameRules", get_transaction_names_config),
+        project,
+    )
 
     if not full_config:
         # This is all we need for external Relay processors
@@ -321,7 +421,7 @@ def _get_project_config(
         add_experimental_config(
             config,
             "transactionMetrics",
-            get_transaction_metrics_settings,
+            sections.wrap(project_scope, "transactionMetrics", get_transaction_metrics_settings),
             project,
             config.get("breakdownsV2"),
         )
@@ -330,33 +430,41 @@ def _get_project_config(
         # is however currently both only applied to transaction metrics in
         # Relay, and only used to tag transaction metrics in Sentry.
         add_experimental_config(
-            config, "metricConditionalTagging", get_metric_conditional_tagging_rules, project
+            config,
+            "metricConditionalTagging",
+            sections.wrap(
+                project_scope, "metricConditionalTagging", get_metric_conditional_tagging_rules
+            ),
+            project,
         )
 
-    if features.has("organizations:metrics-extraction", project.organization):
-        config["sessionMetrics"] = {
-            "version": EXTRACT_ABNORMAL_MECHANISM_VERSION
-            if _should_extract_abnormal_mechanism(project)
-            else EXTRACT_METRICS_VERSION,
-            "drop": features.has(
-                "organizations:release-health-drop-sessions", project.organization
-            ),
-        }
+    if session_metrics := sections.get(
+        org_scope, "sessionMetrics", get_session_metrics_config, project
+    ):
+        config["sessionMetrics"] = session_metrics
 
     config["spanAttributes"] = project.get_option("sentry:span_attributes")
     with Hub.current.start_span(op="get_filter_settings"):
-        if filter_settings := get_filter_settings(project):
+        if filter_settings := sections.get(
+            project_scope, "filterSettings", get_filter_settings, project
+        ):
             config["filterSettings"] = filter_settings
     with Hub.current.start_span(op="get_grouping_config_dict_for_project"):
-        grouping_config = get_grouping_config_dict_for_project(project)
+        grouping_config = sections.get(
+            project_scope, "groupingConfig", get_grouping_config_dict_for_project, project
+        )
         if grouping_config is not None:
             config["groupingConfig"] = grouping_config
     with Hub.current.start_span(op="get_event_retention"):
-        event_retention = quotas.get_event_retention(project.organization)
+        event_retention = sections.get(
+            org_scope, "eventRetention", quotas.get_event_retention, project.organization
+        )
         if event_retention is not None:
             config["eventRetention"] = event_retention
     with Hub.current.start_span(op="get_all_quotas"):
-        if quotas_config := get_quotas(project, keys=project_keys):
+        if quotas_config := sections.get(
+            keys_scope, "quotas", lambda: get_quotas(project, keys=project_keys)
+        ):
             config["quotas"] = quotas_config
 
     return ProjectConfig(project, **cfg)
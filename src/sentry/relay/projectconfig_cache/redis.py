@@ -1,3 +1,4 @@
+import hashlib
 import logging
 
 import zstandard
@@ -9,6 +10,10 @@ from sentry.utils.redis import validate_dynamic_cluster
 REDIS_CACHE_TIMEOUT = 3600  # 1 hr
 COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 
+#: Key of a stored config that maps the names of its deduplicated sections to
+#: their content digests.
+SECTIONS_KEY = "$sections"
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +25,14 @@ class RedisProjectConfigCache(ProjectConfigCache):
         read_cluster_key = options.get("read_cluster", cluster_key)
         self.cluster_read = redis.redis_clusters.get(read_cluster_key)
 
+        # With ``dedupe_sections`` set, every section of ``config`` that
+        # serializes to at least ``dedupe_min_size`` bytes is stored once under
+        # the digest of its content and shared by all configs that contain it.
+        # Relay cannot read configs stored this way, so this must only be
+        # enabled where Relay fetches configs through Sentry's endpoint.
+        self.dedupe_sections = options.get("dedupe_sections", False)
+        self.dedupe_min_size = options.get("dedupe_min_size", 512)
+
         super().__init__(**options)
 
     def validate(self):
@@ -28,12 +41,54 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_key(self, public_key):
         return f"relayconfig:{public_key}"
 
+    def __get_section_redis_key(self, digest):
+        return f"relayconfig-section:{digest}"
+
+    def __split_sections(self, config, sections, serialized_sections):
+        """
+        Moves the large sections of ``config`` into ``sections``, keyed by
+        the digest of their content, and returns the remaining config.
+
+        Configs computed together share section objects, so their
+        serializations are memoized by identity in ``serialized_sections``.
+        """
+        if not isinstance(config, dict) or not isinstance(config.get("config"), dict):
+            return config
+
+        inline = {}
+        digests = {}
+        for name, value in config["config"].items():
+            try:
+                _, serialized = serialized_sections[id(value)]
+            except KeyError:
+                serialized = json.dumps(value).encode()
+                # Keep a reference to the value so that its id is not reused.
+                serialized_sections[id(value)] = value, serialized
+
+            if len(serialized) < self.dedupe_min_size:
+                inline[name] = value
+                continue
+
+            digest = hashlib.sha256(serialized).hexdigest()
+            sections[digest] = serialized
+            digests[name] = digest
+
+        if not digests:
+            return config
+
+        return {**config, "config": inline, SECTIONS_KEY: digests}
+
     def set_many(self, configs):
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
+        sections = {}
+        serialized_sections = {}
+
         # Note: Those are multiple pipelines, one per cluster node
         p = self.cluster.pipeline()
         for public_key, config in configs.items():
+            if self.dedupe_sections:
+                config = self.__split_sections(config, sections, serialized_sections)
             serialized = json.dumps(config).encode()
             compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
             metrics.timing("relay.projectconfig_cache.uncompressed_size", len(serialized))
@@ -41,6 +96,20 @@ class RedisProjectConfigCache(ProjectConfigCache):
 
             p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
 
+        # Sections are written along with every config that references them,
+        # so they never expire before any of those configs.
+        for digest, serialized in sections.items():
+            compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+            metrics.timing("relay.projectconfig_cache.section_size", len(compressed))
+            p.setex(self.__get_section_redis_key(digest), REDIS_CACHE_TIMEOUT, compressed)
+
+        if self.dedupe_sections:
+            metrics.incr(
+                "relay.projectconfig_cache.sections",
+                amount=len(sections),
+                tags={"action": "set"},
+            )
+
         p.execute()
 
     def delete_many(self, public_keys):
@@ -57,10 +126,36 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def get(self, public_key):
         rv = self.cluster_read.get(self.__get_redis_key(public_key))
         if rv is not None:
-            try:
-                rv = zstandard.decompress(rv).decode()
-            except (TypeError, zstandard.ZstdError):
-                # assume raw json
-                pass
-            return json.loads(rv)
+            config = _decode(rv)
+            if isinstance(config, dict) and SECTIONS_KEY in config:
+                return self.__join_sections(config)
+            return config
         return None
+
+    def __join_sections(self, config):
+        """
+        Reassembles a config stored with deduplicated sections. Returns
+        ``None`` if any of its sections has been evicted, so that callers
+        treat it like any other missing config.
+        """
+        digests = config.pop(SECTIONS_KEY)
+        names = list(digests)
+        values = self.cluster_read.mget(
+            [self.__get_section_redis_key(digests[name]) for name in names]
+        )
+        if any(value is None for value in values):
+            metrics.incr("relay.projectconfig_cache.sections", tags={"action": "missing"})
+            return None
+
+        for name, value in zip(names, values):
+            config["config"][name] = _decode(value)
+        return config
+
+
+def _decode(rv):
+    try:
+        rv = zstandard.decompress(rv).decode()
+    except (TypeError, zstandard.ZstdError):
+        # assume raw json
+        pass
+    return json.loads(rv)
@@ -95,6 +95,9 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self.tsdb = kwargs.pop("tsdb", tsdb)
+        # Conditions evaluated together pass the same `now`, so that identical intervals result
+        # in identical queries.
+        self.now: datetime | None = kwargs.pop("now", None)
         self.form_fields = {
             "value": {"type": "number", "placeholder": 100},
             "interval": {
@@ -181,7 +184,7 @@ class BaseEventFrequencyCondition(EventCondition, abc.ABC):
 
     def get_rate(self, event: GroupEvent, interval: str, environment_id: str) -> int:
         _, duration = self.intervals[interval]
-        end = timezone.now()
+        end = self.now or timezone.now()
         # For conditions with interval >= 1 hour we don't need to worry about read your writes
         # consistency. Disable it so that we can scale to more nodes.
         option_override_cm = contextlib.nullcontext()
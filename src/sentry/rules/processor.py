@@ -1,23 +1,42 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
 from random import randrange
-from typing import Any, Callable, Iterable, List, Mapping, MutableMapping, Sequence, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from django.core.cache import cache
 from django.utils import timezone
 
-from sentry import analytics
+from sentry import analytics, tsdb
 from sentry.eventstore.models import GroupEvent
 from sentry.models import Environment, GroupRuleStatus, Rule
 from sentry.rules import EventState, history, rules
+from sentry.rules.conditions.event_frequency import BaseEventFrequencyCondition
 from sentry.types.rules import RuleFuture
+from sentry.utils import json, metrics
 from sentry.utils.hashlib import hash_values
+from sentry.utils.lru import LRUCache
 from sentry.utils.safe import safe_execute
 
 SLOW_CONDITION_MATCHES = ["event_frequency"]
 
+# Number of projects whose rule plans are kept per process.
+RULE_PLAN_CACHE_SIZE = 1000
+
 
 def get_match_function(match_name: str) -> Callable[..., bool] | None:
     if match_name == "all":
@@ -29,6 +48,147 @@ def get_match_function(match_name: str) -> Callable[..., bool] | None:
     return None
 
 
+def is_slow_condition(condition: Mapping[str, Any]) -> bool:
+    return any(condition_match in condition["id"] for condition_match in SLOW_CONDITION_MATCHES)
+
+
+class RulePlan:
+    """
+    The predicates of a rule, split into filters and conditions and sorted so
+    that the most expensive conditions run last.
+
+    Predicates are referenced by their index in :attr:`ProjectRulePlan.predicates`.
+    """
+
+    __slots__ = ("filters", "conditions", "filter_match", "condition_match", "frequency")
+
+    def __init__(
+        self,
+        filters: Sequence[int],
+        conditions: Sequence[int],
+        filter_match: str,
+        condition_match: str,
+        frequency: int,
+    ) -> None:
+        self.filters = filters
+        self.conditions = conditions
+        self.filter_match = filter_match
+        self.condition_match = condition_match
+        self.frequency = frequency
+
+
+class ProjectRulePlan:
+    """
+    The evaluation plan of all rules of a project.
+
+    Identical predicates of rules in the same environment are evaluated once
+    per event, so ``predicates`` holds every distinct predicate with the
+    environment it is evaluated in.
+    """
+
+    def __init__(self, rules_: Sequence[Rule], registry: Any) -> None:
+        self.fingerprint = get_rule_plan_fingerprint(rules_)
+        self.registry = registry
+        self.predicates: List[Tuple[Mapping[str, Any], Optional[int]]] = []
+        self.rules: List[RulePlan] = []
+
+        predicate_indexes: Dict[Tuple[str, Optional[int]], int] = {}
+
+        def get_predicate_index(predicate: Mapping[str, Any], environment_id: Optional[int]) -> int:
+            key = (json.dumps(predicate, sort_keys=True), environment_id)
+            if key not in predicate_indexes:
+                predicate_indexes[key] = len(self.predicates)
+                self.predicates.append((predicate, environment_id))
+            return predicate_indexes[key]
+
+        for rule in rules_:
+            condition_list = []
+            filter_list = []
+            for rule_cond in rule.data.get("conditions", ()):
+                rule_cls = registry.get(rule_cond["id"])
+                if rule_cls is not None and rule_cls.rule_type == "condition/event":
+                    condition_list.append(rule_cond)
+                else:
+                    filter_list.append(rule_cond)
+
+            # Sort `condition_list` so that most expensive conditions run last.
+            condition_list.sort(key=is_slow_condition)
+
+            self.rules.append(
+                RulePlan(
+                    filters=[get_predicate_index(f, rule.environment_id) for f in filter_list],
+                    conditions=[
+                        get_predicate_index(c, rule.environment_id) for c in condition_list
+                    ],
+                    filter_match=rule.data.get("filter_match") or Rule.DEFAULT_FILTER_MATCH,
+                    condition_match=rule.data.get("action_match") or Rule.DEFAULT_CONDITION_MATCH,
+                    frequency=rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY,
+                )
+            )
+
+
+def get_rule_plan_fingerprint(rules_: Sequence[Rule]) -> List[Tuple[int, Optional[int], Any]]:
+    return [(rule.id, rule.environment_id, rule.data) for rule in rules_]
+
+
+_rule_plans: LRUCache[int, ProjectRulePlan] = LRUCache(
+    RULE_PLAN_CACHE_SIZE, metrics_key="rules.processor.plan_cache"
+)
+
+
+def get_project_rule_plan(project_id: int, rules_: Sequence[Rule]) -> ProjectRulePlan:
+    """
+    Returns the evaluation plan for the rules of a project, which is cached
+    until any of the rules or the rule registry change.
+    """
+    plan = _rule_plans.get(project_id)
+    if (
+        plan is None
+        or plan.registry is not rules
+        or plan.fingerprint != get_rule_plan_fingerprint(rules_)
+    ):
+        plan = ProjectRulePlan(rules_, rules)
+        _rule_plans.set(project_id, plan)
+    return plan
+
+
+class FrequencyQueryCache:
+    """
+    Wraps the TSDB backend of frequency conditions that are evaluated for the
+    same event, so that identical queries of different rules run only once.
+    """
+
+    def __init__(self, backend: Any) -> None:
+        self.backend = backend
+        self.results: Dict[Hashable, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.backend, name)
+
+    def _query(self, method: str, **kwargs: Any) -> Any:
+        key = (
+            method,
+            kwargs["model"],
+            tuple(kwargs["keys"]),
+            kwargs["start"],
+            kwargs["end"],
+            kwargs.get("environment_id"),
+        )
+        if key in self.results:
+            metrics.incr("rules.processor.frequency_query", tags={"cached": True})
+            return self.results[key]
+
+        metrics.incr("rules.processor.frequency_query", tags={"cached": False})
+        result = self.results[key] = getattr(self.backend, method)(**kwargs)
+        return result
+
+    def get_sums(self, **kwargs: Any) -> Any:
+        return self._query("get_sums", **kwargs)
+
+    def get_distinct_counts_totals(self, **kwargs: Any) -> Any:
+        return self._query("get_distinct_counts_totals", **kwargs)
+
+
 class RuleProcessor:
     logger = logging.getLogger("sentry.rules")
 
@@ -53,6 +213,11 @@ class RuleProcessor:
             str, Tuple[Callable[[GroupEvent, Sequence[RuleFuture]], None], List[RuleFuture]]
         ] = {}
 
+        # Results of the predicates of the current plan, shared by all rules.
+        self.predicate_results: MutableMapping[int, bool | None] = {}
+        self.frequency_queries = FrequencyQueryCache(tsdb)
+        self.now: datetime | None = None
+
     def get_rules(self) -> Sequence[Rule]:
         """Get all of the rules for this project from the DB (or cache)."""
         rules_: Sequence[Rule] = Rule.get_for_project(self.project.id)
@@ -127,7 +292,16 @@ class RuleProcessor:
             self.logger.warning("Unregistered condition %r", condition["id"])
             return None
 
-        condition_inst = condition_cls(self.project, data=condition, rule=rule)
+        if issubclass(condition_cls, BaseEventFrequencyCondition):
+            condition_inst = condition_cls(
+                self.project,
+                data=condition,
+                rule=rule,
+                tsdb=self.frequency_queries,
+                now=self.now,
+            )
+        else:
+            condition_inst = condition_cls(self.project, data=condition, rule=rule)
         passes: bool = safe_execute(
             condition_inst.passes, self.event, state, _with_transaction=False
         )
@@ -150,17 +324,45 @@ class RuleProcessor:
             has_reappeared=self.has_reappeared,
         )
 
-    def apply_rule(self, rule: Rule, status: GroupRuleStatus) -> None:
+    def predicate_matches(
+        self, plan: ProjectRulePlan, index: int, state: EventState, rule: Rule
+    ) -> bool | None:
+        """
+        Evaluates the predicate at ``index`` of ``plan`` once per event, and
+        returns the same result for all rules that share it.
+        """
+        if index in self.predicate_results:
+            metrics.incr("rules.processor.predicate", tags={"cached": True})
+            return self.predicate_results[index]
+
+        metrics.incr("rules.processor.predicate", tags={"cached": False})
+        condition, _ = plan.predicates[index]
+        result = self.predicate_results[index] = self.condition_matches(condition, state, rule)
+        return result
+
+    def apply_rule(
+        self,
+        rule: Rule,
+        status: GroupRuleStatus,
+        plan: ProjectRulePlan | None = None,
+        rule_plan: RulePlan | None = None,
+    ) -> None:
         """
         If all conditions and filters pass, execute every action.
 
         :param rule: `Rule` object
+        :param plan: The plan of all rules of the project, see `get_project_rule_plan`
+        :param rule_plan: The plan of `rule` within `plan`
         :return: void
         """
-        condition_match = rule.data.get("action_match") or Rule.DEFAULT_CONDITION_MATCH
-        filter_match = rule.data.get("filter_match") or Rule.DEFAULT_FILTER_MATCH
-        rule_condition_list = rule.data.get("conditions", ())
-        frequency = rule.data.get("frequency") or Rule.DEFAULT_FREQUENCY
+        if plan is None or rule_plan is None:
+            plan = ProjectRulePlan([rule], rules)
+            (rule_plan,) = plan.rules
+            self.predicate_results.clear()
+
+        condition_match = rule_plan.condition_match
+        filter_match = rule_plan.filter_match
+        frequency = rule_plan.frequency
 
         try:
             environment = self.event.get_environment()
@@ -177,28 +379,15 @@ class RuleProcessor:
 
         state = self.get_state()
 
-        condition_list = []
-        filter_list = []
-        for rule_cond in rule_condition_list:
-            if self.get_rule_type(rule_cond) == "condition/event":
-                condition_list.append(rule_cond)
-            else:
-                filter_list.append(rule_cond)
-
-        # Sort `condition_list` so that most expensive conditions run last.
-        condition_list.sort(
-            key=lambda condition: any(
-                condition_match in condition["id"] for condition_match in SLOW_CONDITION_MATCHES
-            )
-        )
-
         for predicate_list, match, name in (
-            (filter_list, filter_match, "filter"),
-            (condition_list, condition_match, "condition"),
+            (rule_plan.filters, filter_match, "filter"),
+            (rule_plan.conditions, condition_match, "condition"),
         ):
             if not predicate_list:
                 continue
-            predicate_iter = (self.condition_matches(f, state, rule) for f in predicate_list)
+            predicate_iter = (
+                self.predicate_matches(plan, index, state, rule) for index in predicate_list
+            )
             predicate_func = get_match_function(match)
             if predicate_func:
                 if not predicate_func(predicate_iter):
@@ -263,9 +452,14 @@ class RuleProcessor:
             return {}.values()
 
         self.grouped_futures.clear()
+        self.predicate_results.clear()
+        self.frequency_queries = FrequencyQueryCache(tsdb)
+        self.now = timezone.now()
+
         rules = self.get_rules()
+        plan = get_project_rule_plan(self.project.id, rules)
         rule_statuses = self.bulk_get_rule_status(rules)
-        for rule in rules:
-            self.apply_rule(rule, rule_statuses[rule.id])
+        for rule, rule_plan in zip(rules, plan.rules):
+            self.apply_rule(rule, rule_statuses[rule.id], plan, rule_plan)
 
         return self.grouped_futures.values()
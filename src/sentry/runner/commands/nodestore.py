@@ -0,0 +1,150 @@
+import os
+from datetime import timedelta
+
+import click
+
+from sentry.runner.decorators import configuration
+
+
+@click.group()
+def nodestore():
+    """Tools for interacting with the node storage."""
+
+
+def _sample_payloads(platform, project_ids, samples, days):
+    """
+    Returns the raw (decompressed) nodestore payloads of up to ``samples``
+    recent events of ``platform`` in the given projects.
+    """
+    from django.utils import timezone
+
+    from sentry import eventstore, nodestore
+    from sentry.eventstore.models import Event
+
+    now = timezone.now()
+    events = eventstore.get_unfetched_events(
+        eventstore.Filter(
+            project_ids=list(project_ids),
+            conditions=[["platform", "=", platform]],
+            start=now - timedelta(days=days),
+            end=now,
+        ),
+        limit=samples,
+        referrer="runner.nodestore.sample_payloads",
+    )
+    node_ids = [Event.generate_node_id(event.project_id, event.event_id) for event in events]
+    payloads = nodestore._get_bytes_multi(node_ids)
+    return [payload for payload in payloads.values() if payload]
+
+
+@nodestore.command("train-dictionary")
+@click.option("--platform", required=True, help="Platform to train the dictionary for.")
+@click.option(
+    "--project",
+    "project_ids",
+    type=int,
+    multiple=True,
+    required=True,
+    help="Project to sample events from, may be given multiple times.",
+)
+@click.option("--samples", type=int, default=1000, show_default=True)
+@click.option("--days", type=int, default=1, show_default=True, help="Sampling window.")
+@click.option(
+    "--size", type=int, default=112640, show_default=True, help="Dictionary size in bytes."
+)
+@click.option(
+    "--output",
+    type=click.Path(file_okay=False),
+    required=True,
+    help="Directory to write the dictionary to (the `dictionary_path` nodestore option).",
+)
+@configuration
+def train_dictionary(platform, project_ids, samples, days, size, output):
+    """
+    Trains a zstd dictionary for nodestore payloads of a platform.
+
+    Use `default` as platform name to train the dictionary used for all
+    platforms without a dedicated one.
+    """
+    from sentry.nodestore.compression import DICTIONARY_SUFFIX, train_dictionary
+
+    payloads = _sample_payloads(platform, project_ids, samples, days)
+    if not payloads:
+        raise click.ClickException("No events found to train the dictionary with.")
+
+    dictionary = train_dictionary(payloads, size)
+
+    os.makedirs(output, exist_ok=True)
+    path = os.path.join(output, f"{platform}{DICTIONARY_SUFFIX}")
+    with open(path, "wb") as f:
+        f.write(dictionary.as_bytes())
+
+    click.echo(
+        f"Trained dictionary {dictionary.dict_id()} from {len(payloads)} events, written to {path}"
+    )
+
+
+@nodestore.command("benchmark-compression")
+@click.option("--platform", required=True, help="Platform of the events to compress.")
+@click.option("--project", "project_ids", type=int, multiple=True, required=True)
+@click.option("--samples", type=int, default=1000, show_default=True)
+@click.option("--days", type=int, default=1, show_default=True, help="Sampling window.")
+@click.option(
+    "--dictionary-path",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory of trained dictionaries to include in the comparison.",
+)
+@configuration
+def benchmark_compression(platform, project_ids, samples, days, dictionary_path):
+    """
+    Compares compression ratio and throughput of the nodestore codecs on a
+    sample of recent events.
+    """
+    from sentry.nodestore.compression import NodeCompressor, load_dictionaries
+
+    payloads = _sample_payloads(platform, project_ids, samples, days)
+    if not payloads:
+        raise click.ClickException("No events found to benchmark with.")
+
+    compressors = {
+        "zlib": NodeCompressor("zlib"),
+        "zstd": NodeCompressor("zstd"),
+    }
+    dictionaries = load_dictionaries(dictionary_path)
+    if dictionaries:
+        compressors["zstd+dictionary"] = NodeCompressor("zstd", dictionaries=dictionaries)
+
+    click.echo(
+        "{:<16} {:>8} {:>16} {:>18}".format("codec", "ratio", "compress MB/s", "decompress MB/s")
+    )
+    for name, result in benchmark_compressors(compressors, payloads, platform).items():
+        click.echo(
+            "{:<16} {:>8.2f} {:>16.1f} {:>18.1f}".format(
+                name, result["ratio"], result["compress_mbps"], result["decompress_mbps"]
+            )
+        )
+
+
+def benchmark_compressors(compressors, payloads, platform=None):
+    import time
+
+    raw_size = sum(len(payload) for payload in payloads)
+    results = {}
+
+    for name, compressor in compressors.items():
+        start = time.perf_counter()
+        compressed = [compressor.compress(payload, platform=platform) for payload in payloads]
+        compress_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for payload in compressed:
+            compressor.decompress(payload)
+        decompress_time = time.perf_counter() - start
+
+        results[name] = {
+            "ratio": raw_size / sum(len(payload) for payload in compressed),
+            "compress_mbps": raw_size / compress_time / 1e6,
+            "decompress_mbps": raw_size / decompress_time / 1e6,
+        }
+
+    return results
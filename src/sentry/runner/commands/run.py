@@ -388,7 +388,12 @@ def cron(**options):
 
 
 @run.command("post-process-forwarder")
-@kafka_options("snuba-post-processor", allow_force_cluster=False)
+@kafka_options(
+    "snuba-post-processor",
+    allow_force_cluster=False,
+    include_batching_options=True,
+    default_max_batch_size=0,
+)
 @strict_offset_reset_option()
 @click.option(
     "--topic",
@@ -433,6 +438,10 @@ def post_process_forwarder(**options):
             concurrency=options["concurrency"],
             initial_offset_reset=options["auto_offset_reset"],
             strict_offset_reset=options["strict_offset_reset"],
+            # A batch size of 0 dispatches one post_process_group task per event.
+            # Batches are dispatched one at a time regardless of concurrency.
+            max_batch_size=options["max_batch_size"],
+            max_batch_time=options["max_batch_time"] / 1000,
         )
     except ForwarderNotRequired:
         sys.stdout.write(
@@ -518,6 +527,14 @@ def query_subscription_consumer(**options):
     default=None,
     help="Thread pool size (only utilitized for message types that support concurrent processing)",
 )
+@click.option(
+    "--processes",
+    type=int,
+    default=None,
+    help="Decode messages and write events to the processing store in this many processes. Requires a single --consumer-type.",
+)
+@click.option("--input-block-size", type=int, default=DEFAULT_BLOCK_SIZE)
+@click.option("--output-block-size", type=int, default=DEFAULT_BLOCK_SIZE)
 @configuration
 def ingest_consumer(consumer_types, all_consumer_types, **options):
     """
@@ -540,6 +557,32 @@ def ingest_consumer(consumer_types, all_consumer_types, **options):
     if not all_consumer_types and not consumer_types:
         raise click.ClickException("Need to specify --all-consumer-types or --consumer-type")
 
+    processes = options.pop("processes", None)
+    input_block_size = options.pop("input_block_size")
+    output_block_size = options.pop("output_block_size")
+    if processes is not None:
+        if len(consumer_types) != 1:
+            raise click.ClickException("--processes requires exactly one --consumer-type")
+
+        from sentry.ingest.parallel import get_parallel_ingest_consumer
+
+        options.pop("concurrency", None)
+        (consumer_type,) = consumer_types
+        with metrics.global_tags(ingest_consumer_types=consumer_type, _all_threads=True):
+            consumer = get_parallel_ingest_consumer(
+                consumer_type=consumer_type,
+                processes=processes,
+                input_block_size=input_block_size,
+                output_block_size=output_block_size,
+                **{
+                    **options,
+                    # Our batcher expects the time in seconds
+                    "max_batch_time": options["max_batch_time"] / 1000,
+                },
+            )
+            run_processor_with_signals(consumer)
+        return
+
     concurrency = options.pop("concurrency", None)
     if concurrency is not None:
         executor = ThreadPoolExecutor(concurrency)
@@ -0,0 +1,50 @@
+-- Reserve ("lease") a number of items from a collection of quota counters, so
+-- they can be handed out locally without calling into Redis for every item.
+-- Values provided as ``KEYS`` specify the keys of the counters and the keys of
+-- their refund/negative counters, like in ``is_rate_limited.lua``. Values
+-- provided as ``ARGV`` specify, for each quota, the quota limit, the expiration
+-- time of the keys, the number of items requested, and the number of items of
+-- a previous lease that were not used and are returned.
+--
+-- For example, to lease 10 items from a quota ``foo`` with a limit of 100 items
+-- that expires at the Unix timestamp ``100``, returning 2 unused items:
+--
+--   KEYS = {"foo", "subtract_from_foo"}
+--   ARGV = {100, 100, 10, 2}
+--
+-- Returned items are added to the refund counter. Each quota grants as many of
+-- the requested items as are left below its limit (limit=-1 means "no limit"),
+-- and the counter is incremented by the granted amount. Unlike
+-- ``is_rate_limited.lua``, quotas are leased independently of each other. The
+-- result is a Lua table/array (Redis multi bulk reply) of the number of items
+-- granted for every quota.
+assert(#KEYS * 2 == #ARGV, "incorrect number of keys and arguments provided")
+assert(#KEYS % 2 == 0, "there must be an even number of keys")
+
+local results = {}
+for i=1, #KEYS, 2 do
+    local j = i * 2 - 1
+    local limit = tonumber(ARGV[j])
+    local expiry = ARGV[j + 1]
+    local requested = tonumber(ARGV[j + 2])
+    local returned = tonumber(ARGV[j + 3])
+
+    if returned > 0 then
+        redis.call('INCRBY', KEYS[i + 1], returned)
+        redis.call('EXPIREAT', KEYS[i + 1], expiry)
+    end
+
+    local granted = requested
+    if limit >= 0 then
+        local used = (redis.call('GET', KEYS[i]) or 0) - (redis.call('GET', KEYS[i + 1]) or 0)
+        granted = math.max(0, math.min(requested, limit - used))
+    end
+
+    if granted > 0 then
+        redis.call('INCRBY', KEYS[i], granted)
+        redis.call('EXPIREAT', KEYS[i], expiry)
+    end
+    results[(i + 1) / 2] = granted
+end
+
+return results
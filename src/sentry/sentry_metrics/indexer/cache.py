@@ -1,6 +1,7 @@
 import logging
 import random
-from typing import Mapping, MutableMapping, Optional, Sequence, Set
+from threading import Lock
+from typing import Dict, Iterable, List, Mapping, MutableMapping, Optional, Sequence, Set, Tuple
 
 from django.conf import settings
 from django.core.cache import caches
@@ -16,12 +17,85 @@ from sentry.sentry_metrics.indexer.base import (
 from sentry.sentry_metrics.use_case_id_registry import REVERSE_METRIC_PATH_MAPPING
 from sentry.utils import metrics
 from sentry.utils.hashlib import md5_text
+from sentry.utils.lru import LRUCache
 
 logger = logging.getLogger(__name__)
 
 _INDEXER_CACHE_METRIC = "sentry_metrics.indexer.memcache"
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+
+#: Approximate number of bytes a local cache entry takes besides its key: the
+#: indexed int, the entry tuple and the bookkeeping of the LRU.
+_LOCAL_CACHE_ENTRY_OVERHEAD = 200
+
+
+def _get_local_cache_entry_size(entry: Tuple[str, int]) -> int:
+    return len(entry[0]) + _LOCAL_CACHE_ENTRY_OVERHEAD
+
+
+def _group_by_org(keys: Iterable[str]) -> Mapping[str, List[str]]:
+    """
+    Groups keys formatted like "org_id:string" by their org id.
+    """
+    grouped: Dict[str, List[str]] = {}
+    for key in keys:
+        grouped.setdefault(key.split(":", 1)[0], []).append(key)
+    return grouped
+
+
+class LocalIndexerCache:
+    """
+    The in-process tier of the indexer cache.
+
+    Every use case and org gets its own LRU of at most ``org_size`` bytes, so
+    that a single busy org cannot evict the strings of all others. Partitions
+    are accounted with their full ``org_size``, and the ones of the least
+    recently used orgs are dropped once they would exceed ``max_size`` bytes
+    together.
+    """
+
+    def __init__(self, max_size: int, org_size: int) -> None:
+        self.org_size = min(org_size, max_size)
+        self.__partitions: LRUCache[Tuple[str, str], LRUCache[str, Tuple[str, int]]] = LRUCache(
+            max_size, get_size=lambda partition: partition.max_size
+        )
+        self.__lock = Lock()
+
+    def __get_partition(
+        self, cache_namespace: str, org_id: str, create: bool = False
+    ) -> Optional[LRUCache[str, Tuple[str, int]]]:
+        partition = self.__partitions.get((cache_namespace, org_id))
+        if partition is None and create:
+            with self.__lock:
+                partition = self.__partitions.get((cache_namespace, org_id))
+                if partition is None:
+                    partition = LRUCache(self.org_size, get_size=_get_local_cache_entry_size)
+                    self.__partitions.set((cache_namespace, org_id), partition)
+        return partition
+
+    def get_many(self, keys: Iterable[str], cache_namespace: str) -> Dict[str, int]:
+        results = {}
+        for org_id, org_keys in _group_by_org(keys).items():
+            partition = self.__get_partition(cache_namespace, org_id)
+            if partition is not None:
+                results.update(
+                    (key, value) for key, (_, value) in partition.get_many(org_keys).items()
+                )
+        return results
+
+    def set_many(self, key_values: Mapping[str, int], cache_namespace: str, ttl: int) -> None:
+        for org_id, org_keys in _group_by_org(key_values).items():
+            partition = self.__get_partition(cache_namespace, org_id, create=True)
+            assert partition is not None
+            partition.set_many({key: (key, key_values[key]) for key in org_keys}, ttl=ttl)
+
+    def delete_many(self, keys: Iterable[str], cache_namespace: str) -> None:
+        for org_id, org_keys in _group_by_org(keys).items():
+            partition = self.__get_partition(cache_namespace, org_id)
+            if partition is not None:
+                partition.delete_many(org_keys)
 
 
 class StringIndexerCache:
@@ -30,6 +104,24 @@ class StringIndexerCache:
         self.cache = caches[cache_name]
         self.partition_key = partition_key
 
+        self.__local_cache: Optional[LocalIndexerCache] = None
+        self.__local_cache_lock = Lock()
+
+    @property
+    def local_cache(self) -> Optional[LocalIndexerCache]:
+        """
+        The in-process tier in front of the shared cache, or ``None`` if
+        ``SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE`` is not set.
+        """
+        if self.__local_cache is None and settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE > 0:
+            with self.__local_cache_lock:
+                if self.__local_cache is None:
+                    self.__local_cache = LocalIndexerCache(
+                        max_size=settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE,
+                        org_size=settings.SENTRY_METRICS_INDEXER_LOCAL_CACHE_ORG_SIZE,
+                    )
+        return self.__local_cache
+
     @property
     def randomized_ttl(self) -> int:
         # introduce jitter in the cache_ttl so that when we have large
@@ -60,22 +152,71 @@ class StringIndexerCache:
 
         return formatted
 
+    def _record_local_cache_lookups(self, cache_namespace: str, hits: int, misses: int) -> None:
+        for cache_hit, amount in (("true", hits), ("false", misses)):
+            if amount:
+                metrics.incr(
+                    _INDEXER_LOCAL_CACHE_METRIC,
+                    tags={"cache_hit": cache_hit, "use_case": cache_namespace},
+                    amount=amount,
+                )
+
     def get(self, key: str, cache_namespace: str) -> int:
+        local_cache = self.local_cache
+        if local_cache is not None:
+            local_result = local_cache.get_many([key], cache_namespace).get(key)
+            self._record_local_cache_lookups(
+                cache_namespace, int(local_result is not None), int(local_result is None)
+            )
+            if local_result is not None:
+                return local_result
+
         result: int = self.cache.get(
             self.make_cache_key(key, cache_namespace), version=self.version
         )
+        if local_cache is not None and result is not None:
+            local_cache.set_many({key: result}, cache_namespace, ttl=self.randomized_ttl)
         return result
 
     def set(self, key: str, value: int, cache_namespace: str) -> None:
+        ttl = self.randomized_ttl
         self.cache.set(
             key=self.make_cache_key(key, cache_namespace),
             value=value,
-            timeout=self.randomized_ttl,
+            timeout=ttl,
             version=self.version,
         )
 
+        local_cache = self.local_cache
+        if local_cache is not None:
+            local_cache.set_many({key: value}, cache_namespace, ttl=ttl)
+
     def get_many(
         self, keys: Sequence[str], cache_namespace: str
+    ) -> MutableMapping[str, Optional[int]]:
+        local_cache = self.local_cache
+        if local_cache is None:
+            return self._get_many(keys, cache_namespace)
+
+        local_results = local_cache.get_many(keys, cache_namespace)
+        self._record_local_cache_lookups(
+            cache_namespace, len(local_results), len(keys) - len(local_results)
+        )
+
+        missing_keys = [key for key in keys if key not in local_results]
+        results: MutableMapping[str, Optional[int]] = {}
+        if missing_keys:
+            results = self._get_many(missing_keys, cache_namespace)
+            local_cache.set_many(
+                {k: v for k, v in results.items() if v is not None},
+                cache_namespace,
+                ttl=self.randomized_ttl,
+            )
+
+        return {key: local_results[key] if key in local_results else results[key] for key in keys}
+
+    def _get_many(
+        self, keys: Sequence[str], cache_namespace: str
     ) -> MutableMapping[str, Optional[int]]:
         cache_keys = {self.make_cache_key(key, cache_namespace): key for key in keys}
         results: Mapping[str, Optional[int]] = self.cache.get_many(
@@ -84,19 +225,34 @@ class StringIndexerCache:
         return self._format_results(keys, results, cache_namespace)
 
     def set_many(self, key_values: Mapping[str, int], cache_namespace: str) -> None:
+        ttl = self.randomized_ttl
         cache_key_values = {
             self.make_cache_key(k, cache_namespace): v for k, v in key_values.items()
         }
-        self.cache.set_many(cache_key_values, timeout=self.randomized_ttl, version=self.version)
+        self.cache.set_many(cache_key_values, timeout=ttl, version=self.version)
+
+        # Write through, so that the strings of this batch are resolved in
+        # process the next time they are seen.
+        local_cache = self.local_cache
+        if local_cache is not None:
+            local_cache.set_many(key_values, cache_namespace, ttl=ttl)
 
     def delete(self, key: str, cache_namespace: str) -> None:
         cache_key = self.make_cache_key(key, cache_namespace)
         self.cache.delete(cache_key, version=self.version)
 
+        local_cache = self.local_cache
+        if local_cache is not None:
+            local_cache.delete_many([key], cache_namespace)
+
     def delete_many(self, keys: Sequence[str], cache_namespace: str) -> None:
         cache_keys = [self.make_cache_key(key, cache_namespace) for key in keys]
         self.cache.delete_many(cache_keys, version=self.version)
 
+        local_cache = self.local_cache
+        if local_cache is not None:
+            local_cache.delete_many(keys, cache_namespace)
+
 
 class CachingIndexer(StringIndexer):
     def __init__(self, cache: StringIndexerCache, indexer: StringIndexer) -> None:
@@ -1,13 +1,56 @@
 import mmh3
 
+from sentry.utils.lru import LRUCache
+
 
 class MinHashSignatureBuilder:
-    def __init__(self, columns, rows):
+    """
+    Builds MinHash signatures of ``columns`` values in ``[0, rows)`` from sets
+    of features.
+
+    The hashes of a feature for all columns are computed together, and if
+    ``cache_size`` is set, cached for the feature so that features shared by
+    many events (such as frames) are only hashed once.
+    """
+
+    def __init__(self, columns, rows, cache_size=0):
         self.columns = columns
         self.rows = rows
+        self.__seeds = tuple(range(columns))
+        self.cache = (
+            LRUCache(cache_size, metrics_key="similarity.signatures.cache") if cache_size else None
+        )
+
+    def _hash(self, feature):
+        rows = self.rows
+        return tuple([mmh3.hash(feature, seed) % rows for seed in self.__seeds])
+
+    def _get_hashes(self, features):
+        if self.cache is None:
+            return {feature: self._hash(feature) for feature in features}
+
+        hashes = self.cache.get_many(features)
+        missing = {feature: self._hash(feature) for feature in features if feature not in hashes}
+        if missing:
+            self.cache.set_many(missing)
+            hashes.update(missing)
+        return hashes
 
     def __call__(self, features):
-        return [
-            min(mmh3.hash(feature, column) % self.rows for feature in features)
-            for column in range(self.columns)
-        ]
+        return self.build_many([features])[0]
+
+    def build_many(self, feature_sets):
+        """
+        Returns the signatures of many sets of features at once, hashing every
+        distinct feature only once.
+        """
+        feature_sets = [set(features) for features in feature_sets]
+        hashes = self._get_hashes(set().union(*feature_sets))
+
+        signatures = []
+        for features in feature_sets:
+            if not features:
+                raise ValueError("cannot build the signature of an empty set of features")
+            # column-wise minimum of the hashes of all features
+            signatures.append(list(map(min, zip(*[hashes[feature] for feature in features]))))
+        return signatures
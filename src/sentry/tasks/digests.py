@@ -1,12 +1,14 @@
 import logging
 import time
 
+from sentry import options
 from sentry.digests import get_option_key
 from sentry.digests.backends.base import InvalidState
 from sentry.digests.notifications import build_digest, split_key
 from sentry.models import Project, ProjectOption
 from sentry.tasks.base import instrumented_task
-from sentry.utils import snuba
+from sentry.utils import metrics, snuba
+from sentry.utils.iterators import chunked
 
 logger = logging.getLogger(__name__)
 
@@ -28,14 +30,24 @@ def schedule_digests():
     timeout = 300
     digests.maintenance(deadline - timeout)
 
-    for entry in digests.schedule(deadline):
-        deliver_digest.delay(entry.key, entry.timestamp)
+    batch_size = options.get("digests.delivery-batch-size")
+    entries = digests.schedule(deadline) or ()
+    scheduled = 0
+    if batch_size > 0:
+        for batch in chunked(entries, batch_size):
+            deliver_digests.delay([entry.key for entry in batch])
+            scheduled += len(batch)
+    else:
+        for entry in entries:
+            deliver_digest.delay(entry.key, entry.timestamp)
+            scheduled += 1
+
+    metrics.incr("digests.schedule.timelines", amount=scheduled, skip_internal=False)
 
 
 @instrumented_task(name="sentry.tasks.digests.deliver_digest", queue="digests.delivery")
 def deliver_digest(key, schedule_timestamp=None):
     from sentry import digests
-    from sentry.mail import mail_adapter
 
     try:
         project, target_type, target_identifier, fallthrough_choice = split_key(key)
@@ -56,22 +68,81 @@ def deliver_digest(key, schedule_timestamp=None):
             logger.info(f"Skipped digest delivery: {error}", exc_info=True)
             return
 
-        if digest:
-            mail_adapter.notify_digest(
-                project,
-                digest,
-                target_type,
-                target_identifier,
-                fallthrough_choice=fallthrough_choice,
-            )
-        else:
-            logger.info(
-                "Skipped digest delivery due to empty digest",
-                extra={
-                    "project": project.id,
-                    "target_type": target_type.value,
-                    "target_identifier": target_identifier,
-                    "build_digest_logs": logs,
-                    "fallthrough_choice": fallthrough_choice.value if fallthrough_choice else None,
-                },
-            )
+        _notify_digest(project, digest, logs, target_type, target_identifier, fallthrough_choice)
+
+
+@instrumented_task(name="sentry.tasks.digests.deliver_digests", queue="digests.delivery")
+def deliver_digests(keys):
+    """
+    Delivers the digests of many timelines, reading and closing all of them
+    with a few round-trips per Redis host instead of a few per timeline.
+    """
+    from sentry import digests
+
+    metrics.timing("digests.delivery.batch_size", len(keys))
+
+    targets = {}
+    minimum_delays = {}
+    for key in keys:
+        try:
+            targets[key] = split_key(key)
+        except Project.DoesNotExist as error:
+            logger.info(f"Cannot deliver digest {key} due to error: {error}")
+            digests.delete(key)
+            continue
+
+        minimum_delays[key] = ProjectOption.objects.get_value(
+            targets[key][0], get_option_key("mail", "minimum_delay")
+        )
+
+    built = {}
+    with snuba.options_override({"consistent": True}):
+        with metrics.timer("digests.delivery.build"):
+            with digests.digest_many(list(targets), minimum_delays=minimum_delays) as records:
+                for key, timeline_records in list(records.items()):
+                    try:
+                        built[key] = build_digest(targets[key][0], timeline_records)
+                    except Exception:
+                        # Leave this timeline open so it is retried after
+                        # maintenance, without holding back the others.
+                        logger.exception("Failed to build digest", extra={"key": key})
+                        del records[key]
+
+        metrics.incr(
+            "digests.delivery.skipped", amount=len(targets) - len(built), skip_internal=False
+        )
+
+        for key, (digest, logs) in built.items():
+            project, target_type, target_identifier, fallthrough_choice = targets[key]
+            try:
+                _notify_digest(
+                    project, digest, logs, target_type, target_identifier, fallthrough_choice
+                )
+            except Exception:
+                logger.exception("Failed to deliver digest", extra={"key": key})
+
+        metrics.incr("digests.delivery.delivered", amount=len(built), skip_internal=False)
+
+
+def _notify_digest(project, digest, logs, target_type, target_identifier, fallthrough_choice):
+    from sentry.mail import mail_adapter
+
+    if digest:
+        mail_adapter.notify_digest(
+            project,
+            digest,
+            target_type,
+            target_identifier,
+            fallthrough_choice=fallthrough_choice,
+        )
+    else:
+        logger.info(
+            "Skipped digest delivery due to empty digest",
+            extra={
+                "project": project.id,
+                "target_type": target_type.value,
+                "target_identifier": target_identifier,
+                "build_digest_logs": logs,
+                "fallthrough_choice": fallthrough_choice.value if fallthrough_choice else None,
+            },
+        )
@@ -1,10 +1,27 @@
 from __future__ import annotations
 
 import logging
+import time
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING, List, Mapping, Optional, Sequence, Tuple, TypedDict, Union
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypedDict,
+    TypeVar,
+    Union,
+)
 
 import sentry_sdk
+from celery.exceptions import SoftTimeLimitExceeded
 from django.conf import settings
 from django.utils import timezone
 
@@ -21,6 +38,7 @@ from sentry.utils.cache import cache
 from sentry.utils.event_frames import get_sdk_name
 from sentry.utils.locking import UnableToAcquireLock
 from sentry.utils.locking.manager import LockManager
+from sentry.utils.lru import LRUCache
 from sentry.utils.safe import safe_execute
 from sentry.utils.sdk import bind_organization_context, set_current_event_project
 from sentry.utils.services import build_instance_from_options
@@ -28,6 +46,10 @@ from sentry.utils.services import build_instance_from_options
 if TYPE_CHECKING:
     from sentry.eventstore.models import Event, GroupEvent
     from sentry.eventstream.base import GroupState, GroupStates
+    from sentry.models import Project
+    from sentry.plugins.base.v2 import Plugin2
+
+T = TypeVar("T")
 
 logger = logging.getLogger(__name__)
 
@@ -36,12 +58,109 @@ locks = LockManager(build_instance_from_options(settings.SENTRY_POST_PROCESS_LOC
 ISSUE_OWNERS_PER_PROJECT_PER_MIN_RATELIMIT = 50
 
 
+class PostProcessContext:
+    """
+    Project-level data used by several pipeline steps, loaded lazily and at
+    most once.
+
+    Contexts are shared by all events of the same project that a worker
+    processes within ``SENTRY_POST_PROCESS_CONTEXT_TTL`` seconds, see
+    :func:`get_post_process_context`. Only data that is already cached for at
+    least that long elsewhere may be memoized here.
+    """
+
+    def __init__(self, project: Project) -> None:
+        self.project = project
+        self.__values: Dict[Tuple[str, ...], Any] = {}
+        self.__lock = Lock()
+
+    def __get(self, key: Tuple[str, ...], load: Callable[[], T]) -> T:
+        with self.__lock:
+            if key in self.__values:
+                return self.__values[key]  # type: ignore[no-any-return]
+
+        value = load()
+        with self.__lock:
+            self.__values[key] = value
+        return value
+
+    def has_feature(self, name: str) -> bool:
+        """
+        Checks an ``organizations:`` or ``projects:`` feature flag of the project.
+        """
+        if name.startswith("projects:"):
+            return self.__get(("feature", name), lambda: features.has(name, project=self.project))
+        return self.__get(("feature", name), lambda: features.has(name, self.project.organization))
+
+    def get_service_hooks(self) -> List[Tuple[int, List[str]]]:
+        return self.__get(("service_hooks",), lambda: _get_service_hooks(self.project.id))
+
+    def should_send_error_created_hooks(self) -> bool:
+        return self.__get(
+            ("error_created_hooks",), lambda: _should_send_error_created_hooks(self.project)
+        )
+
+    def get_plugins(self) -> List[Plugin2]:
+        from sentry.plugins.base import plugins
+
+        return self.__get(("plugins",), lambda: list(plugins.for_project(self.project)))
+
+    def organization_has_commits(self) -> bool:
+        return self.__get(
+            ("organization_has_commits",),
+            lambda: _organization_has_commits(self.project.organization_id),
+        )
+
+    def organization_has_scm_integrations(self) -> bool:
+        return self.__get(
+            ("organization_has_scm_integrations",),
+            lambda: _organization_has_scm_integrations(self.project.organization_id),
+        )
+
+
+_post_process_contexts: Optional[LRUCache[int, PostProcessContext]] = None
+_post_process_contexts_lock = Lock()
+
+
+def get_post_process_context(project: Project) -> PostProcessContext:
+    """
+    Returns the context shared by the events of ``project``, or a new one if
+    ``SENTRY_POST_PROCESS_CONTEXT_TTL`` is not set.
+    """
+    global _post_process_contexts
+
+    if settings.SENTRY_POST_PROCESS_CONTEXT_TTL <= 0:
+        return PostProcessContext(project)
+
+    if _post_process_contexts is None:
+        with _post_process_contexts_lock:
+            if _post_process_contexts is None:
+                _post_process_contexts = LRUCache(
+                    1000,
+                    ttl=settings.SENTRY_POST_PROCESS_CONTEXT_TTL,
+                    metrics_key="tasks.post_process.context_cache",
+                )
+
+    context = _post_process_contexts.get(project.id)
+    if context is None:
+        context = PostProcessContext(project)
+        _post_process_contexts.set(project.id, context)
+    return context
+
+
 class PostProcessJob(TypedDict, total=False):
     event: Union[Event, GroupEvent]
     group_state: GroupState
     is_reprocessed: bool
     has_reappeared: bool
     has_alert: bool
+    context: PostProcessContext
+
+
+def get_job_context(job: PostProcessJob) -> PostProcessContext:
+    if "context" not in job:
+        job["context"] = get_post_process_context(job["event"].project)
+    return job["context"]
 
 
 def _get_service_hooks(project_id):
@@ -82,6 +201,33 @@ def _should_send_error_created_hooks(project):
     return result
 
 
+def _organization_has_commits(organization_id):
+    from sentry.models import Commit
+
+    has_commit_key = f"w-o:{organization_id}-h-c"
+    org_has_commit = cache.get(has_commit_key)
+    if org_has_commit is None:
+        org_has_commit = Commit.objects.filter(organization_id=organization_id).exists()
+        cache.set(has_commit_key, org_has_commit, 3600)
+    return org_has_commit
+
+
+def _organization_has_scm_integrations(organization_id):
+    integration_cache_key = f"commit-context-scm-integration:{organization_id}"
+    has_integrations = cache.get(integration_cache_key)
+    if has_integrations is None:
+        from sentry.services.hybrid_cloud.integration import integration_service
+
+        org_integrations = integration_service.get_organization_integrations(
+            organization_id=organization_id,
+            providers=["github", "gitlab"],
+        )
+        has_integrations = len(org_integrations) > 0
+        # Cache the integrations check for 4 hours
+        cache.set(integration_cache_key, has_integrations, 14400)
+    return has_integrations
+
+
 def should_write_event_stats(event: Event):
     # For now, we only want to write these stats for error events. If we start writing them for
     # other event types we'll throw off existing stats and potentially cause various alerts to fire.
@@ -411,136 +557,358 @@ def post_process_group(
     from sentry.utils import snuba
 
     with snuba.options_override({"consistent": True}):
-        from sentry import eventstore
-        from sentry.eventstore.processing import event_processing_store
-        from sentry.ingest.transaction_clusterer.datasource.redis import (
-            record_transaction_name as record_transaction_name_for_clustering,
+        _post_process_group(
+            is_new=is_new,
+            is_regression=is_regression,
+            is_new_group_environment=is_new_group_environment,
+            cache_key=cache_key,
+            group_id=group_id,
+            group_states=group_states,
+            occurrence_id=occurrence_id,
+            project_id=project_id,
         )
-        from sentry.models import Organization, Project
-        from sentry.reprocessing2 import is_reprocessed_event
 
-        if occurrence_id is None:
-            # We use the data being present/missing in the processing store
-            # to ensure that we don't duplicate work should the forwarding consumers
-            # need to rewind history.
-            data = event_processing_store.get(cache_key)
-            if not data:
+
+# Batches of a project are post-processed one after the other, in the order
+# they were dispatched in, so that the events of a group are processed in
+# order. A batch waits at most this many seconds for the previous batch of its
+# project, e.g. in case that one was lost, before it is processed regardless.
+POST_PROCESS_BATCH_ORDERING_TIMEOUT = 60
+_POST_PROCESS_BATCH_ORDERING_TTL = 3600
+
+# Seconds after which a batch hands its remaining events off to a new task,
+# which leaves time to finish the current event before the soft time limit.
+POST_PROCESS_BATCH_TIME_BUDGET = 80
+
+# Records that the batch with sequence number ``ARGV[1]`` is done, unless a
+# later batch was done already.
+_MARK_POST_PROCESS_BATCH_DONE = """
+local done = tonumber(redis.call('HGET', KEYS[1], 'done') or '0')
+if done < tonumber(ARGV[1]) then
+    redis.call('HSET', KEYS[1], 'done', ARGV[1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+"""
+
+
+def _get_post_process_batch_ordering_client() -> Any:
+    from sentry.utils import redis
+
+    return redis.redis_clusters.get(settings.SENTRY_POST_PROCESS_BATCH_ORDERING_CLUSTER)
+
+
+def _get_post_process_batch_ordering_key(project_id: int) -> str:
+    return f"pp-batch:{project_id}"
+
+
+def get_post_process_batch_sequences(project_ids: Sequence[int]) -> List[int]:
+    """
+    Returns the sequence numbers for new ``post_process_group_batch`` tasks of
+    the given projects. Batches must be dispatched in the order in which their
+    sequence numbers were requested.
+    """
+    client = _get_post_process_batch_ordering_client()
+    with client.pipeline(transaction=False) as pipeline:
+        for project_id in project_ids:
+            key = _get_post_process_batch_ordering_key(project_id)
+            pipeline.hincrby(key, "dispatched", 1)
+            pipeline.expire(key, _POST_PROCESS_BATCH_ORDERING_TTL)
+        return [int(sequence) for sequence in pipeline.execute()[::2]]
+
+
+def _is_previous_post_process_batch_done(project_id: int, sequence: int) -> bool:
+    client = _get_post_process_batch_ordering_client()
+    done = client.hget(_get_post_process_batch_ordering_key(project_id), "done")
+    return int(done or 0) >= sequence - 1
+
+
+def _mark_post_process_batch_done(project_id: int, sequence: int) -> None:
+    client = _get_post_process_batch_ordering_client()
+    client.eval(
+        _MARK_POST_PROCESS_BATCH_DONE,
+        1,
+        _get_post_process_batch_ordering_key(project_id),
+        sequence,
+        _POST_PROCESS_BATCH_ORDERING_TTL,
+    )
+
+
+@instrumented_task(
+    name="sentry.tasks.post_process.post_process_group_batch",
+    time_limit=120,
+    soft_time_limit=110,
+)
+def post_process_group_batch(
+    tasks: Sequence[Mapping[str, Any]],
+    queue: Optional[str] = None,
+    sequence: Optional[int] = None,
+    wait_until: Optional[float] = None,
+    **kwargs,
+):
+    """
+    Fires post processing hooks for a batch of events of one project, each
+    described by the keyword arguments of a ``post_process_group`` task.
+
+    Events are processed one after the other in the given order. Project-level
+    data is loaded once per project for the whole batch. A failing event is
+    logged and does not prevent the remaining events from being processed.
+
+    Batches with a ``sequence`` number (see ``get_post_process_batch_sequences``)
+    are only processed once the previous batch of their project is done, so
+    that the events of a group are processed in order across batches. Until
+    then, the task is retried on ``queue``, up to
+    ``POST_PROCESS_BATCH_ORDERING_TIMEOUT`` seconds.
+
+    Once the batch has run for ``POST_PROCESS_BATCH_TIME_BUDGET`` seconds or
+    hits its soft time limit, the remaining events are dispatched as a new
+    batch to ``queue`` instead of being dropped.
+
+    Payloads are read from the processing store for the whole batch up front,
+    but only deleted as each event is processed. Should the forwarder rewind,
+    two batches holding the same event may therefore both read it before
+    either deletes it, and process it twice. With single events this window
+    only spans the processing of one event.
+    """
+    from sentry.eventstore.processing import event_processing_store
+    from sentry.utils import snuba
+
+    if not tasks:
+        return
+
+    project_id = tasks[0]["project_id"]
+    if sequence is not None and not _is_previous_post_process_batch_done(project_id, sequence):
+        now = time.time()
+        if wait_until is None:
+            wait_until = now + POST_PROCESS_BATCH_ORDERING_TIMEOUT
+        if now < wait_until:
+            post_process_group_batch.apply_async(
+                kwargs={
+                    "tasks": tasks,
+                    "queue": queue,
+                    "sequence": sequence,
+                    "wait_until": wait_until,
+                },
+                queue=queue,
+                countdown=1,
+            )
+            return
+
+        metrics.incr("tasks.post_process.post_process_group_batch.ordering_timeout")
+        logger.warning(
+            "post_process.batch.ordering_timeout",
+            extra={"project_id": project_id, "sequence": sequence},
+        )
+
+    def dispatch_remaining(remaining: Sequence[Mapping[str, Any]]) -> None:
+        # The remaining events were admitted in order already, they must not
+        # wait for the previous batch again.
+        post_process_group_batch.apply_async(
+            kwargs={"tasks": remaining, "queue": queue, "sequence": sequence, "wait_until": 0},
+            queue=queue,
+        )
+
+    contexts: MutableMapping[int, PostProcessContext] = {}
+    metrics.timing("tasks.post_process.post_process_group_batch.size", len(tasks))
+    started = time.monotonic()
+
+    # Fetch the payloads of all events in one round-trip. Issue platform events
+    # are not kept in the processing store.
+    cache_keys = [t["cache_key"] for t in tasks if t.get("occurrence_id") is None]
+    with metrics.timer("tasks.post_process.post_process_group_batch.prefetch"):
+        prefetched = dict(event_processing_store.get_many(cache_keys)) if cache_keys else {}
+
+    with snuba.options_override({"consistent": True}):
+        for index, task_kwargs in enumerate(tasks):
+            if index and time.monotonic() - started > POST_PROCESS_BATCH_TIME_BUDGET:
                 logger.info(
-                    "post_process.skipped",
-                    extra={"cache_key": cache_key, "reason": "missing_cache"},
+                    "post_process.batch.time_budget",
+                    extra={"project_id": project_id, "remaining": len(tasks) - index},
                 )
+                dispatch_remaining(tasks[index:])
                 return
-            with metrics.timer("tasks.post_process.delete_event_cache"):
-                event_processing_store.delete_by_key(cache_key)
-
-            occurrence = None
-            event = process_event(data, group_id)
-        else:
-            # Note: We attempt to acquire the lock here, but we don't release it and instead just
-            # rely on the ttl. The goal here is to make sure we only ever run post process group
-            # at most once per occurrence. Even though we don't use retries on the task, this is
-            # still necessary since the consumer that sends these might reprocess a batch.
-            # TODO: It might be better to instead set a value that we delete here, similar to what
-            # we do with `event_processing_store`. If we could do this *before* the occurrence ends
-            # up in Kafka (IE via the api that will sit in front of it), then we could guarantee at
-            # most once running of post process group.
-            lock = locks.get(
-                f"ppg:{occurrence_id}-once",
-                duration=600,
-                name="post_process_w_o",
-            )
 
             try:
-                lock.acquire()
+                _post_process_group(contexts=contexts, prefetched=prefetched, **task_kwargs)
+            except SoftTimeLimitExceeded:
+                remaining = tasks[index + 1 :]
+                logger.warning(
+                    "post_process.batch.soft_time_limit",
+                    extra={"cache_key": task_kwargs.get("cache_key"), "remaining": len(remaining)},
+                )
+                if remaining:
+                    dispatch_remaining(remaining)
+                    return
+                break
             except Exception:
-                # If we fail to acquire the lock, we've already run post process group for this
-                # occurrence
-                return
-
-            occurrence = IssueOccurrence.fetch(occurrence_id, project_id=project_id)
-            if not occurrence:
-                logger.error(
-                    "Failed to fetch occurrence",
-                    extra={"occurrence_id": occurrence_id, "project_id": project_id},
+                logger.exception(
+                    "post_process.batch.failed",
+                    extra={"cache_key": task_kwargs.get("cache_key")},
                 )
-                return
-            # Issue platform events don't use `event_processing_store`. Fetch from eventstore
-            # instead.
-            event = eventstore.get_event_by_id(
-                project_id, occurrence.event_id, group_id=group_id, skip_transaction_groupevent=True
+
+    if sequence is not None:
+        _mark_post_process_batch_done(project_id, sequence)
+
+
+def _post_process_group(
+    is_new,
+    is_regression,
+    is_new_group_environment,
+    cache_key,
+    group_id=None,
+    group_states: Optional[GroupStates] = None,
+    occurrence_id: Optional[str] = None,
+    project_id: Optional[int] = None,
+    contexts: Optional[MutableMapping[int, PostProcessContext]] = None,
+    prefetched: Optional[MutableMapping[str, Any]] = None,
+    **kwargs,
+):
+    """
+    Runs the post processing pipeline of a single event. ``contexts`` keeps
+    the ``PostProcessContext`` of each project across calls, ``prefetched``
+    holds event payloads already read from the processing store.
+    """
+    from sentry import eventstore
+    from sentry.eventstore.processing import event_processing_store
+    from sentry.ingest.transaction_clusterer.datasource.redis import (
+        record_transaction_name as record_transaction_name_for_clustering,
+    )
+    from sentry.models import Organization, Project
+    from sentry.reprocessing2 import is_reprocessed_event
+
+    if occurrence_id is None:
+        # We use the data being present/missing in the processing store
+        # to ensure that we don't duplicate work should the forwarding consumers
+        # need to rewind history.
+        if prefetched is not None:
+            # Popped so that a duplicate of the event in the same batch is
+            # skipped, as its payload is deleted below. Duplicates across
+            # batches are not caught, see `post_process_group_batch`.
+            data = prefetched.pop(cache_key, None)
+        else:
+            data = event_processing_store.get(cache_key)
+        if not data:
+            logger.info(
+                "post_process.skipped",
+                extra={"cache_key": cache_key, "reason": "missing_cache"},
             )
+            return
+        with metrics.timer("tasks.post_process.delete_event_cache"):
+            event_processing_store.delete_by_key(cache_key)
 
-        set_current_event_project(event.project_id)
+        occurrence = None
+        event = process_event(data, group_id)
+    else:
+        # Note: We attempt to acquire the lock here, but we don't release it and instead just
+        # rely on the ttl. The goal here is to make sure we only ever run post process group
+        # at most once per occurrence. Even though we don't use retries on the task, this is
+        # still necessary since the consumer that sends these might reprocess a batch.
+        # TODO: It might be better to instead set a value that we delete here, similar to what
+        # we do with `event_processing_store`. If we could do this *before* the occurrence ends
+        # up in Kafka (IE via the api that will sit in front of it), then we could guarantee at
+        # most once running of post process group.
+        lock = locks.get(
+            f"ppg:{occurrence_id}-once",
+            duration=600,
+            name="post_process_w_o",
+        )
 
-        # Re-bind Project and Org since we're reading the Event object
-        # from cache which may contain stale parent models.
-        with sentry_sdk.start_span(op="tasks.post_process_group.project_get_from_cache"):
-            event.project = Project.objects.get_from_cache(id=event.project_id)
-            event.project.set_cached_field_value(
-                "organization",
-                Organization.objects.get_from_cache(id=event.project.organization_id),
+        try:
+            lock.acquire()
+        except Exception:
+            # If we fail to acquire the lock, we've already run post process group for this
+            # occurrence
+            return
+
+        occurrence = IssueOccurrence.fetch(occurrence_id, project_id=project_id)
+        if not occurrence:
+            logger.error(
+                "Failed to fetch occurrence",
+                extra={"occurrence_id": occurrence_id, "project_id": project_id},
             )
+            return
+        # Issue platform events don't use `event_processing_store`. Fetch from eventstore
+        # instead.
+        event = eventstore.get_event_by_id(
+            project_id, occurrence.event_id, group_id=group_id, skip_transaction_groupevent=True
+        )
 
-        is_reprocessed = is_reprocessed_event(event.data)
-        sentry_sdk.set_tag("is_reprocessed", is_reprocessed)
-
-        is_transaction_event = event.get_event_type() == "transaction"
-
-        # Simplified post processing for transaction events.
-        # This should eventually be completely removed and transactions
-        # will not go through any post processing.
-        if is_transaction_event:
-            record_transaction_name_for_clustering(event.project, event.data)
-            with sentry_sdk.start_span(op="tasks.post_process_group.transaction_processed_signal"):
-                transaction_processed.send_robust(
-                    sender=post_process_group,
-                    project=event.project,
-                    event=event,
-                )
+    set_current_event_project(event.project_id)
 
-        # TODO: Remove this check once we're sending all group ids as `group_states` and treat all
-        # events the same way
-        if not is_transaction_event and group_states is None:
-            # error issue
-            group_states = [
-                {
-                    "id": group_id,
-                    "is_new": is_new,
-                    "is_regression": is_regression,
-                    "is_new_group_environment": is_new_group_environment,
-                }
-            ]
-
-        update_event_groups(event, group_states)
-        bind_organization_context(event.project.organization)
-        _capture_event_stats(event)
-
-        group_events: Mapping[int, GroupEvent] = {
-            ge.group_id: ge for ge in list(event.build_group_events())
-        }
-        if occurrence is not None:
-            for ge in group_events.values():
-                ge.occurrence = occurrence
-
-        multi_groups: Sequence[Tuple[GroupEvent, GroupState]] = [
-            (group_events.get(gs.get("id")), gs)
-            for gs in (group_states or ())
-            if gs.get("id") is not None
-        ]
+    # Re-bind Project and Org since we're reading the Event object
+    # from cache which may contain stale parent models.
+    with sentry_sdk.start_span(op="tasks.post_process_group.project_get_from_cache"):
+        event.project = Project.objects.get_from_cache(id=event.project_id)
+        event.project.set_cached_field_value(
+            "organization",
+            Organization.objects.get_from_cache(id=event.project.organization_id),
+        )
 
-        group_jobs: Sequence[PostProcessJob] = [
+    is_reprocessed = is_reprocessed_event(event.data)
+    sentry_sdk.set_tag("is_reprocessed", is_reprocessed)
+
+    is_transaction_event = event.get_event_type() == "transaction"
+
+    # Simplified post processing for transaction events.
+    # This should eventually be completely removed and transactions
+    # will not go through any post processing.
+    if is_transaction_event:
+        record_transaction_name_for_clustering(event.project, event.data)
+        with sentry_sdk.start_span(op="tasks.post_process_group.transaction_processed_signal"):
+            transaction_processed.send_robust(
+                sender=post_process_group,
+                project=event.project,
+                event=event,
+            )
+
+    # TODO: Remove this check once we're sending all group ids as `group_states` and treat all
+    # events the same way
+    if not is_transaction_event and group_states is None:
+        # error issue
+        group_states = [
             {
-                "event": ge,
-                "group_state": gs,
-                "is_reprocessed": is_reprocessed,
-                "has_reappeared": bool(not gs["is_new"]),
-                "has_alert": False,
+                "id": group_id,
+                "is_new": is_new,
+                "is_regression": is_regression,
+                "is_new_group_environment": is_new_group_environment,
             }
-            for ge, gs in multi_groups
         ]
 
-        for job in group_jobs:
-            run_post_process_job(job)
+    update_event_groups(event, group_states)
+    bind_organization_context(event.project.organization)
+    _capture_event_stats(event)
+
+    group_events: Mapping[int, GroupEvent] = {
+        ge.group_id: ge for ge in list(event.build_group_events())
+    }
+    if occurrence is not None:
+        for ge in group_events.values():
+            ge.occurrence = occurrence
+
+    multi_groups: Sequence[Tuple[GroupEvent, GroupState]] = [
+        (group_events.get(gs.get("id")), gs)
+        for gs in (group_states or ())
+        if gs.get("id") is not None
+    ]
+
+    context = contexts.get(event.project_id) if contexts is not None else None
+    if context is None:
+        context = get_post_process_context(event.project)
+        if contexts is not None:
+            contexts[event.project_id] = context
+    group_jobs: Sequence[PostProcessJob] = [
+        {
+            "event": ge,
+            "group_state": gs,
+            "is_reprocessed": is_reprocessed,
+            "has_reappeared": bool(not gs["is_new"]),
+            "has_alert": False,
+            "context": context,
+        }
+        for ge, gs in multi_groups
+    ]
+
+    for job in group_jobs:
+        run_post_process_job(job)
 
 
 def run_post_process_job(job: PostProcessJob):
@@ -559,7 +927,12 @@ def run_post_process_job(job: PostProcessJob):
 
     for pipeline_step in pipeline:
         try:
-            with sentry_sdk.start_span(op=f"tasks.post_process_group.{pipeline_step.__name__}"):
+            with sentry_sdk.start_span(
+                op=f"tasks.post_process_group.{pipeline_step.__name__}"
+            ), metrics.timer(
+                "tasks.post_process.run_post_process_job.step",
+                tags={"step": pipeline_step.__name__},
+            ):
                 pipeline_step(job)
         except Exception:
             issue_category_metric = issue_category.name.lower() if issue_category else None
@@ -667,10 +1040,11 @@ def process_snoozes(job: PostProcessJob) -> None:
     from sentry.models.grouphistory import GroupHistoryStatus, record_group_history
 
     group = job["event"].group
+    context = get_job_context(job)
 
     # Check is group is escalating
     if (
-        features.has("organizations:escalating-issues", group.organization)
+        context.has_feature("organizations:escalating-issues")
         and group.status == GroupStatus.IGNORED
         and group.substatus == GroupSubStatus.UNTIL_ESCALATING
     ):
@@ -699,7 +1073,7 @@ def process_snoozes(job: PostProcessJob) -> None:
                 "user_count": snooze.user_count,
                 "user_window": snooze.user_window,
             }
-            if features.has("organizations:issue-states", group.organization):
+            if context.has_feature("organizations:issue-states"):
                 add_group_to_inbox(group, GroupInboxReason.ONGOING, snooze_details)
                 record_group_history(group, GroupHistoryStatus.ONGOING)
             else:
@@ -792,7 +1166,7 @@ def process_code_mappings(job: PostProcessJob) -> None:
             org_slug = org.slug
             next_time = timezone.now() + timedelta(hours=1)
 
-            if features.has("organizations:derive-code-mappings", org):
+            if get_job_context(job).has_feature("organizations:derive-code-mappings"):
                 logger.info(
                     f"derive_code_mappings: Queuing code mapping derivation for {project.slug=} {group_id=}."
                     + f" Future events in {org_slug=} will not have not have code mapping derivation until {next_time}"
@@ -807,12 +1181,12 @@ def process_commits(job: PostProcessJob) -> None:
     if job["is_reprocessed"]:
         return
 
-    from sentry.models import Commit
     from sentry.tasks.commit_context import DEBOUNCE_CACHE_KEY, process_commit_context
     from sentry.tasks.groupowner import DEBOUNCE_CACHE_KEY as SUSPECT_COMMITS_DEBOUNCE_CACHE_KEY
     from sentry.tasks.groupowner import process_suspect_commits
 
     event = job["event"]
+    context = get_job_context(job)
 
     try:
         lock = locks.get(
@@ -821,38 +1195,15 @@ def process_commits(job: PostProcessJob) -> None:
             name="post_process_w_o",
         )
         with lock.acquire():
-            has_commit_key = f"w-o:{event.project.organization_id}-h-c"
-            org_has_commit = cache.get(has_commit_key)
-            if org_has_commit is None:
-                org_has_commit = Commit.objects.filter(
-                    organization_id=event.project.organization_id
-                ).exists()
-                cache.set(has_commit_key, org_has_commit, 3600)
-
-            if org_has_commit:
+            if context.organization_has_commits():
                 from sentry.utils.committers import get_frame_paths
 
                 event_frames = get_frame_paths(event)
                 sdk_name = get_sdk_name(event.data)
 
-                integration_cache_key = (
-                    f"commit-context-scm-integration:{event.project.organization_id}"
-                )
-                has_integrations = cache.get(integration_cache_key)
-                if has_integrations is None:
-                    from sentry.services.hybrid_cloud.integration import integration_service
-
-                    org_integrations = integration_service.get_organization_integrations(
-                        organization_id=event.project.organization_id,
-                        providers=["github", "gitlab"],
-                    )
-                    has_integrations = len(org_integrations) > 0
-                    # Cache the integrations check for 4 hours
-                    cache.set(integration_cache_key, has_integrations, 14400)
-
                 if (
-                    features.has("organizations:commit-context", event.project.organization)
-                    and has_integrations
+                    context.has_feature("organizations:commit-context")
+                    and context.organization_has_scm_integrations()
                 ):
                     cache_key = DEBOUNCE_CACHE_KEY(event.group_id)
                     if cache.get(cache_key):
@@ -904,15 +1255,16 @@ def process_service_hooks(job: PostProcessJob) -> None:
     from sentry.tasks.servicehooks import process_service_hook
 
     event, has_alert = job["event"], job["has_alert"]
+    context = get_job_context(job)
 
     with metrics.timer("post_process.process_service_hooks.duration"):
-        if features.has("projects:servicehooks", project=event.project):
+        if context.has_feature("projects:servicehooks"):
             allowed_events = {"event.created"}
             if has_alert:
                 allowed_events.add("event.alert")
 
             if allowed_events:
-                for servicehook_id, events in _get_service_hooks(project_id=event.project_id):
+                for servicehook_id, events in context.get_service_hooks():
                     if any(e in allowed_events for e in events):
                         process_service_hook.delay(servicehook_id=servicehook_id, event=event)
 
@@ -926,7 +1278,10 @@ def process_resource_change_bounds(job: PostProcessJob) -> None:
     event, is_new = job["event"], job["group_state"]["is_new"]
 
     with metrics.timer("post_process.process_resource_change_bounds.duration"):
-        if event.get_event_type() == "error" and _should_send_error_created_hooks(event.project):
+        if (
+            event.get_event_type() == "error"
+            and get_job_context(job).should_send_error_created_hooks()
+        ):
             process_resource_change_bound.delay(
                 action="created", sender="Error", instance_id=event.event_id, instance=event
             )
@@ -940,8 +1295,6 @@ def process_plugins(job: PostProcessJob) -> None:
     if job["is_reprocessed"]:
         return
 
-    from sentry.plugins.base import plugins
-
     with metrics.timer("post_process.process_plugins.duration"):
         event, is_new, is_regression = (
             job["event"],
@@ -949,7 +1302,7 @@ def process_plugins(job: PostProcessJob) -> None:
             job["group_state"]["is_regression"],
         )
 
-        for plugin in plugins.for_project(event.project):
+        for plugin in get_job_context(job).get_plugins():
             plugin_post_process_group(
                 plugin_slug=plugin.slug, event=event, is_new=is_new, is_regresion=is_regression
             )
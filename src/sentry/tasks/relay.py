@@ -7,7 +7,7 @@ from django.db import transaction
 from sentry.models.organization import Organization
 from sentry.relay import projectconfig_cache, projectconfig_debounce_cache
 from sentry.tasks.base import instrumented_task
-from sentry.utils import metrics
+from sentry.utils import json, metrics
 from sentry.utils.sdk import set_current_event_project
 
 logger = logging.getLogger(__name__)
@@ -107,12 +107,17 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     You must only provide one single argument, not all.
 
     :returns: A dict mapping all affected public keys to their config.  The dict will not
-       contain keys which should be retained in the cache unchanged.
+       contain keys which should be retained in the cache unchanged, including keys whose
+       recomputed config is equal to the cached one.
     """
     from sentry.models import Project, ProjectKey
+    from sentry.relay.config import ProjectConfigSections
 
     validate_args(organization_id, project_id, public_key)
     configs = {}
+    # All configs computed by this call share the sections of the organization and
+    # projects they belong to, so that those are computed only once.
+    sections = ProjectConfigSections()
 
     if organization_id:
         # We want to re-compute all projects in an organization, instead of simply
@@ -129,9 +134,9 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
                     # If we find the config in the cache it means it was active.  As such we want to
                     # recalculate it.  If the config was not there at all, we leave it and avoid the
                     # cost of re-computation.
-                    if projectconfig_cache.get(key.public_key) is not None:
-                        configs[key.public_key] = compute_projectkey_config(key)
-                        action = "recompute"
+                    cached = projectconfig_cache.get(key.public_key)
+                    if cached is not None:
+                        action = _recompute_cached_config(configs, key, cached, sections)
                     else:
                         action = "not-cached"
                     metrics.incr(
@@ -145,15 +150,15 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
                 # If we find the config in the cache it means it was active.  As such we want to
                 # recalculate it.  If the config was not there at all, we leave it and avoid the
                 # cost of re-computation.
-                if projectconfig_cache.get(key.public_key) is not None:
-                    configs[key.public_key] = compute_projectkey_config(key)
-                    action = "recompute"
+                cached = projectconfig_cache.get(key.public_key)
+                if cached is not None:
+                    action = _recompute_cached_config(configs, key, cached, sections)
                 else:
                     action = "not-cached"
-                    metrics.incr(
-                        "relay.projectconfig_cache.invalidation.recompute",
-                        tags={"action": action, "scope": "project"},
-                    )
+                metrics.incr(
+                    "relay.projectconfig_cache.invalidation.recompute",
+                    tags={"action": action, "scope": "project"},
+                )
     elif public_key:
         try:
             key = ProjectKey.objects.get(public_key=public_key)
@@ -173,12 +178,68 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     else:
         raise TypeError("One of the arguments must not be None")
 
+    if sections.computed or sections.reused:
+        metrics.incr(
+            "relay.projectconfig_cache.sections",
+            amount=sections.computed,
+            tags={"action": "computed"},
+        )
+        metrics.incr(
+            "relay.projectconfig_cache.sections", amount=sections.reused, tags={"action": "reused"}
+        )
+
     return configs
 
 
-def compute_projectkey_config(key):
+#: Fields of a project config which change on every computation, even if nothing else does.
+VOLATILE_CONFIG_FIELDS = ("lastFetch",)
+
+#: Fields of a project config which are made up on every computation while the project has no
+#: stored revision, see :meth:`sentry.models.Project.update_rev_for_option`.
+UNREVISIONED_CONFIG_FIELDS = ("rev", "lastChange")
+
+
+def _recompute_cached_config(configs, key, cached, sections):
+    """Recomputes the cached config of ``key`` and adds it to ``configs`` if it changed.
+
+    :returns: The action to record in metrics, ``"recompute"`` or ``"unchanged"``.
+    """
+    config = compute_projectkey_config(key, sections=sections)
+
+    ignored_fields = VOLATILE_CONFIG_FIELDS
+    if key.project.get_option("sentry:relay-rev") is None:
+        ignored_fields += UNREVISIONED_CONFIG_FIELDS
+
+    if _is_config_unchanged(cached, config, ignored_fields):
+        return "unchanged"
+
+    configs[key.public_key] = config
+    return "recompute"
+
+
+def _is_config_unchanged(cached, config, ignored_fields=VOLATILE_CONFIG_FIELDS):
+    """Returns whether ``config`` serializes to the ``cached`` config.
+
+    Fields in ``ignored_fields`` are not compared, so that the cache is not rewritten only to
+    update them.
+    """
+    if not isinstance(cached, dict):
+        return False
+
+    # Normalize through the serializer of the cache, which for instance turns
+    # datetimes into strings and tuples into lists.
+    config = json.loads(json.dumps(config))
+    for field in ignored_fields:
+        config.pop(field, None)
+    cached = {k: v for k, v in cached.items() if k not in ignored_fields}
+    return config == cached
+
+
+def compute_projectkey_config(key, sections=None):
     """Computes a single config for the given :class:`ProjectKey`.
 
+    :param sections: The :class:`sentry.relay.config.ProjectConfigSections` shared with the
+        other configs computed at the same time, if any.
     :returns: A dict with the project config.
     """
     from sentry.models import ProjectKeyStatus
@@ -187,7 +248,9 @@ def compute_projectkey_config(key):
     if key.status != ProjectKeyStatus.ACTIVE:
         return {"disabled": True}
     else:
-        return get_project_config(key.project, project_keys=[key], full_config=True).to_dict()
+        return get_project_config(
+            key.project, project_keys=[key], full_config=True, sections=sections
+        ).to_dict()
 
 
 @instrumented_task(
@@ -27,6 +27,20 @@ requires_snuba = pytest.mark.skipif(
 )
 
 
+def pytest_benchmark_is_available():
+    try:
+        import pytest_benchmark  # NOQA
+    except ModuleNotFoundError:
+        return False
+    else:
+        return True
+
+
+requires_pytest_benchmark = pytest.mark.skipif(
+    not pytest_benchmark_is_available(), reason="requires pytest-benchmark"
+)
+
+
 def is_arm64():
     return os.uname().machine == "arm64"
 
@@ -0,0 +1,330 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.utils import timezone
+
+from sentry.tsdb.base import BaseTSDB
+from sentry.utils import metrics
+from sentry.utils.imports import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class _Pending:
+    """
+    Writes accumulated since the last flush, keyed by everything that
+    identifies the rows they end up in. ``buckets`` is the tuple of rollup
+    epochs of the write's timestamp, so all writes sharing a key are written
+    to the same rows of every rollup, regardless of their exact timestamp.
+    """
+
+    def __init__(self):
+        # (model, key, environment_id, buckets) -> [timestamp, count]
+        self.counters = {}
+        # (environment_id, buckets) -> (timestamp, {(model, key): set(values)})
+        self.sets = {}
+        # (environment_id, buckets) -> (timestamp, {model: {key: Counter}})
+        self.frequencies = {}
+        # number of distinct rows (or set/frequency members) pending
+        self.size = 0
+        # number of writes accumulated
+        self.writes = 0
+
+
+class CoalescingTSDB(BaseTSDB):
+    """
+    A TSDB backend that accumulates counter increments, distinct counter
+    values and frequency table scores in memory and writes them to another
+    backend in merged batches.
+
+    Writes are flushed at least every ``flush_interval`` seconds by a
+    background thread, whenever more than ``max_pending`` distinct rows are
+    pending, and when the process exits. All other writes (merges and
+    deletions) flush pending writes first so they are applied in order.
+    Reads are passed through and do not see pending writes, so they may lag
+    up to ``flush_interval`` behind.
+
+    Writes that fail to be flushed are dropped and counted in the
+    ``tsdb.coalescing.dropped`` metric.
+
+    >>> CoalescingTSDB(
+    ...     backend="sentry.tsdb.redis.RedisTSDB",
+    ...     backend_options={"cluster": "tsdb"},
+    ...     flush_interval=1.0,
+    ... )
+    """
+
+    def __init__(
+        self,
+        backend="sentry.tsdb.redis.RedisTSDB",
+        backend_options=None,
+        flush_interval=1.0,
+        max_pending=10000,
+        **options,
+    ):
+        super().__init__(**options)
+        self.backend = import_string(backend)(**(backend_options or {}))
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+
+        self.__pending = _Pending()
+        self.__lock = threading.Lock()
+        self.__worker_pid = None
+
+        atexit.register(self.flush_pending)
+
+    def __ensure_worker(self):
+        pid = os.getpid()
+        if self.__worker_pid == pid:
+            return
+
+        with self.__lock:
+            if self.__worker_pid == pid:
+                return
+
+            if self.__worker_pid is not None:
+                # Pending writes copied from the parent process are flushed
+                # by the parent.
+                self.__pending = _Pending()
+
+            t = threading.Thread(target=self.__run, name="tsdb-coalescing")
+            t.daemon = True
+            t.start()
+            self.__worker_pid = pid
+
+    def __run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush_pending()
+            except Exception:
+                logger.exception("Failed to flush coalesced TSDB writes")
+
+    def __get_buckets(self, timestamp):
+        return tuple(
+            self.backend.normalize_to_epoch(timestamp, rollup) for rollup in self.backend.rollups
+        )
+
+    def __added(self, pending):
+        pending.writes += 1
+        return pending.size > self.max_pending
+
+    def flush_pending(self):
+        """
+        Writes all pending writes to the backend.
+        """
+        with self.__lock:
+            pending, self.__pending = self.__pending, _Pending()
+
+        if not pending.writes:
+            return
+
+        metrics.incr("tsdb.coalescing.writes", amount=pending.writes, skip_internal=True)
+        metrics.timing("tsdb.coalescing.flush_size", pending.size)
+
+        with metrics.timer("tsdb.coalescing.flush"):
+            self.__flush_counters(pending.counters)
+            self.__flush_sets(pending.sets)
+            self.__flush_frequencies(pending.frequencies)
+
+    def __write(self, kind, size, func, *args, **kwargs):
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            logger.exception("Failed to flush coalesced TSDB writes")
+            metrics.incr(
+                "tsdb.coalescing.dropped", amount=size, tags={"type": kind}, skip_internal=True
+            )
+
+    def __flush_counters(self, counters):
+        items_by_environment = defaultdict(list)
+        for (model, key, environment_id, _), (timestamp, count) in counters.items():
+            items_by_environment[environment_id].append(
+                (model, key, {"timestamp": timestamp, "count": count})
+            )
+
+        for environment_id, items in items_by_environment.items():
+            self.__write(
+                "counter",
+                len(items),
+                self.backend.incr_multi,
+                items,
+                environment_id=environment_id,
+            )
+
+    def __flush_sets(self, sets):
+        for (environment_id, _), (timestamp, values_by_key) in sets.items():
+            self.__write(
+                "set",
+                sum(len(values) for values in values_by_key.values()),
+                self.backend.record_multi,
+                [(model, key, values) for (model, key), values in values_by_key.items()],
+                timestamp=timestamp,
+                environment_id=environment_id,
+            )
+
+    def __flush_frequencies(self, frequencies):
+        for (environment_id, _), (timestamp, requests) in frequencies.items():
+            self.__write(
+                "frequency",
+                sum(len(items) for request in requests.values() for items in request.values()),
+                self.backend.record_frequency_multi,
+                [
+                    (model, {key: dict(items) for key, items in request.items()})
+                    for model, request in requests.items()
+                ],
+                timestamp=timestamp,
+                environment_id=environment_id,
+            )
+
+    def incr(self, model, key, timestamp=None, count=1, environment_id=None):
+        self.incr_multi([(model, key)], timestamp, count, environment_id)
+
+    def incr_multi(self, items, timestamp=None, count=1, environment_id=None):
+        self.validate_arguments([item[0] for item in items], [environment_id])
+        self.__ensure_worker()
+
+        if timestamp is None:
+            timestamp = timezone.now()
+
+        should_flush = False
+        with self.__lock:
+            pending = self.__pending
+            for item in items:
+                if len(item) == 2:
+                    model, key = item
+                    options = {}
+                else:
+                    model, key, options = item
+
+                item_timestamp = options.get("timestamp") or timestamp
+                row = (model, key, environment_id, self.__get_buckets(item_timestamp))
+                counter = pending.counters.get(row)
+                if counter is None:
+                    counter = pending.counters[row] = [item_timestamp, 0]
+                    pending.size += 1
+                counter[1] += options.get("count", count)
+                should_flush = self.__added(pending)
+
+        if should_flush:
+            self.flush_pending()
+
+    def record(self, model, key, values, timestamp=None, environment_id=None):
+        self.record_multi([(model, key, values)], timestamp, environment_id)
+
+    def record_multi(self, items, timestamp=None, environment_id=None):
+        self.validate_arguments([model for model, key, values in items], [environment_id])
+        self.__ensure_worker()
+
+        if timestamp is None:
+            timestamp = timezone.now()
+
+        should_flush = False
+        with self.__lock:
+            pending = self.__pending
+            batch = (environment_id, self.__get_buckets(timestamp))
+            if batch not in pending.sets:
+                pending.sets[batch] = (timestamp, defaultdict(set))
+            values_by_key = pending.sets[batch][1]
+
+            for model, key, values in items:
+                existing = values_by_key[(model, key)]
+                size = len(existing)
+                existing.update(values)
+                pending.size += len(existing) - size
+                should_flush = self.__added(pending)
+
+        if should_flush:
+            self.flush_pending()
+
+    def record_frequency_multi(self, requests, timestamp=None, environment_id=None):
+        self.validate_arguments([model for model, request in requests], [environment_id])
+        self.__ensure_worker()
+
+        if timestamp is None:
+            timestamp = timezone.now()
+
+        should_flush = False
+        with self.__lock:
+            pending = self.__pending
+            batch = (environment_id, self.__get_buckets(timestamp))
+            if batch not in pending.frequencies:
+                pending.frequencies[batch] = (timestamp, defaultdict(lambda: defaultdict(Counter)))
+            requests_by_model = pending.frequencies[batch][1]
+
+            for model, request in requests:
+                for key, items in request.items():
+                    existing = requests_by_model[model][key]
+                    size = len(existing)
+                    existing.update(items)
+                    pending.size += len(existing) - size
+                should_flush = self.__added(pending)
+
+        if should_flush:
+            self.flush_pending()
+
+    def merge(self, *args, **kwargs):
+        self.flush_pending()
+        return self.backend.merge(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        self.flush_pending()
+        return self.backend.delete(*args, **kwargs)
+
+    def merge_distinct_counts(self, *args, **kwargs):
+        self.flush_pending()
+        return self.backend.merge_distinct_counts(*args, **kwargs)
+
+    def delete_distinct_counts(self, *args, **kwargs):
+        self.flush_pending()
+        return self.backend.delete_distinct_counts(*args, **kwargs)
+
+    def merge_frequencies(self, *args, **kwargs):
+        self.flush_pending()
+        return self.backend.merge_frequencies(*args, **kwargs)
+
+    def delete_frequencies(self, *args, **kwargs):
+        self.flush_pending()
+        return self.backend.delete_frequencies(*args, **kwargs)
+
+    def flush(self):
+        with self.__lock:
+            self.__pending = _Pending()
+        return self.backend.flush()
+
+    def get_range(self, *args, **kwargs):
+        return self.backend.get_range(*args, **kwargs)
+
+    def get_range_columnar(self, *args, **kwargs):
+        return self.backend.get_range_columnar(*args, **kwargs)
+
+    def get_sums(self, *args, **kwargs):
+        return self.backend.get_sums(*args, **kwargs)
+
+    def get_distinct_counts_series(self, *args, **kwargs):
+        return self.backend.get_distinct_counts_series(*args, **kwargs)
+
+    def get_distinct_counts_series_columnar(self, *args, **kwargs):
+        return self.backend.get_distinct_counts_series_columnar(*args, **kwargs)
+
+    def get_distinct_counts_totals(self, *args, **kwargs):
+        return self.backend.get_distinct_counts_totals(*args, **kwargs)
+
+    def get_distinct_counts_union(self, *args, **kwargs):
+        return self.backend.get_distinct_counts_union(*args, **kwargs)
+
+    def get_most_frequent(self, *args, **kwargs):
+        return self.backend.get_most_frequent(*args, **kwargs)
+
+    def get_most_frequent_series(self, *args, **kwargs):
+        return self.backend.get_most_frequent_series(*args, **kwargs)
+
+    def get_frequency_series(self, *args, **kwargs):
+        return self.backend.get_frequency_series(*args, **kwargs)
+
+    def get_frequency_totals(self, *args, **kwargs):
+        return self.backend.get_frequency_totals(*args, **kwargs)
@@ -2,6 +2,7 @@ import itertools
 import logging
 import random
 import uuid
+from array import array
 from collections import defaultdict, namedtuple
 from functools import reduce
 from hashlib import md5
@@ -12,6 +13,7 @@ from django.utils.encoding import force_bytes
 from pkg_resources import resource_string
 
 from sentry.tsdb.base import BaseTSDB
+from sentry.tsdb.series import ColumnarSeries
 from sentry.utils.compat import crc32
 from sentry.utils.dates import to_datetime, to_timestamp
 from sentry.utils.redis import SentryScript, check_cluster_versions, get_cluster_from_options
@@ -283,6 +285,26 @@ class RedisTSDB(BaseTSDB):
         >>>          start=now - timedelta(days=1),
         >>>          end=now)
         """
+        result = self.get_range_columnar(
+            model, keys, start, end, rollup, environment_ids=environment_ids
+        )
+        if not result.timestamps:
+            return {}
+        return result.to_points()
+
+    def get_range_columnar(
+        self,
+        model,
+        keys,
+        start,
+        end,
+        rollup=None,
+        environment_ids=None,
+        use_cache=False,
+        jitter_value=None,
+        tenant_ids=None,
+        referrer_suffix=None,
+    ):
         # redis backend doesn't support multiple envs
         if environment_ids is not None and len(environment_ids) > 1:
             raise NotImplementedError
@@ -292,6 +314,7 @@ class RedisTSDB(BaseTSDB):
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
         series = [to_datetime(item) for item in series]
+        keys = list(dict.fromkeys(keys))
 
         results = []
         cluster, _ = self.get_cluster(environment_id)
@@ -301,17 +324,38 @@ class RedisTSDB(BaseTSDB):
                     hash_key, hash_field = self.make_counter_key(
                         model, rollup, timestamp, key, environment_id
                     )
-                    results.append(
-                        (to_timestamp(timestamp), key, client.hget(hash_key, hash_field))
-                    )
+                    results.append(client.hget(hash_key, hash_field))
 
-        results_by_key = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count.value or 0)
+        return ColumnarSeries(
+            [to_timestamp(timestamp) for timestamp in series],
+            keys,
+            array("q", [int(promise.value or 0) for promise in results]),
+        )
 
-        for key, points in results_by_key.items():
-            results_by_key[key] = sorted(points.items())
-        return dict(results_by_key)
+    def get_sums(
+        self,
+        model,
+        keys,
+        start,
+        end,
+        rollup=None,
+        environment_id=None,
+        use_cache=False,
+        jitter_value=None,
+        tenant_ids=None,
+        referrer_suffix=None,
+    ):
+        result = self.get_range_columnar(
+            model,
+            keys,
+            start,
+            end,
+            rollup,
+            environment_ids=[environment_id] if environment_id is not None else None,
+        )
+        if not result.timestamps:
+            return {}
+        return result.sums()
 
     def merge(self, model, destination, sources, timestamp=None, environment_ids=None):
         environment_ids = (set(environment_ids) if environment_ids is not None else set()).union(
@@ -423,28 +467,29 @@ class RedisTSDB(BaseTSDB):
         """
         Fetch counts of distinct items for each rollup interval within the range.
         """
+        return self.get_distinct_counts_series_columnar(
+            model, keys, start, end, rollup, environment_id
+        ).to_points()
+
+    def get_distinct_counts_series_columnar(
+        self, model, keys, start, end=None, rollup=None, environment_id=None
+    ):
         self.validate_arguments([model], [environment_id])
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
+        keys = list(dict.fromkeys(keys))
 
-        responses = {}
+        results = []
         cluster, _ = self.get_cluster(environment_id)
         with cluster.fanout() as client:
             for key in keys:
                 c = client.target_key(key)
-                r = responses[key] = []
                 for timestamp in series:
-                    r.append(
-                        (
-                            timestamp,
-                            c.pfcount(self.make_key(model, rollup, timestamp, key, environment_id)),
-                        )
+                    results.append(
+                        c.pfcount(self.make_key(model, rollup, timestamp, key, environment_id))
                     )
 
-        return {
-            key: [(timestamp, promise.value) for timestamp, promise in value]
-            for key, value in responses.items()
-        }
+        return ColumnarSeries(series, keys, array("q", [promise.value for promise in results]))
 
     def get_distinct_counts_totals(
         self,
@@ -25,8 +25,10 @@ def dont_do_this(callargs):
 method_specifications = {
     # method: (type, function(callargs) -> set[model])
     "get_range": (READ, single_model_argument),
+    "get_range_columnar": (READ, single_model_argument),
     "get_sums": (READ, single_model_argument),
     "get_distinct_counts_series": (READ, single_model_argument),
+    "get_distinct_counts_series_columnar": (READ, single_model_argument),
     "get_distinct_counts_totals": (READ, single_model_argument),
     "get_distinct_counts_union": (READ, single_model_argument),
     "get_most_frequent": (READ, single_model_argument),
@@ -0,0 +1,102 @@
+from array import array
+
+
+class ColumnarSeries:
+    """
+    Values of many keys over a shared series of timestamps.
+
+    Instead of a list of ``(timestamp, value)`` tuples per key, the values of
+    all keys are stored in a single flat integer array of
+    ``len(keys) * len(timestamps)`` items, one row per key in the order of
+    ``keys``. The timestamps are shared by all rows.
+
+    ``to_points`` converts to the ``{key: [(timestamp, value), ...]}`` format
+    returned by ``get_range`` and ``get_distinct_counts_series``.
+    """
+
+    __slots__ = ("timestamps", "keys", "values", "_index")
+
+    def __init__(self, timestamps, keys, values=None):
+        self.timestamps = tuple(timestamps)
+        self.keys = list(dict.fromkeys(keys))
+        self._index = {key: idx for idx, key in enumerate(self.keys)}
+
+        size = len(self.keys) * len(self.timestamps)
+        if values is None:
+            values = array("q", bytes(array("q").itemsize * size))
+        elif not isinstance(values, array):
+            values = array("q", values)
+        assert len(values) == size, "values must contain one row per key"
+        self.values = values
+
+    @classmethod
+    def from_mapping(cls, values_by_key):
+        """
+        Builds the series from ``{key: {timestamp: value, ...}, ...}``.
+        Timestamps missing for a key are filled with ``0``.
+        """
+        timestamps = sorted(
+            {timestamp for values in values_by_key.values() for timestamp in values}
+        )
+        return cls(
+            timestamps,
+            values_by_key.keys(),
+            [
+                values.get(timestamp, 0)
+                for values in values_by_key.values()
+                for timestamp in timestamps
+            ],
+        )
+
+    @classmethod
+    def from_points(cls, points_by_key):
+        """
+        Builds the series from ``{key: [(timestamp, value), ...], ...}``.
+        """
+        return cls.from_mapping({key: dict(points) for key, points in points_by_key.items()})
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __eq__(self, other):
+        if not isinstance(other, ColumnarSeries):
+            return NotImplemented
+        return (self.timestamps, self.keys, self.values) == (
+            other.timestamps,
+            other.keys,
+            other.values,
+        )
+
+    def __repr__(self):
+        return f"<{type(self).__name__} keys={len(self.keys)} timestamps={len(self.timestamps)}>"
+
+    def __getitem__(self, key):
+        """
+        Returns the values of ``key``, in the order of ``timestamps``.
+        """
+        width = len(self.timestamps)
+        start = self._index[key] * width
+        return self.values[start : start + width]
+
+    def sums(self):
+        """
+        Returns the sum of values of every key.
+        """
+        width = len(self.timestamps)
+        values = self.values
+        return {
+            key: sum(values[idx * width : (idx + 1) * width]) for idx, key in enumerate(self.keys)
+        }
+
+    def to_points(self):
+        """
+        Returns ``{key: [(timestamp, value), ...], ...}``.
+        """
+        timestamps = self.timestamps
+        return {key: list(zip(timestamps, self[key])) for key in self.keys}
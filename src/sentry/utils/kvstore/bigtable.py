@@ -1,14 +1,17 @@
 import enum
+import itertools
 import logging
 import struct
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import timedelta
 from threading import Lock
-from typing import Any, Iterator, Mapping, Optional, Sequence, Tuple, cast
+from typing import Any, Callable, Iterator, List, Mapping, Optional, Sequence, Set, Tuple, cast
 
 from django.utils import timezone
 from google.api_core import exceptions, retry
 from google.cloud import bigtable
-from google.cloud.bigtable.row import PartialRowData
+from google.cloud.bigtable.row import DirectRow, PartialRowData
 from google.cloud.bigtable.row_set import RowSet
 from google.cloud.bigtable.table import Table
 
@@ -22,6 +25,27 @@ class BigtableError(Exception):
     pass
 
 
+# Upper bound of the threads used by ``get_many`` across all storages of the
+# process. Storages may be instantiated per thread (e.g. by ``NodeStorage``),
+# so they share a single executor rather than creating one each.
+GET_MANY_MAX_WORKERS = 32
+
+_get_many_executor: Optional[ThreadPoolExecutor] = None
+_get_many_executor_lock = Lock()
+
+
+def _get_get_many_executor() -> ThreadPoolExecutor:
+    global _get_many_executor
+
+    if _get_many_executor is None:
+        with _get_many_executor_lock:
+            if _get_many_executor is None:
+                _get_many_executor = ThreadPoolExecutor(
+                    max_workers=GET_MANY_MAX_WORKERS, thread_name_prefix="bigtable-get-many"
+                )
+    return _get_many_executor
+
+
 class BigtableKVStorage(KVStorage[str, bytes]):
     column_family = "x"
 
@@ -66,6 +90,9 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         default_ttl: Optional[timedelta] = None,
         compression: Optional[str] = None,
         app_profile: Optional[str] = None,
+        get_many_concurrency: int = 1,
+        get_many_shard_size: int = 10,
+        get_many_timeout: float = 30.0,
     ) -> None:
         client_options = client_options if client_options is not None else {}
         if "admin" in client_options:
@@ -82,6 +109,16 @@ class BigtableKVStorage(KVStorage[str, bytes]):
         self.compression = compression
         self.app_profile = app_profile
 
+        # When ``get_many_concurrency`` is greater than one, ``get_many``
+        # splits the requested keys into shards of ``get_many_shard_size``
+        # keys, up to ``get_many_concurrency`` of which are read (and
+        # decompressed) in parallel. A call fails if it takes longer than
+        # ``get_many_timeout`` seconds in total.
+        assert get_many_concurrency > 0 and get_many_shard_size > 0
+        self.get_many_concurrency = get_many_concurrency
+        self.get_many_shard_size = get_many_shard_size
+        self.get_many_timeout = get_many_timeout
+
         self.__table: Table
         self.__table_lock = Lock()
 
@@ -119,7 +156,56 @@ class BigtableKVStorage(KVStorage[str, bytes]):
 
         return self.__decode_row(row)
 
-    def get_many(self, keys: Sequence[str]) -> Iterator[Tuple[str, bytes]]:
+    def get_many(
+        self, keys: Sequence[str], decode: Optional[Callable[[bytes], bytes]] = None
+    ) -> Iterator[Tuple[str, bytes]]:
+        """
+        ``decode`` is applied to every value by the thread that read it, so
+        that e.g. decompression runs in parallel as well.
+        """
+        if self.get_many_concurrency == 1 or len(keys) <= self.get_many_shard_size:
+            yield from self._get_many(keys, decode)
+            return
+
+        def read_shard(shard: Sequence[str]) -> List[Tuple[str, bytes]]:
+            return list(self._get_many(shard, decode))
+
+        executor = _get_get_many_executor()
+        keys = list(keys)
+        size = self.get_many_shard_size
+        shards = (keys[i : i + size] for i in range(0, len(keys), size))
+        deadline = time.monotonic() + self.get_many_timeout
+
+        pending: Set[Future[List[Tuple[str, bytes]]]] = {
+            executor.submit(read_shard, shard)
+            for shard in itertools.islice(shards, self.get_many_concurrency)
+        }
+        try:
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=max(deadline - time.monotonic(), 0),
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done:
+                    raise TimeoutError(
+                        f"Reading {len(keys)} rows took longer than {self.get_many_timeout}s"
+                    )
+
+                for future in done:
+                    shard = next(shards, None)
+                    if shard is not None:
+                        pending.add(executor.submit(read_shard, shard))
+                    yield from future.result()
+        finally:
+            # Shards which are not being read yet are dropped when the caller
+            # stops iterating or the read fails.
+            for future in pending:
+                future.cancel()
+
+    def _get_many(
+        self, keys: Sequence[str], decode: Optional[Callable[[bytes], bytes]] = None
+    ) -> Iterator[Tuple[str, bytes]]:
         rows = RowSet()
         for key in keys:
             rows.add_row_key(key)
@@ -131,6 +217,8 @@ class BigtableKVStorage(KVStorage[str, bytes]):
             # value may be returned by ``__decode_row`` if the the row has
             # outlived its TTL, so we need to check its value here.
             if value is not None:
+                if decode is not None:
+                    value = decode(value)
                 yield row.row_key.decode("utf-8"), value
 
     def __decode_row(self, row: PartialRowData) -> Optional[bytes]:
@@ -182,9 +270,41 @@ class BigtableKVStorage(KVStorage[str, bytes]):
             return self._set(key, value, ttl)
 
     def _set(self, key: str, value: bytes, ttl: Optional[timedelta] = None) -> None:
+        row = self.__build_row(self._get_table(), key, value, ttl)
+
+        status = row.commit()
+        if status.code != 0:
+            raise BigtableError(status.code, status.message)
+
+    def set_many(self, items: Sequence[Tuple[str, bytes]], ttl: Optional[timedelta] = None) -> None:
+        try:
+            return self._set_many(items, ttl)
+        except (exceptions.InternalServerError, exceptions.ServiceUnavailable):
+            # Delete cached client before retry, see ``set``.
+            with self.__table_lock:
+                del self.__table
+            return self._set_many(items, ttl)
+
+    def _set_many(
+        self, items: Sequence[Tuple[str, bytes]], ttl: Optional[timedelta] = None
+    ) -> None:
+        table = self._get_table()
+        rows = [self.__build_row(table, key, value, ttl) for key, value in items]
+
+        errors = []
+        for status in table.mutate_rows(rows):
+            if status.code != 0:
+                errors.append(BigtableError(status.code, status.message))
+
+        if errors:
+            raise BigtableError(errors)
+
+    def __build_row(
+        self, table: Table, key: str, value: bytes, ttl: Optional[timedelta] = None
+    ) -> DirectRow:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
         # ``bytes`` but we are providing it with ``str``.
-        row = self._get_table().direct_row(key)
+        row = table.direct_row(key)
 
         # Call to delete is just a state mutation, and in this case is just
         # used to clear all columns so the entire row will be replaced.
@@ -242,9 +362,7 @@ class BigtableKVStorage(KVStorage[str, bytes]):
 
         row.set_cell(self.column_family, self.data_column, value, timestamp=ts)
 
-        status = row.commit()
-        if status.code != 0:
-            raise BigtableError(status.code, status.message)
+        return row
 
     def delete(self, key: str) -> None:
         # XXX: There is a type mismatch here -- ``direct_row`` expects
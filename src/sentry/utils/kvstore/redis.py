@@ -1,5 +1,5 @@
 from datetime import timedelta
-from typing import Optional
+from typing import Iterator, Optional, Sequence, Tuple
 
 from redis import Redis
 
@@ -18,9 +18,25 @@ class RedisKVStorage(KVStorage[str, bytes]):
     def get(self, key: str) -> Optional[bytes]:
         return self.client.get(key.encode("utf8"))
 
+    def get_many(self, keys: Sequence[str]) -> Iterator[Tuple[str, bytes]]:
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.get(key.encode("utf8"))
+            values = pipeline.execute()
+
+        for key, value in zip(keys, values):
+            if value is not None:
+                yield key, value
+
     def set(self, key: str, value: bytes, ttl: Optional[timedelta] = None) -> None:
         self.client.set(key.encode("utf8"), value, ex=ttl)
 
+    def set_many(self, items: Sequence[Tuple[str, bytes]], ttl: Optional[timedelta] = None) -> None:
+        with self.client.pipeline(transaction=False) as pipeline:
+            for key, value in items:
+                pipeline.set(key.encode("utf8"), value, ex=ttl)
+            pipeline.execute()
+
     def delete(self, key: str) -> None:
         self.client.delete(key.encode("utf8"))
 
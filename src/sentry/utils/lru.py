@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable, Dict, Generic, Hashable, Iterable, Mapping, Optional, Tuple, TypeVar
+
+from cachetools import TLRUCache
+
+from sentry.utils import metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+__all__ = ["LRUCache"]
+
+
+class _TLRUCache(TLRUCache):  # type: ignore[type-arg]
+    """
+    ``TLRUCache`` which counts the entries evicted to make room for new ones.
+    """
+
+    evicted = 0
+
+    def popitem(self):  # type: ignore[no-untyped-def]
+        item = super().popitem()
+        self.evicted += 1
+        return item
+
+
+class LRUCache(Generic[K, V]):
+    """
+    A thread-safe, in-process least-recently-used cache bounded by the total
+    size of its values rather than by the number of entries, built on
+    ``cachetools.TLRUCache``.
+
+    ``get_size`` returns the (approximate) size of a value in the same unit as
+    ``max_size``, by default every value counts as ``1``. Values larger than
+    ``max_size`` are never stored. When ``ttl`` is given, entries expire that
+    many seconds after they were set.
+
+    If ``metrics_key`` is set, hits, misses and evictions are reported as
+    ``<metrics_key>.hit``, ``<metrics_key>.miss`` and ``<metrics_key>.evicted``.
+
+    >>> cache = LRUCache(max_size=1024, get_size=len, ttl=60)
+    >>> cache.set("key", b"value")
+    >>> cache.get("key")
+    b'value'
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: Optional[float] = None,
+        get_size: Callable[[V], int] = lambda value: 1,
+        metrics_key: Optional[str] = None,
+        metrics_tags: Optional[Mapping[str, str]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        assert max_size > 0
+        self.max_size = max_size
+        self.ttl = ttl
+        self.get_size = get_size
+        self.metrics_key = metrics_key
+        self.metrics_tags = metrics_tags
+
+        # Entries are stored as ``(value, ttl)`` so that every entry can have
+        # its own time to live.
+        self.__cache = _TLRUCache(
+            maxsize=max_size,
+            ttu=self._get_expiry,
+            timer=clock,
+            getsizeof=lambda entry: get_size(entry[0]),
+        )
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def _get_expiry(key: K, entry: Tuple[V, Optional[float]], now: float) -> float:
+        ttl = entry[1]
+        return now + ttl if ttl is not None else math.inf
+
+    @property
+    def size(self) -> int:
+        with self.__lock:
+            self.__cache.expire()
+            return int(self.__cache.currsize)
+
+    def __len__(self) -> int:
+        with self.__lock:
+            self.__cache.expire()
+            return len(self.__cache)
+
+    def __contains__(self, key: K) -> bool:
+        with self.__lock:
+            return key in self.__cache
+
+    def _record(self, name: str, amount: int) -> None:
+        if self.metrics_key is not None and amount:
+            metrics.incr(
+                f"{self.metrics_key}.{name}",
+                amount=amount,
+                tags=self.metrics_tags,
+                skip_internal=True,
+            )
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        with self.__lock:
+            entry = self.__cache.get(key)
+
+        self._record("hit" if entry is not None else "miss", 1)
+        return entry[0] if entry is not None else default
+
+    def get_many(self, keys: Iterable[K]) -> Dict[K, V]:
+        """
+        Returns a mapping of all keys that were found in the cache.
+        """
+        results = {}
+        misses = 0
+        with self.__lock:
+            for key in keys:
+                entry = self.__cache.get(key)
+                if entry is None:
+                    misses += 1
+                else:
+                    results[key] = entry[0]
+
+        self._record("hit", len(results))
+        self._record("miss", misses)
+        return results
+
+    def set(self, key: K, value: V, ttl: Optional[float] = None) -> None:
+        entry = (value, ttl if ttl is not None else self.ttl)
+
+        with self.__lock:
+            self.__cache.pop(key, None)
+            if self.get_size(value) > self.max_size:
+                return
+
+            self.__cache[key] = entry
+            evicted, self.__cache.evicted = self.__cache.evicted, 0
+
+        self._record("evicted", evicted)
+
+    def set_many(self, items: Mapping[K, V], ttl: Optional[float] = None) -> None:
+        for key, value in items.items():
+            self.set(key, value, ttl=ttl)
+
+    def delete(self, key: K) -> None:
+        with self.__lock:
+            self.__cache.pop(key, None)
+
+    def delete_many(self, keys: Iterable[K]) -> None:
+        with self.__lock:
+            for key in keys:
+                self.__cache.pop(key, None)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__cache.clear()
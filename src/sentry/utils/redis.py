@@ -94,7 +94,7 @@ class _RedisCluster:
         #    in non-cluster mode.
         return config.get("is_redis_cluster", False) or len(config.get("hosts")) == 1
 
-    def factory(self, **config):
+    def factory(self, decode_responses=True, **config):
         # StrictRedisCluster expects a list of { host, port } dicts. Coerce the
         # configuration into the correct format if necessary.
         hosts = config.get("hosts")
@@ -117,7 +117,7 @@ class _RedisCluster:
                     #
                     # https://github.com/Grokzen/redis-py-cluster/blob/73f27edf7ceb4a408b3008ef7d82dac570ab9c6a/rediscluster/nodemanager.py#L385
                     startup_nodes=deepcopy(hosts),
-                    decode_responses=True,
+                    decode_responses=decode_responses,
                     skip_full_coverage_check=True,
                     max_connections=16,
                     max_connections_per_node=True,
@@ -125,7 +125,7 @@ class _RedisCluster:
                 )
             else:
                 host = hosts[0].copy()
-                host["decode_responses"] = True
+                host["decode_responses"] = decode_responses
                 return (
                     import_string(config["client_class"])
                     if "client_class" in config
@@ -141,9 +141,22 @@ class _RedisCluster:
 class ClusterManager:
     def __init__(self, options_manager, cluster_type=_RBCluster):
         self.__clusters = {}
+        self.__binary_clusters = {}
         self.__options_manager = options_manager
         self.__cluster_type = cluster_type()
 
+    def __get_configuration(self, key):
+        # TODO: This would probably be safer with a lock, but I'm not sure
+        # that it's necessary.
+        configuration = self.__options_manager.get("redis.clusters").get(key)
+        if configuration is None:
+            raise KeyError(f"Invalid cluster name: {key}")
+
+        if not self.__cluster_type.supports(configuration):
+            raise KeyError(f"Invalid cluster type, expected: {self.__cluster_type}")
+
+        return configuration
+
     def get(self, key):
         cluster = self.__clusters.get(key)
 
@@ -151,16 +164,25 @@ class ClusterManager:
         # setup/init of lazy objects. The _RedisCluster type will try to
         # connect to the cluster during initialization.
         if cluster is None:
-            # TODO: This would probably be safer with a lock, but I'm not sure
-            # that it's necessary.
-            configuration = self.__options_manager.get("redis.clusters").get(key)
-            if configuration is None:
-                raise KeyError(f"Invalid cluster name: {key}")
+            cluster = self.__clusters[key] = self.__cluster_type.factory(
+                **self.__get_configuration(key)
+            )
 
-            if not self.__cluster_type.supports(configuration):
-                raise KeyError(f"Invalid cluster type, expected: {self.__cluster_type}")
+        return cluster
+
+    def get_binary(self, key):
+        """
+        Returns a client for the cluster which returns ``bytes`` rather than
+        decoding responses to ``str``, for storing binary values. Only
+        supported by ``redis_clusters``.
+        """
+        assert isinstance(self.__cluster_type, _RedisCluster)
+        cluster = self.__binary_clusters.get(key)
 
-            cluster = self.__clusters[key] = self.__cluster_type.factory(**configuration)
+        if cluster is None:
+            cluster = self.__binary_clusters[key] = self.__cluster_type.factory(
+                decode_responses=False, **self.__get_configuration(key)
+            )
 
         return cluster
 
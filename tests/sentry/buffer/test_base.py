@@ -69,3 +69,53 @@ class BufferTest(TestCase):
         self.buf.process(Group, columns, filters, {"last_seen": the_date}, signal_only=True)
         group.refresh_from_db()
         assert group.times_seen == prev_times_seen
+
+    def test_process_batch_coalesces_group_updates(self):
+        group_a = Group.objects.create(project=Project(id=1))
+        group_b = Group.objects.create(project=Project(id=1))
+        the_date = timezone.now() + timedelta(days=5)
+        self.buf.process_batch(
+            [
+                (Group, {"times_seen": 2}, {"pk": group_a.id}, {"last_seen": the_date}, None),
+                (Group, {"times_seen": 5}, {"id": group_b.id}, {}, None),
+            ]
+        )
+        group_a_ = Group.objects.get(id=group_a.id)
+        assert group_a_.times_seen == group_a.times_seen + 2
+        assert group_a_.last_seen == the_date
+        group_b_ = Group.objects.get(id=group_b.id)
+        assert group_b_.times_seen == group_b.times_seen + 5
+        assert group_b_.last_seen == group_b.last_seen
+
+    def test_process_batch_saves_data(self):
+        group_a = Group.objects.create(project=Project(id=1), data={"a": 1})
+        group_b = Group.objects.create(project=Project(id=1))
+        self.buf.process_batch(
+            [
+                (Group, {"times_seen": 1}, {"pk": group_a.id}, {"data": {"b": 2}}, None),
+                (Group, {"times_seen": 1}, {"pk": group_b.id}, {}, None),
+            ]
+        )
+        assert Group.objects.get(id=group_a.id).data == {"b": 2}
+        assert Group.objects.get(id=group_b.id).data == group_b.data
+
+    def test_process_batch_falls_back_to_process(self):
+        columns = {"new_groups": 1}
+        filters = {"project_id": self.project.id, "release_id": self.release.id}
+        self.buf.process_batch([(ReleaseProject, columns, filters, {}, None)])
+        assert ReleaseProject.objects.filter(new_groups=1, **filters).exists()
+
+    @mock.patch("sentry.buffer.base.buffer_incr_complete")
+    def test_process_batch_sends_signal_per_update(self, buffer_incr_complete):
+        group = Group.objects.create(project=Project(id=1))
+        self.buf.process_batch(
+            [(Group, {"times_seen": 1}, {"pk": group.id}, {}, None)],
+        )
+        buffer_incr_complete.send_robust.assert_called_once_with(
+            model=Group,
+            columns={"times_seen": 1},
+            filters={"pk": group.id},
+            extra={},
+            created=False,
+            sender=Group,
+        )
@@ -9,6 +9,7 @@ from freezegun import freeze_time
 from sentry.buffer.redis import RedisBuffer
 from sentry.models import Group, Project
 from sentry.testutils import TestCase
+from sentry.utils import json
 
 
 class RedisBufferTest(TestCase):
@@ -87,6 +88,53 @@ class RedisBufferTest(TestCase):
         self.buf.process("foo")
         process.assert_called_once_with(Group, columns, filters, extra, signal_only)
 
+    @mock.patch("sentry.buffer.base.Buffer.process_batch")
+    def test_process_batch_flush(self, process_batch):
+        self.buf.batch_flush = True
+        client = self.buf.cluster.get_routing_client()
+        for key, pk in (("foo", "1"), ("bar", "2")):
+            client.hmset(
+                key,
+                {
+                    "f": '{"pk": ["i","%s"]}' % pk,
+                    "i+times_seen": "2",
+                    "m": "sentry.models.Group",
+                },
+            )
+            client.zadd("b:p", {key: 1})
+
+        self.buf.process(batch_keys=["foo", "bar", "baz"])
+
+        process_batch.assert_called_once_with(
+            [
+                (Group, {"times_seen": 2}, {"pk": 1}, {}, None),
+                (Group, {"times_seen": 2}, {"pk": 2}, {}, None),
+            ]
+        )
+        assert client.zrange("b:p", 0, -1) == []
+        assert not client.exists("foo", "bar", "l:foo", "l:bar")
+
+    @mock.patch("sentry.buffer.base.Buffer.process_batch")
+    def test_process_batch_flush_skips_locked_keys(self, process_batch):
+        self.buf.batch_flush = True
+        client = self.buf.cluster.get_routing_client()
+        for key, pk in (("foo", "1"), ("bar", "2")):
+            client.hmset(
+                key,
+                {
+                    "f": '{"pk": ["i","%s"]}' % pk,
+                    "i+times_seen": "1",
+                    "m": "sentry.models.Group",
+                },
+            )
+        client.set("l:bar", "1")
+
+        self.buf.process(batch_keys=["foo", "bar"])
+
+        process_batch.assert_called_once_with([(Group, {"times_seen": 1}, {"pk": 1}, {}, None)])
+        assert client.exists("bar")
+        assert client.exists("l:bar")
+
     @freeze_time()
     def test_group_cache_updated(self):
         # Make sure group is stored in the cache and keep track of times_seen at the time
@@ -149,6 +197,34 @@ class RedisBufferTest(TestCase):
         pending = client.zrange("b:p", 0, -1)
         assert pending == [key.encode("utf-8")]
 
+    def test_incr_saves_json_to_redis(self):
+        self.buf.incr_codec = "json"
+        now = datetime(2017, 5, 3, 6, 6, 6, tzinfo=timezone.utc)
+        client = self.buf.cluster.get_routing_client()
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        columns = {"times_seen": 1}
+        filters = {"pk": 1, "project": Project(id=2)}
+        key = self.buf._make_key(model, filters=filters)
+        self.buf.incr(model, columns, filters, extra={"datetime": now, "data": {"type": "default"}})
+        result = client.hgetall(key)
+        result = {force_text(k): v for k, v in result.items()}
+
+        assert json.loads(result.pop("f")) == {"pk": ["i", "1"], "project": ["i", "2"]}
+        assert json.loads(result.pop("e+datetime")) == ["d", "1493791566.000000"]
+        assert json.loads(result.pop("e+data")) == ["j", {"type": "default"}]
+        assert result == {"i+times_seen": b"1", "m": b"unittest.mock.Mock"}
+
+    @mock.patch("sentry.buffer.base.Buffer.process")
+    def test_process_json_round_trip(self, process):
+        self.buf.incr_codec = "json"
+        now = datetime(2017, 5, 3, 6, 6, 6, tzinfo=timezone.utc)
+        extra = {"last_seen": now, "data": {"metadata": {"title": "x"}}, "level": None}
+        self.buf.incr(Group, {"times_seen": 3}, {"id": 1}, extra=extra)
+        key = self.buf._make_key(Group, {"id": 1})
+        self.buf.process(key)
+        process.assert_called_once_with(Group, {"times_seen": 3}, {"id": 1}, extra, None)
+
     @mock.patch("sentry.buffer.redis.RedisBuffer._make_key", mock.Mock(return_value="foo"))
     @mock.patch("sentry.buffer.redis.process_incr")
     @mock.patch("sentry.buffer.redis.process_pending")
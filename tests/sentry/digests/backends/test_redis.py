@@ -151,3 +151,55 @@ class RedisBackendTestCase(TestCase):
 
         with backend.digest("timeline", 0) as records:
             assert len(set(records)) == n
+
+    def test_digest_many(self):
+        backend = RedisBackend()
+
+        records = {f"timeline:{i}": Record(f"record:{i}", "value", time.time()) for i in range(3)}
+        for key, record in records.items():
+            backend.add(key, record)
+
+        keys = list(records) + ["timeline:missing"]
+        with backend.digest_many(keys, minimum_delays={"timeline:0": 0}) as digests:
+            assert digests == {key: [record] for key, record in records.items()}
+
+            # Timelines that are removed from the mapping are not closed.
+            del digests["timeline:2"]
+
+        # The closed timelines are waiting now, and can't be digested again.
+        with backend.digest_many(keys) as digests:
+            assert digests == {"timeline:2": [records["timeline:2"]]}
+
+        with pytest.raises(InvalidState):
+            with backend.digest("timeline:0", 0):
+                pass
+
+    def test_digest_many_unset_minimum_delay(self):
+        backend = RedisBackend()
+
+        record = Record("record:1", "value", time.time())
+        backend.add("timeline", record)
+
+        # Projects without the option pass ``None``, which uses the default delay.
+        with backend.digest_many(["timeline"], minimum_delays={"timeline": None}) as digests:
+            assert digests == {"timeline": [record]}
+
+        with pytest.raises(InvalidState):
+            with backend.digest("timeline", 0):
+                pass
+
+    def test_digest_many_failure(self):
+        backend = RedisBackend()
+
+        record = Record("record:1", "value", time.time())
+        backend.add("timeline", record)
+
+        try:
+            with backend.digest_many(["timeline"]):
+                raise Exception("This causes the digests to not be closed.")
+        except Exception:
+            pass
+
+        # The timeline was not closed and its lock was released.
+        with backend.digest("timeline", 0) as records:
+            assert records == [record]
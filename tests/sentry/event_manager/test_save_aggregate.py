@@ -1,11 +1,16 @@
 import contextlib
 import time
+import uuid
 from threading import Thread
+from unittest import mock
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from sentry.event_manager import _save_aggregate
+from sentry.event_manager import _save_aggregate, _save_aggregate_many
 from sentry.eventstore.models import CalculatedHashes, Event
+from sentry.models import GroupHash
 
 
 @pytest.mark.django_db(transaction=True)
@@ -87,3 +92,80 @@ def test_group_creation_race(monkeypatch, default_project, is_race_free):
         # assert many groups are new
         assert 1 < len({rv.group.id for rv in return_values}) <= CONCURRENCY
         assert 1 < sum(rv.is_new for rv in return_values) <= CONCURRENCY
+
+
+@pytest.mark.django_db
+def test_save_aggregate_many(default_project):
+    def make_job(hashes):
+        event = Event(default_project.id, uuid.uuid4().hex, data={"timestamp": time.time()})
+        return {
+            "event": event,
+            "project_id": default_project.id,
+            "hashes": CalculatedHashes(hashes=hashes, hierarchical_hashes=[], tree_labels=[]),
+            "release": None,
+            "event_metadata": {},
+            "received_timestamp": None,
+            "platform": "python",
+            "logger_name": "",
+            "level": "error",
+            "culprit": "",
+        }
+
+    jobs = [
+        make_job(["a" * 32, "b" * 32]),
+        make_job(["b" * 32]),
+        make_job(["a" * 32]),
+        make_job(["c" * 32]),
+    ]
+
+    with mock.patch("sentry.event_manager.buffer_incr") as buffer_incr, CaptureQueriesContext(
+        connection
+    ) as queries:
+        _save_aggregate_many(jobs, {default_project.id: default_project})
+
+    groups = [job["groups"][0] for job in jobs]
+    assert [group_info.is_new for group_info in groups] == [True, False, False, True]
+    assert groups[0].group.id == groups[1].group.id == groups[2].group.id
+    assert groups[3].group.id != groups[0].group.id
+
+    # the increments of both existing-group events are written at once
+    (call,) = buffer_incr.mock_calls
+    assert call.args[1] == {"times_seen": 2}
+    assert call.args[2] == {"id": groups[0].group.id}
+
+    # GroupHashes are only locked to create the two new groups, the other
+    # events of the batch reuse them
+    locks = [
+        query
+        for query in queries.captured_queries
+        if "sentry_grouphash" in query["sql"] and "FOR UPDATE" in query["sql"]
+    ]
+    assert len(locks) == 2
+
+
+@pytest.mark.django_db
+def test_save_aggregate_grouphashes(default_project):
+    def save_event(hashes):
+        event = Event(default_project.id, uuid.uuid4().hex, data={"timestamp": time.time()})
+        return _save_aggregate(
+            event,
+            hashes=CalculatedHashes(hashes=hashes, hierarchical_hashes=[], tree_labels=[]),
+            release=None,
+            metadata={},
+            received_timestamp=None,
+            level=10,
+            culprit="",
+        )
+
+    first = save_event(["a" * 32, "b" * 32])
+    assert first.is_new
+    assert {gh.hash: gh.group_id for gh in GroupHash.objects.filter(project=default_project)} == {
+        "a" * 32: first.group.id,
+        "b" * 32: first.group.id,
+    }
+
+    # A new hash of an existing group is created and associated with it
+    second = save_event(["b" * 32, "c" * 32])
+    assert not second.is_new
+    assert second.group.id == first.group.id
+    assert GroupHash.objects.get(project=default_project, hash="c" * 32).group_id == first.group.id
@@ -0,0 +1,45 @@
+import zstandard
+
+from sentry.eventstore.processing.base import EventProcessingStore
+from sentry.eventstore.processing.redis import RedisClusterEventProcessingStore
+from sentry.utils.kvstore.memory import MemoryKVStorage
+from sentry.utils.redis import redis_clusters
+
+
+def test_store_many_get_many():
+    store = EventProcessingStore(MemoryKVStorage())
+    events = [{"project": 1, "event_id": f"{i:032x}"} for i in range(3)]
+
+    keys = store.store_many(events)
+    assert keys == [f"e:{event['event_id']}:1" for event in events]
+    assert [store.get(key) for key in keys] == events
+
+    assert store.get_many([*keys, "e:missing:1"]) == dict(zip(keys, events))
+    assert store.get_many(keys, unprocessed=True) == {}
+
+    unprocessed_keys = store.store_many(events[:1], unprocessed=True)
+    assert unprocessed_keys == [f"{keys[0]}:u"]
+    assert store.get_many(keys, unprocessed=True) == {keys[0]: events[0]}
+
+    store.delete_by_key(keys[0])
+    assert store.get_many(keys) == dict(zip(keys[1:], events[1:]))
+    assert store.get_many(keys, unprocessed=True) == {}
+
+
+def test_redis_compression():
+    store = RedisClusterEventProcessingStore(cluster_id="default")
+    compressed_store = RedisClusterEventProcessingStore(cluster_id="default", compress=True)
+    events = [{"project": 1, "event_id": f"{i:032x}"} for i in range(2)]
+
+    # Payloads written before compression was enabled can still be read.
+    keys = store.store_many(events)
+    assert compressed_store.get_many(keys) == dict(zip(keys, events))
+
+    key = compressed_store.store(events[0])
+    assert compressed_store.get(key) == events[0]
+    # Both stores use the same keys.
+    raw = redis_clusters.get_binary("default").get(store.inner.backend.make_key(key))
+    assert zstandard.ZstdDecompressor().decompress(raw)
+
+    compressed_store.delete_by_key(key)
+    assert compressed_store.get(key) is None
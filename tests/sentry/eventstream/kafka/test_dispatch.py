@@ -4,9 +4,12 @@ from unittest.mock import Mock, patch
 
 import pytest
 from arroyo.backends.kafka import KafkaPayload
-from arroyo.types import BrokerValue, Message, Partition, Topic
+from arroyo.types import BrokerValue, Message, Partition, Topic, Value
 
-from sentry.eventstream.kafka.dispatch import _get_task_kwargs_and_dispatch
+from sentry.eventstream.kafka.dispatch import (
+    _get_task_kwargs_and_dispatch,
+    _get_task_kwargs_and_dispatch_batch,
+)
 from sentry.utils import json
 
 
@@ -127,3 +130,37 @@ def test_dispatch_task_with_occurrence(mock_post_process_group: Mock) -> None:
         },
         "queue": "post_process_issue_platform",
     }
+
+
+@pytest.mark.django_db
+@patch("sentry.tasks.post_process.post_process_group_batch.apply_async")
+def test_dispatch_batch(mock_post_process_group_batch: Mock) -> None:
+    partition = Partition(Topic("test"), 0)
+
+    _get_task_kwargs_and_dispatch_batch(
+        Message(
+            Value(
+                [get_kafka_payload(), get_occurrence_kafka_payload(), get_kafka_payload()],
+                {partition: 4},
+            )
+        )
+    )
+
+    # One batch per project, keeping the order of the events
+    assert mock_post_process_group_batch.call_count == 2
+    batches = {
+        call.kwargs["queue"]: call.kwargs["kwargs"]["tasks"]
+        for call in mock_post_process_group_batch.call_args_list
+    }
+    assert [task["cache_key"] for task in batches["post_process_errors"]] == [
+        "e:fe0ee9a2bc3b415497bad68aaf70dc7f:1",
+        "e:fe0ee9a2bc3b415497bad68aaf70dc7f:1",
+    ]
+    assert [task["occurrence_id"] for task in batches["post_process_issue_platform"]] == [
+        "0c6d75ac396941e0bc4b33c2ff7f3657"
+    ]
+    # Batches are numbered per project in the order they are dispatched in
+    sequences = [
+        call.kwargs["kwargs"]["sequence"] for call in mock_post_process_group_batch.call_args_list
+    ]
+    assert all(isinstance(sequence, int) for sequence in sequences)
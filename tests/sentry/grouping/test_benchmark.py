@@ -1,22 +1,18 @@
+import copy
+
 import pytest
 
 from sentry.grouping.api import get_default_grouping_config_dict
+from sentry.grouping.enhancer import Enhancements
 from sentry.grouping.strategies.configurations import CONFIGURATIONS
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils.safe import get_path
 from tests.sentry.grouping import grouping_input as grouping_inputs
 
 CONFIGS = {key: get_default_grouping_config_dict(key) for key in sorted(CONFIGURATIONS.keys())}
 
 
-def benchmark_available():
-    try:
-        import pytest_benchmark  # NOQA
-    except ModuleNotFoundError:
-        return False
-    else:
-        return True
-
-
-@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@requires_pytest_benchmark
 @pytest.mark.parametrize(
     "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
 )
@@ -37,3 +33,32 @@ def run_configuration(grouping_input, config):
     event.project = None
 
     event.get_hashes()
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize(
+    "config_name", sorted(CONFIGURATIONS.keys()), ids=lambda x: x.replace("-", "_")
+)
+def test_benchmark_enhancements(config_name, benchmark):
+    enhancements = Enhancements.loads(CONFIGS[config_name]["enhancements"])
+    frames = [
+        frame
+        for grouping_input in grouping_inputs
+        for frame in _iter_frames(grouping_input.data)
+        if isinstance(frame, dict)
+    ]
+
+    def setup():
+        return (enhancements, copy.deepcopy(frames)), {}
+
+    benchmark.pedantic(run_enhancements, setup=setup, rounds=10)
+
+
+def _iter_frames(data):
+    for exception in get_path(data, "exception", "values", filter=True) or ():
+        yield from get_path(exception, "stacktrace", "frames", filter=True) or ()
+    yield from get_path(data, "stacktrace", "frames", filter=True) or ()
+
+
+def run_enhancements(enhancements, frames):
+    enhancements.apply_modifications_to_frame(frames, "native", None)
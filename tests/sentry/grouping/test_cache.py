@@ -0,0 +1,85 @@
+from unittest import mock
+
+import pytest
+
+from sentry.grouping.api import get_default_grouping_config_dict
+from sentry.grouping.cache import get_cached_hashes, get_hash_cache_key
+from sentry.grouping.result import CalculatedHashes
+from sentry.testutils.helpers.options import override_options
+from sentry.utils.lru import LRUCache
+
+CONFIG = get_default_grouping_config_dict()
+
+EVENT_DATA = {
+    "platform": "python",
+    "exception": {
+        "values": [
+            {
+                "type": "ValueError",
+                "value": "bad",
+                "stacktrace": {"frames": [{"function": "main"}, {"function": "foo"}]},
+            }
+        ]
+    },
+}
+
+
+@pytest.fixture
+def hash_cache():
+    cache = LRUCache(max_size=1024, get_size=len)
+    with mock.patch("sentry.grouping.cache._hash_cache", cache):
+        yield cache
+
+
+def _hashes(hash_):
+    return CalculatedHashes(hashes=[hash_], hierarchical_hashes=[], tree_labels=[])
+
+
+def test_cache_key():
+    key = get_hash_cache_key(1, CONFIG, EVENT_DATA)
+    assert key is not None
+    assert get_hash_cache_key(1, CONFIG, dict(EVENT_DATA, event_id="a" * 32)) == key
+    assert get_hash_cache_key(1, CONFIG, dict(EVENT_DATA, fingerprint=["{{ default }}"])) == key
+
+    assert get_hash_cache_key(2, CONFIG, EVENT_DATA) != key
+    assert get_hash_cache_key(1, dict(CONFIG, enhancements="x"), EVENT_DATA) != key
+    assert get_hash_cache_key(1, CONFIG, dict(EVENT_DATA, platform="native")) != key
+    assert get_hash_cache_key(1, CONFIG, dict(EVENT_DATA, exception={"values": []})) != key
+
+    assert get_hash_cache_key(1, CONFIG, dict(EVENT_DATA, fingerprint=["foo"])) is None
+    assert get_hash_cache_key(1, CONFIG, dict(EVENT_DATA, checksum="a" * 32)) is None
+
+
+def test_cached_hashes(hash_cache):
+    calculate = mock.Mock(return_value=_hashes("a" * 32))
+
+    assert get_cached_hashes(lambda: "key", calculate) == _hashes("a" * 32)
+    assert get_cached_hashes(lambda: "key", calculate) == _hashes("a" * 32)
+    assert calculate.call_count == 1
+
+    assert get_cached_hashes(lambda: None, calculate) == _hashes("a" * 32)
+    assert calculate.call_count == 2
+
+
+def test_cached_hashes_disabled():
+    calculate = mock.Mock(return_value=_hashes("a" * 32))
+
+    get_cache_key = mock.Mock(return_value="key")
+
+    with mock.patch("sentry.grouping.cache._hash_cache", None):
+        get_cached_hashes(get_cache_key, calculate)
+        get_cached_hashes(get_cache_key, calculate)
+
+    assert calculate.call_count == 2
+    # The key is not even built while the cache is disabled.
+    assert get_cache_key.call_count == 0
+
+
+@override_options({"store.grouping-hash-cache-verify-sample-rate": 1.0})
+def test_cached_hashes_verify(hash_cache):
+    get_cached_hashes(lambda: "key", lambda: _hashes("a" * 32))
+
+    # A mismatch returns and stores the freshly calculated hashes
+    assert get_cached_hashes(lambda: "key", lambda: _hashes("b" * 32)) == _hashes("b" * 32)
+    with override_options({"store.grouping-hash-cache-verify-sample-rate": 0.0}):
+        assert get_cached_hashes(lambda: "key", lambda: _hashes("c" * 32)) == _hashes("b" * 32)
@@ -442,3 +442,26 @@ def test_app_no_matches(frame):
     enhancements = Enhancements.from_config_string("app:no +app")
     enhancements.apply_modifications_to_frame([frame], "native", None)
     assert frame.get("in_app")
+
+
+def test_matchers_see_modifications_of_earlier_rules():
+    enhancements = Enhancements.from_config_string(
+        """
+        function:foo +app
+        app:yes function:foo category=bar
+        category:bar -app
+    """
+    )
+
+    frames = [{"function": "foo"}, {"function": "baz"}]
+    enhancements.apply_modifications_to_frame(frames, "native", None)
+    assert frames[0]["in_app"] is False
+    assert frames[0]["data"]["category"] == "bar"
+    assert "in_app" not in frames[1]
+
+
+def test_family_prefilter():
+    (rule,) = Enhancements.from_config_string("family:javascript function:foo -app").rules
+
+    assert rule.may_match_families({b"javascript", b"native"})
+    assert not rule.may_match_families({b"native"})
@@ -11,6 +11,7 @@ from sentry.event_manager import EventManager
 from sentry.ingest.ingest_consumer import (
     process_attachment_chunk,
     process_event,
+    process_event_batch,
     process_individual_attachment,
     process_userreport,
 )
@@ -81,6 +82,31 @@ def test_deduplication_works(default_project, task_runner, preprocess_event):
     }
 
 
+@pytest.mark.django_db
+def test_event_batch(default_project, task_runner, preprocess_event):
+    payloads = [
+        get_normalized_event({"message": f"hello world {i}"}, default_project) for i in range(3)
+    ]
+    messages = [
+        {
+            "payload": json.dumps(payload),
+            "start_time": time.time() - 3600,
+            "event_id": payload["event_id"],
+            "project_id": default_project.id,
+            "remote_addr": "127.0.0.1",
+        }
+        for payload in payloads
+    ]
+
+    # Duplicates within the batch are only processed once
+    process_event_batch([*messages, messages[0]], projects={default_project.id: default_project})
+
+    assert [kwargs["data"] for kwargs in preprocess_event] == payloads
+    assert [kwargs["cache_key"] for kwargs in preprocess_event] == [
+        f"e:{payload['event_id']}:{default_project.id}" for payload in payloads
+    ]
+
+
 @pytest.mark.django_db
 def test_transactions_spawn_save_event_transaction(
     default_project,
@@ -0,0 +1,148 @@
+import time
+from datetime import datetime
+from typing import Iterator, Sequence
+
+import msgpack
+import pytest
+from arroyo.backends.kafka import KafkaPayload
+from arroyo.types import BrokerValue, Message, Partition, Topic, Value
+
+from sentry.event_manager import EventManager
+from sentry.eventstore.processing import event_processing_store
+from sentry.ingest.parallel import finish_message, process_message
+from sentry.models import EventAttachment, File
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.utils import json
+from sentry.utils.cache import cache
+
+
+@pytest.fixture
+def preprocess_event(monkeypatch):
+    calls = []
+
+    def inner(**kwargs):
+        calls.append(kwargs)
+
+    monkeypatch.setattr("sentry.ingest.ingest_consumer.preprocess_event", inner)
+    return calls
+
+
+def get_event_message(project, attachments=()):
+    mgr = EventManager({"message": "hello world"}, project=project)
+    mgr.normalize()
+    payload = dict(mgr.get_data())
+
+    return {
+        "type": "event",
+        "payload": json.dumps(payload),
+        "start_time": time.time() - 3600,
+        "event_id": payload["event_id"],
+        "project_id": project.id,
+        "remote_addr": "127.0.0.1",
+        "attachments": list(attachments),
+    }
+
+
+def make_message(value: dict, offset: int) -> Message[KafkaPayload]:
+    payload = KafkaPayload(None, msgpack.packb(value), [])
+    return Message(
+        BrokerValue(payload, Partition(Topic("ingest-events"), 0), offset, datetime.now())
+    )
+
+
+def consume(messages: Sequence[Message[KafkaPayload]]) -> None:
+    # The parallel step keeps the order of messages, so processing them one
+    # after the other is equivalent to running the strategy.
+    for message in messages:
+        finish_message(Message(Value(process_message(message), message.committable)))
+
+
+@pytest.mark.django_db
+def test_event(default_project, preprocess_event):
+    value = get_event_message(default_project)
+
+    consume([make_message(value, 0)])
+
+    (kwargs,) = preprocess_event
+    assert kwargs["cache_key"] == f"e:{value['event_id']}:{default_project.id}"
+    assert kwargs["data"] == json.loads(value["payload"])
+    assert event_processing_store.get(kwargs["cache_key"]) == kwargs["data"]
+
+
+@pytest.mark.django_db
+def test_event_with_attachments(default_project, task_runner, monkeypatch, django_cache):
+    monkeypatch.setattr("sentry.features.has", lambda *a, **kw: True)
+    attachment_id = "ca90fb45-6dd9-40a0-a18f-8693aa621abb"
+    event = get_event_message(
+        default_project,
+        attachments=[
+            {
+                "id": attachment_id,
+                "name": "lol.txt",
+                "content_type": "text/plain",
+                "attachment_type": "custom.attachment",
+                "chunks": 2,
+            }
+        ],
+    )
+    chunks = [
+        {
+            "type": "attachment_chunk",
+            "payload": chunk,
+            "event_id": event["event_id"],
+            "project_id": default_project.id,
+            "id": attachment_id,
+            "chunk_index": index,
+        }
+        for index, chunk in enumerate([b"Hello ", b"World!"])
+    ]
+
+    with task_runner():
+        consume([make_message(value, offset) for offset, value in enumerate([*chunks, event])])
+
+    (attachment,) = EventAttachment.objects.filter(
+        project_id=default_project.id, event_id=event["event_id"]
+    )
+    file = File.objects.get(id=attachment.file_id)
+    assert file.getfile().read() == b"Hello World!"
+
+
+@pytest.mark.django_db
+def test_unknown_message_type(default_project):
+    with pytest.raises(ValueError):
+        process_message(make_message({"type": "foo", "project_id": default_project.id}, 0))
+
+
+def record_messages(path, values) -> None:
+    with open(path, "wb") as f:
+        for value in values:
+            f.write(msgpack.packb(msgpack.packb(value)))
+
+
+def replay_messages(path) -> Iterator[Message[KafkaPayload]]:
+    with open(path, "rb") as f:
+        for offset, value in enumerate(msgpack.Unpacker(f)):
+            yield Message(
+                BrokerValue(
+                    KafkaPayload(None, value, []),
+                    Partition(Topic("ingest-events"), 0),
+                    offset,
+                    datetime.now(),
+                )
+            )
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+def test_benchmark_replay(default_project, preprocess_event, benchmark, tmp_path):
+    path = tmp_path / "ingest-events.msgpack"
+    values = [get_event_message(default_project) for _ in range(200)]
+    record_messages(path, values)
+
+    def reset_deduplication():
+        cache.delete_many([f"ev:{v['project_id']}:{v['event_id']}" for v in values])
+
+    benchmark.pedantic(
+        lambda: consume(list(replay_messages(path))), setup=reset_deduplication, rounds=10
+    )
+    assert len(preprocess_event) == 10 * len(values)
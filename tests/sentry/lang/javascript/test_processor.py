@@ -1,15 +1,19 @@
 import errno
 import re
+import threading
 import unittest
 import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from io import BytesIO
-from time import time
+from time import sleep, time
 from unittest.mock import ANY, MagicMock, call, patch
 from uuid import uuid4
 
 import pytest
 import responses
+from django.test import override_settings
 from requests.exceptions import RequestException
 from sentry_relay.processing import StoreNormalizer
 
@@ -54,6 +58,7 @@ from sentry.testutils import TestCase
 from sentry.testutils.helpers.features import with_feature
 from sentry.testutils.helpers.options import override_options
 from sentry.utils import json
+from sentry.utils.lru import LRUCache
 from sentry.utils.strings import truncatechars
 
 base64_sourcemap = "data:application/json;base64,eyJ2ZXJzaW9uIjozLCJmaWxlIjoiZ2VuZXJhdGVkLmpzIiwic291cmNlcyI6WyIvdGVzdC5qcyJdLCJuYW1lcyI6W10sIm1hcHBpbmdzIjoiO0FBQUEiLCJzb3VyY2VzQ29udGVudCI6WyJjb25zb2xlLmxvZyhcImhlbGxvLCBXb3JsZCFcIikiXX0="
@@ -985,6 +990,91 @@ class FetchByUrlTest(FetchTest):
         assert result is None
         fetch_release_artifact.assert_not_called()
 
+    @responses.activate
+    def test_prefetch(self):
+        for path, status in (("a.js", 200), ("b.js", 200), ("c.js", 404)):
+            responses.add(
+                responses.GET, f"http://example.com/{path}", body=f"// {path}", status=status
+            )
+        urls = ["http://example.com/a.js", "http://example.com/b.js", "http://example.com/c.js"]
+
+        fetcher = Fetcher(self.organization)
+        with patch(
+            "sentry.lang.javascript.processor.get_prefetch_executor",
+            return_value=ThreadPoolExecutor(max_workers=2),
+        ):
+            fetcher.prefetch_by_url(urls + ["/example.js"])
+
+        assert len(responses.calls) == 3
+        assert set(fetcher.prefetched_files) == set(urls)
+
+        assert fetcher.fetch_by_url(urls[0]).body == b"// a.js"
+        assert fetcher.fetch_by_url(urls[1]).body == b"// b.js"
+        with pytest.raises(http.CannotFetch):
+            fetcher.fetch_by_url(urls[2])
+
+        assert len(responses.calls) == 3
+        assert not fetcher.prefetched_files
+
+    @override_settings(SENTRY_JAVASCRIPT_PREFETCH_PER_HOST=1)
+    def test_prefetch_per_host_limit(self):
+        active = Counter()
+        max_active = Counter()
+        lock = threading.Lock()
+
+        def fetch_file(url, **kwargs):
+            host = url.split("/")[2]
+            with lock:
+                active[host] += 1
+                max_active[host] = max(max_active[host], active[host])
+            sleep(0.01)
+            with lock:
+                active[host] -= 1
+            return http.UrlResult(url, {}, b"", 200, None)
+
+        urls = [
+            f"http://{host}/{i}.js" for host in ("a.example.com", "b.example.com") for i in range(4)
+        ]
+        with patch(
+            "sentry.lang.javascript.processor.get_prefetch_executor",
+            return_value=ThreadPoolExecutor(max_workers=8),
+        ), patch("sentry.lang.javascript.processor.http.fetch_file", side_effect=fetch_file):
+            fetcher = Fetcher(self.organization)
+            fetcher.prefetch_by_url(urls)
+
+        assert set(fetcher.prefetched_files) == set(urls)
+        assert max_active == {"a.example.com": 1, "b.example.com": 1}
+
+    @override_settings(SENTRY_JAVASCRIPT_PREFETCH_PER_HOST=1)
+    def test_prefetch_slow_host_does_not_block_others(self):
+        fast_done = threading.Event()
+
+        def fetch_file(url, **kwargs):
+            if url.startswith("http://slow.example.com/"):
+                # Would time out if the queued downloads of the slow host took
+                # up the second worker.
+                assert fast_done.wait(timeout=5)
+            elif url == "http://fast.example.com/3.js":
+                fast_done.set()
+            return http.UrlResult(url, {}, b"", 200, None)
+
+        urls = [
+            f"http://{host}/{i}.js"
+            for host in ("slow.example.com", "fast.example.com")
+            for i in range(4)
+        ]
+        with patch(
+            "sentry.lang.javascript.processor.get_prefetch_executor",
+            return_value=ThreadPoolExecutor(max_workers=2),
+        ), patch("sentry.lang.javascript.processor.http.fetch_file", side_effect=fetch_file):
+            fetcher = Fetcher(self.organization)
+            fetcher.prefetch_by_url(urls)
+
+        assert all(
+            isinstance(result, http.UrlResult) for result in fetcher.prefetched_files.values()
+        )
+        assert set(fetcher.prefetched_files) == set(urls)
+
 
 class FetchByUrlNewTest(FetchTest):
     def test_one_archive_with_release_dist_pair(self):
@@ -2338,6 +2428,27 @@ class FetchSourcemapTest(TestCase):
             )
             processor._fetch_sourcemap_cache_by_url("http://example.com")
 
+    def test_parsed_sourcemap_cache(self):
+        project = self.create_project()
+        lru = LRUCache(max_size=1024 * 1024, get_size=lambda entry: entry[0])
+
+        with patch("sentry.lang.javascript.processor.get_sourcemap_cache_lru", return_value=lru):
+            smap_views = [
+                JavaScriptStacktraceProcessor(
+                    data={}, stacktrace_infos=None, project=project
+                )._fetch_sourcemap_cache_by_url(base64_sourcemap)
+                for _ in range(2)
+            ]
+            # A different minified source is parsed again.
+            other_smap_view = JavaScriptStacktraceProcessor(
+                data={}, stacktrace_infos=None, project=project
+            )._fetch_sourcemap_cache_by_url(base64_sourcemap, source=b"console.log(1)")
+
+        assert smap_views[0] is smap_views[1]
+        assert other_smap_view is not smap_views[0]
+        assert len(lru) == 2
+        assert smap_views[1].lookup(1, 1, 0).src == "/test.js"
+
 
 class TrimLineTest(unittest.TestCase):
     long_line = "The public is more familiar with bad design than good design. It is, in effect, conditioned to prefer bad design, because that is what it lives with. The new becomes threatening, the old reassuring."
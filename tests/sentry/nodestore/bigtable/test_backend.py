@@ -1,4 +1,6 @@
 import os
+import threading
+import time
 from contextlib import contextmanager
 from unittest import mock
 
@@ -6,6 +8,8 @@ import pytest
 from google.rpc.status_pb2 import Status
 
 from sentry.nodestore.bigtable.backend import BigtableKVStorage, BigtableNodeStorage
+from sentry.nodestore.compression import NodeCompressor
+from sentry.testutils.skips import requires_pytest_benchmark
 
 
 class MockedBigtableKVStorage(BigtableKVStorage):
@@ -152,3 +156,101 @@ def test_cache(ns):
         ns.get("node_4")
         ns.get("node_4")
         assert mock_read_row.call_count == 2
+
+
+def test_get_multi_concurrent():
+    ns = MockedBigtableNodeStorage(
+        project="test", compression=True, get_many_concurrency=4, get_many_shard_size=3
+    )
+    # bypass the nodedata cache so that every read hits the table
+    ns.cache = None
+    nodes = {f"{i:032x}": {"foo": i} for i in range(10)}
+    for node_id, data in nodes.items():
+        ns.set(node_id, data)
+
+    table = ns.store._get_table()
+    with mock.patch.object(table, "read_rows", wraps=table.read_rows) as mock_read_rows:
+        assert ns.get_multi(list(nodes) + ["missing"]) == {**nodes, "missing": None}
+        assert mock_read_rows.call_count == 4
+
+
+def test_get_multi_decompresses_concurrently():
+    ns = MockedBigtableNodeStorage(project="test", get_many_concurrency=4, get_many_shard_size=3)
+    ns.cache = None
+    ns.compressor = NodeCompressor(compression="zstd")
+    nodes = {f"{i:032x}": {"foo": i} for i in range(10)}
+    for node_id, data in nodes.items():
+        ns.set(node_id, data)
+
+    threads = set()
+    decompress = ns.compressor.decompress
+
+    def record_thread(data):
+        threads.add(threading.current_thread())
+        return decompress(data)
+
+    with mock.patch.object(ns.compressor, "decompress", side_effect=record_thread):
+        assert ns.get_multi(list(nodes)) == nodes
+
+    # Payloads are decompressed by the threads that read them
+    assert threads and threading.main_thread() not in threads
+
+
+def test_get_many_limits_shards_in_flight():
+    store = MockedBigtableKVStorage(project="test", get_many_concurrency=2, get_many_shard_size=1)
+    keys = [f"{i:032x}" for i in range(6)]
+    for key in keys:
+        store.set(key, b"value")
+
+    table = store._get_table()
+    with mock.patch.object(table, "read_rows", wraps=table.read_rows) as mock_read_rows:
+        rows = store.get_many(keys)
+        next(rows)
+        # Closing the iterator early cancels the shards that were not read yet
+        rows.close()
+    assert mock_read_rows.call_count < len(keys)
+
+
+def test_get_many_timeout():
+    store = MockedBigtableKVStorage(
+        project="test", get_many_concurrency=2, get_many_shard_size=1, get_many_timeout=0.01
+    )
+    keys = [f"{i:032x}" for i in range(4)]
+    for key in keys:
+        store.set(key, b"value")
+
+    table = store._get_table()
+    read_rows = table.read_rows
+
+    def slow_read_rows(*args, **kwargs):
+        time.sleep(0.1)
+        return read_rows(*args, **kwargs)
+
+    with mock.patch.object(table, "read_rows", side_effect=slow_read_rows):
+        with pytest.raises(TimeoutError):
+            list(store.get_many(keys))
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("num_ids", [10, 100, 1000])
+@pytest.mark.parametrize("concurrency", [1, 8])
+def test_benchmark_get_multi(num_ids, concurrency, benchmark):
+    ns = MockedBigtableNodeStorage(
+        project="test", compression="zstd", get_many_concurrency=concurrency
+    )
+    ns.cache = None
+    payload = {"message": "x" * 1024, "frames": [{"lineno": i} for i in range(200)]}
+    node_ids = [f"{i:032x}" for i in range(num_ids)]
+    for node_id in node_ids:
+        ns.set(node_id, payload)
+
+    table = ns.store._get_table()
+    read_rows = table.read_rows
+
+    def slow_read_rows(row_set):
+        # simulate the round trip of a read stream
+        time.sleep(0.005)
+        return read_rows(row_set)
+
+    with mock.patch.object(table, "read_rows", side_effect=slow_read_rows):
+        benchmark(ns.get_multi, node_ids)
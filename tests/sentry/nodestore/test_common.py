@@ -3,11 +3,13 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 `ns` fixture to have it tested.
 """
 from contextlib import nullcontext
+from unittest import mock
 
 import pytest
 
 from sentry.nodestore.django.backend import DjangoNodeStorage
 from sentry.testutils.silo import region_silo_test
+from sentry.utils.lru import LRUCache
 from tests.sentry.nodestore.bigtable.test_backend import (
     MockedBigtableNodeStorage,
     get_temporary_bigtable_nodestorage,
@@ -97,3 +99,34 @@ def test_set_subkeys(ns):
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@region_silo_test(stable=True)
+def test_local_cache(ns):
+    with mock.patch("sentry.nodestore.base._local_cache", LRUCache(max_size=1024, get_size=len)):
+        ns.set_subkeys("node_1", {None: {"foo": "a"}, "other": {"foo": "b"}})
+
+        with mock.patch.object(ns, "_get_bytes") as get_bytes, mock.patch.object(
+            ns, "_get_bytes_multi"
+        ) as get_bytes_multi:
+            assert ns.get("node_1") == {"foo": "a"}
+            assert ns.get("node_1", subkey="other") == {"foo": "b"}
+            assert ns.get_multi(["node_1"]) == {"node_1": {"foo": "a"}}
+            assert not get_bytes.called
+            assert not get_bytes_multi.called
+
+        ns.delete("node_1")
+        assert ns.get("node_1") is None
+
+
+@region_silo_test(stable=True)
+def test_get_subkey_among_many(ns):
+    ns.set_subkeys(
+        "node_1",
+        {None: {"foo": "a"}, "first": {"foo": "b"}, "second": {"foo": "c"}, "third": [1, 2]},
+    )
+    assert ns.get("node_1") == {"foo": "a"}
+    assert ns.get("node_1", subkey="second") == {"foo": "c"}
+    assert ns.get("node_1", subkey="third") == [1, 2]
+    assert ns.get("node_1", subkey="fourth") is None
+    assert ns.get_multi(["node_1"], subkey="first") == {"node_1": {"foo": "b"}}
@@ -0,0 +1,57 @@
+import zlib
+
+import pytest
+import zstandard
+
+from sentry.nodestore.compression import NodeCompressor, load_dictionaries, train_dictionary
+
+
+def make_payloads(platform, count=200):
+    return [
+        (
+            '{"platform":"%s","event_id":"%032x","exception":{"values":[{"type":"Error",'
+            '"value":"Something went wrong %d","stacktrace":{"frames":[{"filename":"app.js",'
+            '"lineno":%d,"function":"handler"}]}}]}}' % (platform, i, i, i)
+        ).encode("utf-8")
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("compression", ["zlib", "zstd"])
+def test_round_trip(compression):
+    compressor = NodeCompressor(compression)
+    payload = make_payloads("python", 1)[0]
+    assert compressor.decompress(compressor.compress(payload)) == payload
+
+
+def test_decodes_legacy_and_uncompressed_payloads():
+    compressor = NodeCompressor("zstd")
+    payload = b'{"foo":"bar"}'
+    assert compressor.decompress(zlib.compress(payload)) == payload
+    assert compressor.decompress(zstandard.ZstdCompressor().compress(payload)) == payload
+    assert compressor.decompress(payload) == payload
+
+
+def test_dictionaries(tmpdir):
+    dictionary = train_dictionary(make_payloads("javascript"), 4096)
+    tmpdir.join("javascript.zdict").write_binary(dictionary.as_bytes())
+    tmpdir.join("README").write("ignored")
+
+    dictionaries = load_dictionaries(str(tmpdir))
+    assert list(dictionaries) == ["javascript"]
+
+    compressor = NodeCompressor("zstd", dictionaries=dictionaries)
+    payload = make_payloads("javascript", 1)[0]
+    compressed = compressor.compress(payload, platform="javascript")
+    assert zstandard.get_frame_parameters(compressed).dict_id == dictionary.dict_id()
+    assert len(compressed) < len(NodeCompressor("zstd").compress(payload))
+    assert compressor.decompress(compressed) == payload
+
+    # Platforms without a dictionary are compressed without one.
+    compressed = compressor.compress(payload, platform="python")
+    assert zstandard.get_frame_parameters(compressed).dict_id == 0
+    assert compressor.decompress(compressed) == payload
+
+    # Payloads compressed with a dictionary we no longer know of can't be read.
+    with pytest.raises(ValueError):
+        NodeCompressor("zstd").decompress(compressor.compress(payload, platform="javascript"))
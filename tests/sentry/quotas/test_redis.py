@@ -6,9 +6,10 @@ import pytest
 
 from sentry.constants import DataCategory
 from sentry.quotas.base import QuotaConfig, QuotaScope
-from sentry.quotas.redis import RedisQuota, is_rate_limited
+from sentry.quotas.redis import RedisQuota, is_rate_limited, lease_quotas
 from sentry.testutils import TestCase
 from sentry.testutils.silo import region_silo_test
+from sentry.testutils.skips import requires_pytest_benchmark
 from sentry.utils.redis import clusters
 
 
@@ -453,3 +454,78 @@ class RedisQuotaTest(TestCase):
         # count for these quotas and None for the others.
         # The ``- 1`` is because we refunded once.
         assert usage == [n - 1 if q.id else None for q in quotas] + [0, 0]
+
+    def test_leased_is_rate_limited(self):
+        timestamp = time.time()
+
+        self.get_project_quota.return_value = (50, 60)
+        self.get_organization_quota.return_value = (1000, 60)
+
+        # Simulate several workers sharing the same quota, with leases of up
+        # to 5 items.
+        workers = [RedisQuota(lease_size=5, lease_ratio=1.0) for _ in range(4)]
+        with mock.patch(
+            "sentry.quotas.redis.lease_quotas", wraps=lease_quotas
+        ) as mock_lease_quotas:
+            accepted = sum(
+                not workers[i % len(workers)]
+                .is_rate_limited(self.project, timestamp=timestamp)
+                .is_limited
+                for i in range(100)
+            )
+
+        # Leases never grant more than the limit, and when handed out round
+        # robin all leased items are used.
+        assert accepted == 50
+        assert mock_lease_quotas.call_count < 100
+
+        quotas = self.quota.get_quotas(self.project)
+        usage = dict(
+            zip(
+                [q.id for q in quotas],
+                self.quota.get_usage(self.project.organization_id, quotas, timestamp=timestamp),
+            )
+        )
+        assert usage["p"] == 50
+        # Leases of the organization quota taken together with the exhausted
+        # project quota are counted, up to one lease per worker.
+        assert 50 <= usage["o"] <= 50 + 5 * len(workers)
+
+        # A refund goes back to the lease of the worker.
+        workers[0].refund(self.project, timestamp=timestamp)
+        assert not workers[0].is_rate_limited(self.project, timestamp=timestamp).is_limited
+        assert workers[1].is_rate_limited(self.project, timestamp=timestamp).is_limited
+
+    def test_leased_returns_unused_items(self):
+        # Start of the current quota window, so both calls are in the same window.
+        shift = self.project.organization_id % 60
+        timestamp = (time.time() - shift) // 60 * 60 + shift
+
+        self.get_project_quota.return_value = (50, 60)
+        self.get_organization_quota.return_value = (1000, 60)
+
+        quota = RedisQuota(lease_size=10, lease_ratio=1.0, lease_ttl=1)
+        assert not quota.is_rate_limited(self.project, timestamp=timestamp).is_limited
+
+        # The lease is expired, its 9 unused items are returned when leasing again.
+        assert not quota.is_rate_limited(self.project, timestamp=timestamp + 1).is_limited
+
+        quotas = self.quota.get_quotas(self.project)
+        usage = dict(
+            zip(
+                [q.id for q in quotas],
+                self.quota.get_usage(self.project.organization_id, quotas, timestamp=timestamp),
+            )
+        )
+        assert usage["p"] == usage["o"] == 11
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("lease_size", [0, 100])
+def test_benchmark_is_rate_limited(default_project, lease_size, benchmark):
+    quota = RedisQuota(lease_size=lease_size)
+    with mock.patch.object(
+        RedisQuota, "get_project_quota", return_value=(10**9, 60)
+    ), mock.patch.object(RedisQuota, "get_organization_quota", return_value=(10**9, 60)):
+        benchmark(quota.is_rate_limited, default_project)
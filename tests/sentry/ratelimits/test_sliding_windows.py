@@ -1,4 +1,9 @@
+from unittest import mock
+
 import pytest
+from sentry_redis_tools.sliding_windows_rate_limiter import (
+    RedisSlidingWindowRateLimiter as ReferenceRedisSlidingWindowRateLimiter,
+)
 
 from sentry.ratelimits.sliding_windows import (
     GrantedQuota,
@@ -71,3 +76,94 @@ def test_basic(limiter):
         )
 
         assert resp == [GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)]
+
+
+def test_batch_partial_grants(limiter):
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=10)]
+    global_quotas = [
+        Quota(window_seconds=10, granularity_seconds=1, limit=15, prefix_override="global")
+    ]
+
+    requests = [
+        RequestedQuota(prefix="foo", requested=6, quotas=quotas),
+        RequestedQuota(prefix="foo", requested=6, quotas=quotas),
+        RequestedQuota(prefix="bar", requested=6, quotas=quotas + global_quotas),
+        RequestedQuota(prefix="baz", requested=6, quotas=quotas + global_quotas),
+        RequestedQuota(prefix="qux", requested=6, quotas=quotas + global_quotas),
+    ]
+
+    # Requests are granted in order, and earlier grants count against later
+    # requests sharing a quota.
+    timestamp, grants = limiter.check_within_quotas(requests, timestamp=TIMESTAMP_OFFSET)
+    assert [grant.granted for grant in grants] == [6, 4, 6, 6, 3]
+    assert grants[1].reached_quotas == quotas
+    assert grants[4].reached_quotas == global_quotas
+
+    assert limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET) == grants
+
+    # Only the granted amounts were consumed.
+    _, grants = limiter.check_within_quotas(requests, timestamp=TIMESTAMP_OFFSET)
+    assert [grant.granted for grant in grants] == [0, 0, 0, 0, 0]
+    _, grants = limiter.check_within_quotas(
+        [RequestedQuota(prefix="quux", requested=6, quotas=quotas)], timestamp=TIMESTAMP_OFFSET
+    )
+    assert [grant.granted for grant in grants] == [6]
+
+
+def test_check_and_use_round_trips(limiter):
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=100)]
+    requests = [RequestedQuota(prefix=f"org-{i}", requested=1, quotas=quotas) for i in range(1000)]
+
+    with mock.patch.object(limiter.client, "pipeline", wraps=limiter.client.pipeline) as pipeline:
+        grants = limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET)
+
+    assert all(grant.granted == 1 for grant in grants)
+    # One pipeline reads the usage, and one consumes the granted amounts.
+    assert pipeline.call_count == 2
+
+
+def test_check_and_use_does_not_consume_rejected(limiter):
+    quotas = [Quota(window_seconds=10, granularity_seconds=1, limit=10)]
+    requests = [RequestedQuota(prefix="foo", requested=20, quotas=quotas)]
+
+    assert limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET) == [
+        GrantedQuota(prefix="foo", granted=10, reached_quotas=quotas)
+    ]
+    # A request that is rejected does not consume anything, not even briefly.
+    with mock.patch.object(limiter.client, "pipeline", wraps=limiter.client.pipeline) as pipeline:
+        assert limiter.check_and_use_quotas(requests, timestamp=TIMESTAMP_OFFSET) == [
+            GrantedQuota(prefix="foo", granted=0, reached_quotas=quotas)
+        ]
+    assert pipeline.call_count == 1
+
+
+def test_matches_sentry_redis_tools(limiter):
+    reference = ReferenceRedisSlidingWindowRateLimiter(limiter.client)
+    quotas = [
+        Quota(window_seconds=10, granularity_seconds=1, limit=7),
+        Quota(window_seconds=30, granularity_seconds=5, limit=15),
+    ]
+
+    # Batches do not contain several requests of the same prefix, since
+    # sentry_redis_tools does not count earlier grants against later requests
+    # of a batch.
+    for timestamp in range(0, 40, 3):
+        for prefixes in (["a", "b"], ["a", "c"], ["b"]):
+            grants = limiter.check_and_use_quotas(
+                [
+                    RequestedQuota(prefix=f"new-{prefix}", requested=2, quotas=quotas)
+                    for prefix in prefixes
+                ],
+                timestamp=TIMESTAMP_OFFSET + timestamp,
+            )
+            reference_grants = reference.check_and_use_quotas(
+                [
+                    RequestedQuota(prefix=f"old-{prefix}", requested=2, quotas=quotas)
+                    for prefix in prefixes
+                ],
+                timestamp=TIMESTAMP_OFFSET + timestamp,
+            )
+
+            assert [(grant.granted, grant.reached_quotas) for grant in grants] == [
+                (grant.granted, grant.reached_quotas) for grant in reference_grants
+            ]
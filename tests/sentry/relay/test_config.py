@@ -18,7 +18,7 @@ from sentry.dynamic_sampling import (
 )
 from sentry.models import ProjectKey, ProjectTeam
 from sentry.models.transaction_threshold import TransactionMetric
-from sentry.relay.config import ProjectConfig, get_project_config
+from sentry.relay.config import ProjectConfig, ProjectConfigSections, get_project_config
 from sentry.testutils.factories import Factories
 from sentry.testutils.helpers import Feature
 from sentry.testutils.helpers.options import override_options
@@ -129,6 +129,50 @@ def test_get_project_config(default_project, insta_snapshot, django_cache, full)
 SOME_EXCEPTION = RuntimeError("foo")
 
 
+@pytest.mark.django_db
+@region_silo_test(stable=True)
+def test_get_project_config_shared_sections(default_project, django_cache):
+    other_project = Factories.create_project(organization=default_project.organization)
+    sections = ProjectConfigSections()
+
+    configs = []
+    counts = []
+    for project in (default_project, default_project, other_project):
+        keys = ProjectKey.objects.filter(project=project)
+        cfg = get_project_config(project, full_config=True, project_keys=keys, sections=sections)
+        configs.append(cfg.to_dict())
+        counts.append((sections.computed, sections.reused))
+
+    (computed, reused), (computed_same, reused_same), (computed_other, reused_other) = counts
+    # The second config of the same project and keys reuses all sections.
+    assert computed > 0 and reused == 0
+    assert computed_same == computed and reused_same == computed
+    # Another project in the same organization reuses the organization's sections.
+    assert computed_other > computed_same and reused_other > reused_same
+
+    # Sections are equal to the ones computed without sharing.
+    for project, cfg in zip((default_project, other_project), configs[1:]):
+        keys = ProjectKey.objects.filter(project=project)
+        expected = get_project_config(project, full_config=True, project_keys=keys).to_dict()
+        assert cfg["config"] == expected["config"]
+
+
+def test_project_config_sections_exception():
+    sections = ProjectConfigSections()
+    function = mock.Mock(side_effect=[SOME_EXCEPTION, "value"])
+
+    get_section = sections.wrap(("project", 1), "section", function)
+    with pytest.raises(RuntimeError):
+        get_section()
+    assert get_section() == "value"
+    assert get_section() == "value"
+    assert sections.get(("project", 2), "section", lambda: "other") == "other"
+
+    assert function.call_count == 2
+    assert sections.computed == 2
+    assert sections.reused == 1
+
+
 @pytest.mark.django_db
 @region_silo_test(stable=True)
 @mock.patch("sentry.relay.config.generate_rules", side_effect=SOME_EXCEPTION)
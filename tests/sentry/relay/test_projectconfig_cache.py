@@ -1,8 +1,10 @@
+import uuid
 from unittest import mock
 
 import pytest
 
 from sentry.relay.projectconfig_cache import redis
+from sentry.testutils.skips import requires_pytest_benchmark
 
 
 def test_delete_count(monkeypatch):
@@ -24,3 +26,86 @@ def test_read_write():
     my_key = "fake-dsn-1"
     cache.set_many({my_key: "my-value"})
     assert cache.get(my_key) == "my-value"
+
+
+def _org_configs(num_keys):
+    # Configs of a large organization share most sections, and configs built together share
+    # the section objects themselves.
+    shared = {
+        "trustedRelays": [],
+        "quotas": [{"id": f"quota-{i}", "limit": i, "window": 60} for i in range(50)],
+        "filterSettings": {
+            "errorMessages": {"patterns": [uuid.uuid4().hex for i in range(50)]},
+        },
+    }
+    return {
+        f"fake-dsn-{i}": {
+            "disabled": False,
+            "projectId": i // 10,
+            "publicKeys": [{"publicKey": f"fake-dsn-{i}", "isEnabled": True}],
+            "config": {**shared, "allowedDomains": [f"project-{i // 10}.example.com"]},
+        }
+        for i in range(num_keys)
+    }
+
+
+def _stored_size(cache):
+    client = cache.cluster
+    return sum(client.strlen(key) for key in client.scan_iter("relayconfig*"))
+
+
+@pytest.mark.django_db
+def test_read_write_dedupe_sections():
+    cache = redis.RedisProjectConfigCache(dedupe_sections=True)
+    configs = _org_configs(20)
+    cache.set_many(configs)
+
+    for public_key, config in configs.items():
+        assert cache.get(public_key) == config
+
+    # All configs share one copy of each large section, small ones are inlined.
+    stored = redis._decode(cache.cluster.get(f"relayconfig:{public_key}"))
+    assert set(stored["$sections"]) == {"quotas", "filterSettings"}
+    assert set(stored["config"]) == {"trustedRelays", "allowedDomains"}
+    assert len(list(cache.cluster.scan_iter("relayconfig-section:*"))) == 2
+
+    # Configs stored without deduplication can still be read.
+    cache.set_many({"fake-dsn-plain": "my-value"})
+    assert cache.get("fake-dsn-plain") == "my-value"
+
+
+@pytest.mark.django_db
+def test_dedupe_sections_missing_section():
+    cache = redis.RedisProjectConfigCache(dedupe_sections=True)
+    configs = _org_configs(2)
+    cache.set_many(configs)
+
+    for key in cache.cluster.scan_iter("relayconfig-section:*"):
+        cache.cluster.delete(key)
+
+    assert cache.get("fake-dsn-0") is None
+
+
+@pytest.mark.django_db
+def test_dedupe_sections_size():
+    configs = _org_configs(1000)
+
+    cache = redis.RedisProjectConfigCache()
+    cache.set_many(configs)
+    size = _stored_size(cache)
+    cache.delete_many(configs)
+
+    cache = redis.RedisProjectConfigCache(dedupe_sections=True)
+    cache.set_many(configs)
+    deduped_size = _stored_size(cache)
+
+    assert deduped_size < size / 4
+
+
+@requires_pytest_benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("dedupe_sections", [False, True])
+def test_benchmark_get(dedupe_sections, benchmark):
+    cache = redis.RedisProjectConfigCache(dedupe_sections=dedupe_sections)
+    cache.set_many(_org_configs(1000))
+    benchmark(cache.get, "fake-dsn-500")
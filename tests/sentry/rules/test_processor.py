@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 from unittest import mock
 from unittest.mock import patch
 
+import pytest
 from django.core.cache import cache
 from django.db import DEFAULT_DB_ALIAS, connections
 from django.test.utils import CaptureQueriesContext
@@ -15,6 +16,7 @@ from sentry.rules.filters.base import EventFilter
 from sentry.rules.processor import RuleProcessor
 from sentry.testutils import TestCase
 from sentry.testutils.silo import region_silo_test
+from sentry.testutils.skips import requires_pytest_benchmark
 
 EMAIL_ACTION_DATA = {
     "id": "sentry.mail.actions.NotifyEmailAction",
@@ -219,6 +221,79 @@ class RuleProcessorTest(TestCase):
         # mock condition first.
         assert passes.call_count == 0
 
+    @patch(
+        "sentry.constants._SENTRY_RULES",
+        [
+            "sentry.mail.actions.NotifyEmailAction",
+            "tests.sentry.rules.test_processor.MockConditionTrue",
+        ],
+    )
+    def test_shared_conditions(self):
+        environment = self.create_environment(self.project)
+        for environment_id in (None, None, environment.id):
+            Rule.objects.create(
+                project=self.group_event.project,
+                environment_id=environment_id,
+                data={
+                    "conditions": [{"id": "tests.sentry.rules.test_processor.MockConditionTrue"}],
+                    "actions": [EMAIL_ACTION_DATA],
+                },
+            )
+        with patch("sentry.rules.processor.rules", init_registry()), patch.object(
+            MockConditionTrue, "passes", return_value=False
+        ) as passes:
+            rp = RuleProcessor(
+                self.group_event,
+                is_new=True,
+                is_regression=True,
+                is_new_group_environment=True,
+                has_reappeared=True,
+            )
+            assert not list(rp.apply())
+        # The condition is evaluated once per environment, not once per rule.
+        assert passes.call_count == 2
+
+    @patch(
+        "sentry.constants._SENTRY_RULES",
+        [
+            "sentry.mail.actions.NotifyEmailAction",
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+        ],
+    )
+    def test_shared_frequency_queries(self):
+        Rule.objects.filter(project=self.group_event.project).delete()
+        for value in (10, 100, 1000):
+            Rule.objects.create(
+                project=self.group_event.project,
+                data={
+                    "conditions": [
+                        {
+                            "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+                            "interval": "1h",
+                            "value": value,
+                        }
+                    ],
+                    "actions": [EMAIL_ACTION_DATA],
+                },
+            )
+        tsdb = mock.Mock()
+        tsdb.get_sums.return_value = {self.group_event.group_id: 50}
+        with patch("sentry.rules.processor.rules", init_registry()), patch(
+            "sentry.rules.processor.tsdb", tsdb
+        ):
+            rp = RuleProcessor(
+                self.group_event,
+                is_new=True,
+                is_regression=True,
+                is_new_group_environment=True,
+                has_reappeared=True,
+            )
+            results = list(rp.apply())
+        # Rules with different thresholds share the query of their interval.
+        assert tsdb.get_sums.call_count == 1
+        assert len(results) == 1
+        assert len(results[0][1]) == 1
+
 
 class MockFilterTrue(EventFilter):
     id = "tests.sentry.rules.test_processor.MockFilterTrue"
@@ -441,3 +516,65 @@ class RuleProcessorTestFilters(TestCase):
         assert len(futures) == 1
         assert futures[0].rule == self.rule
         assert futures[0].kwargs == {}
+
+
+@requires_pytest_benchmark
+@region_silo_test(stable=True)
+class RuleProcessorBenchmarkTest(TestCase):
+    @pytest.fixture(autouse=True)
+    def _inject_benchmark(self, benchmark):
+        self.benchmark = benchmark
+
+    @patch(
+        "sentry.constants._SENTRY_RULES",
+        [
+            "sentry.mail.actions.NotifyEmailAction",
+            "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+            "sentry.rules.conditions.event_frequency.EventUniqueUserFrequencyCondition",
+            "tests.sentry.rules.test_processor.MockConditionTrue",
+            "tests.sentry.rules.test_processor.MockFilterTrue",
+        ],
+    )
+    def test_synthetic_rules(self):
+        group_event = self.store_event(data={}, project_id=self.project.id)
+        group_event = next(group_event.build_group_events())
+
+        # Hundreds of rules that differ only in thresholds and intervals.
+        for i in range(300):
+            Rule.objects.create(
+                project=self.project,
+                data={
+                    "conditions": [
+                        {"id": "tests.sentry.rules.test_processor.MockFilterTrue"},
+                        {"id": "tests.sentry.rules.test_processor.MockConditionTrue"},
+                        {
+                            "id": "sentry.rules.conditions.event_frequency.EventFrequencyCondition",
+                            "interval": ("1m", "1h", "1d")[i % 3],
+                            "value": i,
+                        },
+                        {
+                            "id": "sentry.rules.conditions.event_frequency."
+                            "EventUniqueUserFrequencyCondition",
+                            "interval": ("1h", "1d")[i % 2],
+                            "value": 10**9,
+                        },
+                    ],
+                    "action_match": "all",
+                    "actions": [EMAIL_ACTION_DATA],
+                },
+            )
+
+        tsdb = mock.Mock()
+        tsdb.get_sums.return_value = {group_event.group_id: 10**9}
+        tsdb.get_distinct_counts_totals.return_value = {group_event.group_id: 0}
+        with patch("sentry.rules.processor.rules", init_registry()), patch(
+            "sentry.rules.processor.tsdb", tsdb
+        ):
+            rp = RuleProcessor(
+                group_event,
+                is_new=True,
+                is_regression=True,
+                is_new_group_environment=True,
+                has_reappeared=True,
+            )
+            self.benchmark(lambda: list(rp.apply()))
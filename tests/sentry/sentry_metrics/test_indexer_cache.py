@@ -1,5 +1,8 @@
+from unittest.mock import patch
+
 import pytest
 from django.conf import settings
+from django.test import override_settings
 
 from sentry.sentry_metrics.configuration import UseCaseKey
 from sentry.sentry_metrics.indexer.cache import StringIndexerCache
@@ -71,3 +74,70 @@ def test_separate_namespacing() -> None:
     indexer_cache.set("a", 2, UseCaseKey.PERFORMANCE.value)
     assert indexer_cache.get("a", UseCaseKey.RELEASE_HEALTH.value) == 1
     assert indexer_cache.get("a", UseCaseKey.PERFORMANCE.value) == 2
+
+
+@override_settings(SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE=10000)
+def test_local_cache(use_case_id: str) -> None:
+    cache.clear()
+    local_indexer_cache = StringIndexerCache(
+        **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, partition_key=_PARTITION_KEY
+    )
+    values = {"1:hello": 2, "1:bye": 3}
+
+    # Writes go through to the in-process tier
+    local_indexer_cache.set_many(values, use_case_id)
+    with patch.object(local_indexer_cache.cache, "get_many") as mock_get_many:
+        assert local_indexer_cache.get_many(["1:bye", "1:hello"], use_case_id) == {
+            "1:bye": 3,
+            "1:hello": 2,
+        }
+    assert not mock_get_many.called
+
+    # Only strings missing in process are fetched from the shared cache, and
+    # shared cache hits are kept in process
+    local_indexer_cache.cache.set(
+        local_indexer_cache.make_cache_key("1:shared", use_case_id),
+        4,
+        timeout=60,
+        version=local_indexer_cache.version,
+    )
+    assert local_indexer_cache.get_many(["1:hello", "1:shared", "1:missing"], use_case_id) == {
+        "1:hello": 2,
+        "1:shared": 4,
+        "1:missing": None,
+    }
+    local_cache = local_indexer_cache.local_cache
+    assert local_cache is not None
+    assert local_cache.get_many(["1:shared", "1:missing"], use_case_id) == {"1:shared": 4}
+
+    # Namespaces are separate in process as well
+    assert local_indexer_cache.get("1:hello", UseCaseKey.PERFORMANCE.value) is None
+
+    local_indexer_cache.delete_many(["1:hello", "1:shared"], use_case_id)
+    assert local_indexer_cache.get_many(["1:hello", "1:shared", "1:bye"], use_case_id) == {
+        "1:hello": None,
+        "1:shared": None,
+        "1:bye": 3,
+    }
+
+
+@override_settings(
+    SENTRY_METRICS_INDEXER_LOCAL_CACHE_SIZE=4000,
+    SENTRY_METRICS_INDEXER_LOCAL_CACHE_ORG_SIZE=2000,
+)
+def test_local_cache_partitions(use_case_id: str) -> None:
+    local_indexer_cache = StringIndexerCache(
+        **settings.SENTRY_STRING_INDEXER_CACHE_OPTIONS, partition_key=_PARTITION_KEY
+    )
+    local_indexer_cache.set("1:quiet", 1, use_case_id)
+
+    # A busy org only evicts its own strings
+    local_indexer_cache.set_many({f"2:{i}": i for i in range(100)}, use_case_id)
+    local_cache = local_indexer_cache.local_cache
+    assert local_cache is not None
+    assert local_cache.get_many(["1:quiet"], use_case_id) == {"1:quiet": 1}
+    assert len(local_cache.get_many([f"2:{i}" for i in range(100)], use_case_id)) < 10
+
+    # The partitions of the least recently used orgs are dropped as a whole
+    local_indexer_cache.set("3:other", 3, use_case_id)
+    assert local_cache.get_many(["1:quiet", "3:other"], use_case_id) == {"3:other": 3}
@@ -1,7 +1,24 @@
+import random
 from collections import Counter
 from unittest import TestCase
 
+import mmh3
+import pytest
+
 from sentry.similarity.signatures import MinHashSignatureBuilder
+from sentry.testutils.skips import requires_pytest_benchmark
+
+
+def reference_signature(features, columns, rows):
+    return [
+        min(mmh3.hash(feature, column) % rows for feature in features) for column in range(columns)
+    ]
+
+
+def make_feature_sets(count, seed=0):
+    rng = random.Random(seed)
+    vocabulary = [f"frame {i}".encode() for i in range(1000)]
+    return [[rng.choice(vocabulary) for _ in range(rng.randint(1, 50))] for _ in range(count)]
 
 
 class MinHashSignatureBuilderTestCase(TestCase):
@@ -28,3 +45,32 @@ class MinHashSignatureBuilderTestCase(TestCase):
         self.assertAlmostEqual(
             similarity, estimation, delta=0.1  # totally made up constant, seems reasonable
         )
+
+    def test_matches_reference(self):
+        feature_sets = make_feature_sets(100)
+        expected = [reference_signature(features, 16, 0xFFFF) for features in feature_sets]
+
+        for cache_size in (0, 100):
+            get_signature = MinHashSignatureBuilder(16, 0xFFFF, cache_size=cache_size)
+            assert [get_signature(features) for features in feature_sets] == expected
+            assert get_signature.build_many(feature_sets) == expected
+
+    def test_empty(self):
+        with pytest.raises(ValueError):
+            MinHashSignatureBuilder(16, 0xFFFF)([])
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("mode", ["reference", "single", "cached", "batch"])
+def test_benchmark_signatures(mode, benchmark):
+    feature_sets = make_feature_sets(1000)
+    get_signature = MinHashSignatureBuilder(
+        16, 0xFFFF, cache_size=10000 if mode in ("cached", "batch") else 0
+    )
+
+    if mode == "reference":
+        benchmark(lambda: [reference_signature(features, 16, 0xFFFF) for features in feature_sets])
+    elif mode == "batch":
+        benchmark(get_signature.build_many, feature_sets)
+    else:
+        benchmark(lambda: [get_signature(features) for features in feature_sets])
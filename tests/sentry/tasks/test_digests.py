@@ -6,7 +6,7 @@ import sentry
 from sentry.digests.backends.redis import RedisBackend
 from sentry.digests.notifications import event_to_record
 from sentry.models import ProjectOwnership, Rule
-from sentry.tasks.digests import deliver_digest
+from sentry.tasks.digests import deliver_digest, deliver_digests
 from sentry.testutils import TestCase
 from sentry.testutils.helpers.datetime import before_now, iso_format
 from sentry.testutils.helpers.features import with_feature
@@ -51,3 +51,31 @@ class DeliverDigestTest(TestCase):
     def test_no_records(self):
         # This shouldn't error if no records are present
         deliver_digest(f"mail:p:{self.project.id}:IssueOwners:")
+
+
+class DeliverDigestsTest(TestCase):
+    @patch.object(sentry, "digests")
+    def test_batch(self, digests):
+        backend = RedisBackend()
+        digests.digest_many = backend.digest_many
+
+        rule = Rule.objects.create(project=self.project, label="Test Rule", data={})
+        ProjectOwnership.objects.create(project_id=self.project.id, fallthrough=True)
+        keys = [
+            f"mail:p:{self.project.id}:IssueOwners:",
+            f"mail:p:{self.project.id}:Member:{self.user.id}",
+        ]
+        for key in keys:
+            for i in range(2):
+                event = self.store_event(
+                    data={"timestamp": iso_format(before_now(days=1)), "fingerprint": [f"{i}"]},
+                    project_id=self.project.id,
+                )
+                backend.add(key, event_to_record(event, [rule]), increment_delay=0, maximum_delay=0)
+
+        with self.tasks():
+            deliver_digests(keys + ["mail:p:0"])
+
+        assert len(mail.outbox) == 2
+        assert all("2 new alerts since" in message.subject for message in mail.outbox)
+        digests.delete.assert_called_once_with("mail:p:0")
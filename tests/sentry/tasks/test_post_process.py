@@ -8,6 +8,7 @@ from unittest import mock
 from unittest.mock import Mock, patch
 
 import pytz
+from celery.exceptions import SoftTimeLimitExceeded
 from django.test import override_settings
 from django.utils import timezone
 
@@ -50,7 +51,11 @@ from sentry.tasks.derive_code_mappings import SUPPORTED_LANGUAGES
 from sentry.tasks.merge import merge_groups
 from sentry.tasks.post_process import (
     ISSUE_OWNERS_PER_PROJECT_PER_MIN_RATELIMIT,
+    PostProcessContext,
+    get_post_process_batch_sequences,
+    get_post_process_context,
     post_process_group,
+    post_process_group_batch,
     process_event,
 )
 from sentry.testutils import SnubaTestCase, TestCase
@@ -1612,6 +1617,185 @@ class PostProcessGroupPerformanceTest(
         ]
 
 
+class PostProcessContextTest(TestCase):
+    @patch("sentry.tasks.post_process._get_service_hooks")
+    def test_memoizes_project_data(self, mock_get_service_hooks):
+        mock_get_service_hooks.return_value = [(1, ["event.created"])]
+        context = PostProcessContext(self.project)
+
+        with self.feature("projects:servicehooks"):
+            assert context.has_feature("projects:servicehooks")
+            assert context.get_service_hooks() == [(1, ["event.created"])]
+            assert context.get_service_hooks() == [(1, ["event.created"])]
+
+        mock_get_service_hooks.assert_called_once_with(self.project.id)
+
+        # Feature flags are memoized as well
+        assert context.has_feature("projects:servicehooks")
+
+    def test_organization_features(self):
+        context = PostProcessContext(self.project)
+
+        with self.feature("organizations:commit-context"):
+            assert context.has_feature("organizations:commit-context")
+        assert not context.has_feature("organizations:escalating-issues")
+
+    @patch("sentry.tasks.post_process._post_process_contexts", None)
+    def test_shared_within_ttl(self):
+        other_project = self.create_project(organization=self.organization)
+
+        assert get_post_process_context(self.project) is not get_post_process_context(self.project)
+
+        with override_settings(SENTRY_POST_PROCESS_CONTEXT_TTL=60):
+            context = get_post_process_context(self.project)
+            assert get_post_process_context(self.project) is context
+            assert get_post_process_context(other_project) is not context
+
+
+class PostProcessGroupBatchTest(TestCase):
+    def get_task_kwargs(self, event):
+        return {
+            "is_new": False,
+            "is_regression": False,
+            "is_new_group_environment": False,
+            "primary_hash": None,
+            "cache_key": write_event_to_cache(event),
+            "group_id": event.group_id,
+            "group_states": None,
+            "occurrence_id": None,
+            "project_id": event.project_id,
+        }
+
+    @patch("sentry.tasks.post_process.run_post_process_job")
+    def test_processes_in_order(self, mock_run_post_process_job):
+        events = [
+            self.store_event(data={"message": f"message {i}"}, project_id=self.project.id)
+            for i in range(3)
+        ]
+        tasks = [self.get_task_kwargs(event) for event in events]
+
+        post_process_group_batch(tasks=tasks)
+
+        jobs = [call.args[0] for call in mock_run_post_process_job.call_args_list]
+        assert [job["event"].event_id for job in jobs] == [event.event_id for event in events]
+        # Project data is loaded once for the whole batch
+        assert len({id(job["context"]) for job in jobs}) == 1
+        for task in tasks:
+            assert event_processing_store.get(task["cache_key"]) is None
+
+    @patch("sentry.tasks.post_process.run_post_process_job")
+    def test_prefetches_events(self, mock_run_post_process_job):
+        event = self.store_event(data={"message": "message"}, project_id=self.project.id)
+        task = self.get_task_kwargs(event)
+
+        with patch.object(
+            event_processing_store, "get", side_effect=AssertionError("not prefetched")
+        ):
+            # The same event twice is only processed once
+            post_process_group_batch(tasks=[task, task])
+
+        assert mock_run_post_process_job.call_count == 1
+        assert event_processing_store.get(task["cache_key"]) is None
+
+    @patch("sentry.tasks.post_process.run_post_process_job")
+    def test_failure_does_not_abort_batch(self, mock_run_post_process_job):
+        mock_run_post_process_job.side_effect = [Exception("boom"), None]
+        events = [
+            self.store_event(data={"message": f"message {i}"}, project_id=self.project.id)
+            for i in range(2)
+        ]
+
+        post_process_group_batch(tasks=[self.get_task_kwargs(event) for event in events])
+
+        assert mock_run_post_process_job.call_count == 2
+
+    @patch("sentry.tasks.post_process.post_process_group_batch.apply_async")
+    @patch("sentry.tasks.post_process.run_post_process_job")
+    def test_soft_time_limit_dispatches_remaining(
+        self, mock_run_post_process_job, mock_apply_async
+    ):
+        mock_run_post_process_job.side_effect = [None, SoftTimeLimitExceeded(), None]
+        events = [
+            self.store_event(data={"message": f"message {i}"}, project_id=self.project.id)
+            for i in range(3)
+        ]
+        tasks = [self.get_task_kwargs(event) for event in events]
+
+        post_process_group_batch(tasks=tasks, queue="post_process_errors")
+
+        assert mock_run_post_process_job.call_count == 2
+        mock_apply_async.assert_called_once_with(
+            kwargs={
+                "tasks": tasks[2:],
+                "queue": "post_process_errors",
+                "sequence": None,
+                "wait_until": 0,
+            },
+            queue="post_process_errors",
+        )
+
+    @patch("sentry.tasks.post_process.POST_PROCESS_BATCH_TIME_BUDGET", -1)
+    @patch("sentry.tasks.post_process.post_process_group_batch.apply_async")
+    @patch("sentry.tasks.post_process.run_post_process_job")
+    def test_time_budget_dispatches_remaining(self, mock_run_post_process_job, mock_apply_async):
+        events = [
+            self.store_event(data={"message": f"message {i}"}, project_id=self.project.id)
+            for i in range(3)
+        ]
+        tasks = [self.get_task_kwargs(event) for event in events]
+
+        post_process_group_batch(tasks=tasks, queue="post_process_errors", sequence=1)
+
+        assert mock_run_post_process_job.call_count == 1
+        mock_apply_async.assert_called_once_with(
+            kwargs={
+                "tasks": tasks[1:],
+                "queue": "post_process_errors",
+                "sequence": 1,
+                "wait_until": 0,
+            },
+            queue="post_process_errors",
+        )
+
+    @patch("sentry.tasks.post_process.run_post_process_job")
+    def test_waits_for_previous_batch(self, mock_run_post_process_job):
+        events = [
+            self.store_event(data={"message": f"message {i}"}, project_id=self.project.id)
+            for i in range(2)
+        ]
+        first, second = (get_post_process_batch_sequences([self.project.id])[0] for _ in range(2))
+        first_tasks, second_tasks = ([self.get_task_kwargs(event)] for event in events)
+
+        with patch(
+            "sentry.tasks.post_process.post_process_group_batch.apply_async"
+        ) as mock_apply_async:
+            post_process_group_batch(
+                tasks=second_tasks, queue="post_process_errors", sequence=second
+            )
+        assert mock_run_post_process_job.call_count == 0
+        (call,) = mock_apply_async.call_args_list
+        assert call.kwargs["kwargs"]["sequence"] == second
+        assert call.kwargs["countdown"] == 1
+
+        post_process_group_batch(tasks=first_tasks, sequence=first)
+        post_process_group_batch(**call.kwargs["kwargs"])
+
+        jobs = [call.args[0] for call in mock_run_post_process_job.call_args_list]
+        assert [job["event"].event_id for job in jobs] == [event.event_id for event in events]
+
+    @patch("sentry.tasks.post_process.run_post_process_job")
+    def test_previous_batch_timeout(self, mock_run_post_process_job):
+        event = self.store_event(data={"message": "message"}, project_id=self.project.id)
+        get_post_process_batch_sequences([self.project.id])
+        (sequence,) = get_post_process_batch_sequences([self.project.id])
+
+        post_process_group_batch(
+            tasks=[self.get_task_kwargs(event)], sequence=sequence, wait_until=time.time() - 1
+        )
+
+        assert mock_run_post_process_job.call_count == 1
+
+
 class TransactionClustererTestCase(TestCase, SnubaTestCase):
     @patch("sentry.ingest.transaction_clusterer.datasource.redis._store_transaction_name")
     def test_process_transaction_event_clusterer(
@@ -294,6 +294,50 @@ def test_projectkeys(default_project, emulate_transactions, redis_cache, django_
         assert not redis_cache.get(key.public_key)
 
 
+@pytest.mark.django_db
+def test_invalidation_unchanged(default_project, default_projectkey, redis_cache, django_cache):
+    # Without a revision, every computed config has a new random one.
+    default_project.update_rev_for_option()
+
+    build_project_config(public_key=default_projectkey.public_key)
+    cfg = redis_cache.get(default_projectkey.public_key)
+    assert cfg["disabled"] is False
+
+    with mock.patch("sentry.relay.projectconfig_cache.set_many") as set_many:
+        invalidate_project_config(project_id=default_project.id, trigger="test")
+        invalidate_project_config(organization_id=default_project.organization_id, trigger="test")
+    assert set_many.call_args_list == [call({}), call({})]
+
+    default_project.update_option("sentry:scrub_ip_address", True)
+    with mock.patch("sentry.relay.projectconfig_cache.set_many") as set_many:
+        invalidate_project_config(project_id=default_project.id, trigger="test")
+    ((configs,), _) = set_many.call_args
+    assert list(configs) == [default_projectkey.public_key]
+    assert configs[default_projectkey.public_key]["rev"] != cfg["rev"]
+
+
+@pytest.mark.django_db
+def test_invalidation_unchanged_without_rev(
+    default_project, default_projectkey, redis_cache, django_cache
+):
+    # Without a stored revision, ``rev`` and ``lastChange`` differ on every
+    # computation and are not compared.
+    assert default_project.get_option("sentry:relay-rev") is None
+
+    build_project_config(public_key=default_projectkey.public_key)
+    assert redis_cache.get(default_projectkey.public_key)["disabled"] is False
+
+    with mock.patch("sentry.relay.projectconfig_cache.set_many") as set_many:
+        invalidate_project_config(project_id=default_project.id, trigger="test")
+    assert set_many.call_args_list == [call({})]
+
+    default_project.update_option("sentry:scrub_ip_address", True)
+    with mock.patch("sentry.relay.projectconfig_cache.set_many") as set_many:
+        invalidate_project_config(project_id=default_project.id, trigger="test")
+    ((configs,), _) = set_many.call_args
+    assert list(configs) == [default_projectkey.public_key]
+
+
 @pytest.mark.django_db(transaction=True)
 def test_db_transaction(
     default_project, default_projectkey, redis_cache, task_runner, django_cache
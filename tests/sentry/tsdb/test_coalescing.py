@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+from unittest import TestCase, mock
+
+import pytz
+
+from sentry.tsdb.base import ONE_HOUR, ONE_MINUTE, TSDBModel
+from sentry.tsdb.coalescing import CoalescingTSDB
+
+ROLLUPS = ((ONE_MINUTE, 60), (ONE_HOUR, 24))
+
+
+class CoalescingTSDBTest(TestCase):
+    def setUp(self):
+        self.tsdb = CoalescingTSDB(
+            backend="sentry.tsdb.inmemory.InMemoryTSDB",
+            backend_options={"rollups": ROLLUPS},
+            flush_interval=3600,
+            rollups=ROLLUPS,
+        )
+        self.now = datetime(2023, 1, 1, 12, 0, 10, tzinfo=pytz.UTC)
+
+    def test_incr(self):
+        with mock.patch.object(self.tsdb.backend, "incr_multi", wraps=self.tsdb.backend.incr_multi):
+            for i in range(10):
+                self.tsdb.incr(TSDBModel.group, 1, timestamp=self.now + timedelta(seconds=i))
+            self.tsdb.incr_multi(
+                [(TSDBModel.group, 1), (TSDBModel.group, 2, {"count": 5})],
+                timestamp=self.now + timedelta(minutes=1),
+            )
+
+            start, end = self.now - timedelta(minutes=1), self.now + timedelta(minutes=2)
+            assert self.tsdb.get_sums(TSDBModel.group, [1, 2], start, end) == {1: 0, 2: 0}
+
+            self.tsdb.flush_pending()
+            assert self.tsdb.backend.incr_multi.call_count == 1
+            (items,) = self.tsdb.backend.incr_multi.call_args[0]
+            assert len(items) == 3
+
+        assert self.tsdb.get_range(
+            TSDBModel.group, [1, 2], self.now, self.now + timedelta(minutes=1), rollup=ONE_MINUTE
+        ) == {
+            1: [(1672574400, 10), (1672574460, 1)],
+            2: [(1672574400, 0), (1672574460, 5)],
+        }
+
+    def test_record(self):
+        self.tsdb.record(TSDBModel.users_affected_by_group, 1, ["a", "b"], timestamp=self.now)
+        self.tsdb.record_multi(
+            [(TSDBModel.users_affected_by_group, 1, ["b", "c"])], timestamp=self.now
+        )
+        self.tsdb.flush_pending()
+
+        assert self.tsdb.get_distinct_counts_totals(
+            TSDBModel.users_affected_by_group, [1], self.now, self.now
+        ) == {1: 3}
+
+    def test_record_frequency_multi(self):
+        model = TSDBModel.frequent_environments_by_group
+        with mock.patch.object(self.tsdb.backend, "record_frequency_multi") as record:
+            for _ in range(3):
+                self.tsdb.record_frequency_multi([(model, {1: {"a": 1}})], timestamp=self.now)
+            self.tsdb.record_frequency_multi([(model, {1: {"b": 2}})], timestamp=self.now)
+            self.tsdb.flush_pending()
+
+        record.assert_called_once_with(
+            [(model, {1: {"a": 3, "b": 2}})], timestamp=self.now, environment_id=None
+        )
+
+    def test_max_pending(self):
+        self.tsdb.max_pending = 2
+        with mock.patch.object(self.tsdb.backend, "incr_multi") as incr_multi:
+            self.tsdb.incr(TSDBModel.group, 1, timestamp=self.now)
+            self.tsdb.incr(TSDBModel.group, 2, timestamp=self.now)
+            assert not incr_multi.called
+            self.tsdb.incr(TSDBModel.group, 3, timestamp=self.now)
+            assert incr_multi.call_count == 1
+
+    @mock.patch("sentry.tsdb.coalescing.metrics")
+    def test_dropped(self, metrics):
+        with mock.patch.object(self.tsdb.backend, "incr_multi", side_effect=Exception("boom")):
+            self.tsdb.incr(TSDBModel.group, 1, timestamp=self.now)
+            self.tsdb.incr(TSDBModel.group, 2, timestamp=self.now)
+            self.tsdb.flush_pending()
+
+        metrics.incr.assert_any_call(
+            "tsdb.coalescing.dropped", amount=2, tags={"type": "counter"}, skip_internal=True
+        )
+
+    def test_delete_flushes_pending(self):
+        self.tsdb.incr(TSDBModel.group, 1, timestamp=self.now)
+        self.tsdb.delete([TSDBModel.group], [1], timestamp=self.now)
+        self.tsdb.flush_pending()
+
+        assert self.tsdb.get_sums(TSDBModel.group, [1], self.now, self.now) == {1: 0}
@@ -144,6 +144,12 @@ class RedisTSDBTest(TestCase):
         results = self.db.get_sums(TSDBModel.project, [1, 2], dts[0], dts[-1], environment_id=0)
         assert results == {1: 0, 2: 0}
 
+        results = self.db.get_range_columnar(TSDBModel.project, [1, 2, 1], dts[0], dts[-1])
+        assert results.timestamps == tuple(timestamp(dt) for dt in dts)
+        assert results.keys == [1, 2]
+        assert list(results[1]) == [1, 3, 1, 4]
+        assert list(results[2]) == [0, 0, 0, 4]
+
         self.db.merge(TSDBModel.project, 1, [2], now, environment_ids=[0, 1, 2])
 
         results = self.db.get_range(TSDBModel.project, [1], dts[0], dts[-1])
@@ -0,0 +1,67 @@
+from array import array
+
+import pytest
+
+from sentry.testutils.skips import requires_pytest_benchmark
+from sentry.tsdb.series import ColumnarSeries
+
+
+def test_from_points():
+    series = ColumnarSeries.from_points({1: [(10, 1), (20, 2)], 2: [(20, 3), (30, 4)]})
+
+    assert series.timestamps == (10, 20, 30)
+    assert series.keys == [1, 2]
+    assert series.values == array("q", [1, 2, 0, 0, 3, 4])
+    assert list(series[2]) == [0, 3, 4]
+    assert len(series) == 2
+    assert 1 in series and 3 not in series
+
+    assert series.to_points() == {1: [(10, 1), (20, 2), (30, 0)], 2: [(10, 0), (20, 3), (30, 4)]}
+    assert series.sums() == {1: 3, 2: 7}
+
+
+def test_round_trip():
+    points = {"a": [(10, 5), (20, 0)], "b": [(10, 0), (20, 7)]}
+    series = ColumnarSeries.from_points(points)
+
+    assert series.to_points() == points
+    assert ColumnarSeries.from_points(series.to_points()) == series
+
+
+def test_empty():
+    series = ColumnarSeries([10, 20], [1, 1, 2])
+    assert series.keys == [1, 2]
+    assert series.to_points() == {1: [(10, 0), (20, 0)], 2: [(10, 0), (20, 0)]}
+
+    series = ColumnarSeries([], [1])
+    assert series.to_points() == {1: []}
+    assert series.sums() == {1: 0}
+
+
+def test_invalid_values():
+    with pytest.raises(AssertionError):
+        ColumnarSeries([10, 20], [1, 2], [1, 2, 3])
+
+
+@requires_pytest_benchmark
+@pytest.mark.parametrize("mode", ["points", "columnar"])
+def test_benchmark_sums(mode, benchmark):
+    timestamps = [86400 * day for day in range(90)]
+    keys = list(range(1000))
+    values = [key * day for key in keys for day in range(90)]
+
+    if mode == "points":
+
+        def run():
+            points = {
+                key: list(zip(timestamps, values[idx * 90 : (idx + 1) * 90]))
+                for idx, key in enumerate(keys)
+            }
+            return {key: sum(value for _, value in series) for key, series in points.items()}
+
+    else:
+
+        def run():
+            return ColumnarSeries(timestamps, keys, array("q", values)).sums()
+
+    benchmark(run)
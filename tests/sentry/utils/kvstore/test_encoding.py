@@ -23,3 +23,7 @@ def test_encoding_wrapper(store: KVStorage[str, bytes]) -> None:
 
     assert wrapper.get("key") == [1, 2, 3]
     assert [*wrapper.get_many(["key", "missing"])] == [("key", [1, 2, 3])]
+
+    wrapper.set_many([("a", {"a": 1}), ("b", None)])
+    assert store.get("a") == b'{"a":1}'
+    assert dict(wrapper.get_many(["a", "b"])) == {"a": {"a": 1}, "b": None}
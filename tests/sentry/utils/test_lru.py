@@ -0,0 +1,68 @@
+from unittest import mock
+
+from sentry.utils.lru import LRUCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_evicts_least_recently_used_by_size():
+    cache = LRUCache(max_size=10, get_size=len)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+
+    cache.set("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get_many(["a", "b", "c"]) == {"a": b"aaaa", "c": b"cccc"}
+    assert cache.size == 8
+
+
+def test_skips_values_larger_than_max_size():
+    cache = LRUCache(max_size=4, get_size=len)
+    cache.set("a", b"aa")
+    cache.set("a", b"aaaaaaaa")
+    assert "a" not in cache
+    assert cache.size == 0
+
+
+def test_ttl():
+    clock = Clock()
+    cache = LRUCache(max_size=10, ttl=5, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=20)
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert len(cache) == 1
+
+
+def test_delete_and_clear():
+    cache = LRUCache(max_size=10)
+    cache.set_many({"a": 1, "b": 2, "c": 3})
+    cache.delete("a")
+    cache.delete_many(["b", "d"])
+    assert cache.get_many(["a", "b", "c"]) == {"c": 3}
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+@mock.patch("sentry.utils.lru.metrics")
+def test_metrics(metrics):
+    cache = LRUCache(max_size=1, metrics_key="test")
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get_many(["a", "b"])
+
+    assert metrics.incr.mock_calls == [
+        mock.call("test.evicted", amount=1, tags=None, skip_internal=True),
+        mock.call("test.hit", amount=1, tags=None, skip_internal=True),
+        mock.call("test.miss", amount=1, tags=None, skip_internal=True),
+    ]
@@ -61,6 +61,18 @@ class ClusterManagerTestCase(TestCase):
         with pytest.raises(KeyError):
             manager.get("bar")
 
+    @mock.patch("sentry.utils.redis.RetryingRedisCluster")
+    def test_get_binary(self, RetryingRedisCluster):
+        manager = make_manager(cluster_type=_RedisCluster)
+
+        assert manager.get_binary("foo") is manager.get_binary("foo")
+        assert manager.get_binary("foo") is not manager.get("foo")
+        client = manager.get_binary("foo")._setupfunc()
+        assert client.connection_pool.connection_kwargs["decode_responses"] is False
+
+        manager.get_binary("baz")._setupfunc()
+        assert RetryingRedisCluster.call_args.kwargs["decode_responses"] is False
+
     def test_multiple_retrieval_do_not_setup_lazy_object(self):
         class TestClusterType:
             def supports(self, config):